@@ -204,7 +204,13 @@ class MixtureVLEController:
                 self.vleView.tableWidget_Results.setItem(i, 5, sk)
 
         elif self.calctype == "bubbleT":
-            y, t, pv, pl, k, ite = self.model.system.getBubblePointTemperature(z, p)
+            try:
+                y, t, pv, pl, k, ite = self.model.system.getBubblePointTemperature(z, p)
+            except ValueError as e:
+                title = "Error calculating bubble-point temperature"
+                msg = str(e)
+                QtWidgets.QMessageBox.about(self.vleView, title, msg)
+                return -1
             t = conv_unit(t, "K", self.vleView.comboBox_Tunit.currentText())
             self.vleView.le_scalarAnswer.setText("{:.5e}".format(t))
             # col_headers = ["Name", "Formula", "y", "Phivap", "Philiq", "K"]
@@ -219,7 +225,13 @@ class MixtureVLEController:
                 self.vleView.tableWidget_Results.setItem(i, 5, sk)
 
         elif self.calctype == "dewT":
-            x, t, pv, pl, k, ite = self.model.system.getDewPointTemperature(z, p)
+            try:
+                x, t, pv, pl, k, ite = self.model.system.getDewPointTemperature(z, p)
+            except ValueError as e:
+                title = "Error calculating dew-point temperature"
+                msg = str(e)
+                QtWidgets.QMessageBox.about(self.vleView, title, msg)
+                return -1
             t = conv_unit(t, "K", self.vleView.comboBox_Tunit.currentText())
             self.vleView.le_scalarAnswer.setText("{:.5e}".format(t))
             # col_headers = ["Name", "Formula", "y", "Phivap", "Philiq", "K"]
@@ -413,10 +425,11 @@ class MixtureVLEController:
                     self.vleView.comboBox_varUnit.currentText(),
                     "K",
                 )
-                x, y, var, phiv, phil, kvec = self.model.system.isothermalBinaryMixtureGenData(
+                x, y, var, phiv, phil, kvec, failed = self.model.system.isothermalBinaryMixtureGenData(
                     _v,
                     Tunit=self.vleView.comboBox_varUnit.currentText(),
                     Punit=self.vleView.comboBox_Punit.currentText(),
+                    return_failed=True,
                 )
                 gendata_header[0] = "{} [{}]".format(
                     "P", self.vleView.comboBox_Punit.currentText()
@@ -427,10 +440,11 @@ class MixtureVLEController:
                     self.vleView.comboBox_varUnit.currentText(),
                     "Pa",
                 )
-                x, y, var, phiv, phil, kvec = self.model.system.isobaricBinaryMixtureGenData(
+                x, y, var, phiv, phil, kvec, failed = self.model.system.isobaricBinaryMixtureGenData(
                     _v,
                     Tunit=self.vleView.comboBox_Tunit.currentText(),
                     Punit=self.vleView.comboBox_varUnit.currentText(),
+                    return_failed=True,
                 )
                 gendata_header[0] = "{} [{}]".format(
                     "T", self.vleView.comboBox_Tunit.currentText()
@@ -441,6 +455,13 @@ class MixtureVLEController:
             QtWidgets.QMessageBox.about(self.vleView, title, msg)
             return -1
 
+        if np.any(failed):
+            title = "Some points did not converge"
+            msg = "No bubble point found for x1 = {}".format(
+                ", ".join("{:0.4f}".format(xi) for xi in x[failed])
+            )
+            QtWidgets.QMessageBox.about(self.vleView, title, msg)
+
         # populate table
         n = len(x)
         self.vleView.tableWidget_DataResult.setRowCount(n)
@@ -8,7 +8,7 @@ from scipy.integrate import quad
 
 from Properties import DeltaProp
 from constants import R_IG, DBL_EPSILON
-from polyEqSolver import solve_cubic
+from polyEqSolver import cubic_real_roots
 
 
 class CubicEOS(object):
@@ -118,7 +118,7 @@ class CubicEOS(object):
         b = np.real(self._numf_a0(_P, _T))
         c = np.real(self._numf_a1(_P, _T))
         d = np.real(self._numf_a2(_P, _T))
-        roots = np.asarray(solve_cubic(a, b, c, d))
+        roots = cubic_real_roots(a, b, c, d)
         real_values = roots[roots > 0]
         return real_values
 
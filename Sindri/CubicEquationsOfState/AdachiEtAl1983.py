@@ -1,6 +1,7 @@
 import numpy as np
 
 from EOSMixture import EOSMixture
+from EOSParametersBehavior.SoaveAlpha import dalphaSoave, d2alphaSoave
 from MixtureRules.ClassicMixtureRule import ClassicMixtureRule
 from MixtureRules.MixtureRulesInterface import (
     BiBehavior,
@@ -37,6 +38,20 @@ class thetaiAdachi1983(ThetaiBehavior):
         _alpha = self.alpha(i, T, substances)
         return _alpha * self.a(i, T, substances)
 
+    def dalpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return dalphaSoave(T, substances[i].Tc, _m)
+
+    def d2alpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return d2alphaSoave(T, substances[i].Tc, _m)
+
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        return self.dalpha(i, T, substances) * self.a(i, T, substances)
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        return self.d2alpha(i, T, substances) * self.a(i, T, substances)
+
 
 def _calcB2(i: int, T: float, substances):
     w = substances[i].omega
@@ -44,6 +59,13 @@ def _calcB2(i: int, T: float, substances):
     return B2 * R_IG * substances[i].Tc / substances[i].Pc
 
 
+def _calcB2Vector(T: float, substances) -> np.ndarray:
+    return np.array(
+        [_calcB2(i, T, substances) for i in range(len(substances))],
+        dtype=np.float64,
+    )
+
+
 def _calcB2mix(y, T: float, substances):
     s = 0.0
     for i in range(len(y)):
@@ -57,6 +79,13 @@ def _calcB3(i: int, T: float, substances):
     return B3 * R_IG * substances[i].Tc / substances[i].Pc
 
 
+def _calcB3Vector(T: float, substances) -> np.ndarray:
+    return np.array(
+        [_calcB3(i, T, substances) for i in range(len(substances))],
+        dtype=np.float64,
+    )
+
+
 def _calcB3mix(y, T: float, substances):
     s = 0.0
     for i in range(len(y)):
@@ -77,6 +106,11 @@ class deltaMixAdachi1983(DeltaMixtureRuleBehavior):
     ) -> float:
         return _calcB3(i, T, substances) - _calcB2(i, T, substances)
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return _calcB3Vector(T, substances) - _calcB2Vector(T, substances)
+
 
 class epsilonMixAdachi1983(EpsilonMixtureRuleBehavior):
     def epsilonm(
@@ -95,6 +129,14 @@ class epsilonMixAdachi1983(EpsilonMixtureRuleBehavior):
         B3line = _calcB3(i, T, substances)
         return -B2line * B3mix - B3line * B2mix
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        B2line = _calcB2Vector(T, substances)
+        B3line = _calcB3Vector(T, substances)
+        y = np.asarray(y, dtype=np.float64)
+        return -B2line * np.dot(y, B3line) - B3line * np.dot(y, B2line)
+
 
 class Adachi1983(EOSMixture):
     def __init__(self, _subs, _k):
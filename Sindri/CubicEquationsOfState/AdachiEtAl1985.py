@@ -1,6 +1,7 @@
 import numpy as np
 
 from EOSMixture import EOSMixture
+from EOSParametersBehavior.SoaveAlpha import dalphaSoave, d2alphaSoave
 from MixtureRules.ClassicMixtureRule import ClassicMixtureRule, ClassicBMixture
 from MixtureRules.MixtureRulesInterface import (
     BiBehavior,
@@ -36,6 +37,20 @@ class thetaiAdachi1985(ThetaiBehavior):
     def getThetai(self, i: int, T: float, substances) -> float:
         return self.alpha(i, T, substances) * self.a(i, T, substances)
 
+    def dalpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return dalphaSoave(T, substances[i].Tc, _m)
+
+    def d2alpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return d2alphaSoave(T, substances[i].Tc, _m)
+
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        return self.dalpha(i, T, substances) * self.a(i, T, substances)
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        return self.d2alpha(i, T, substances) * self.a(i, T, substances)
+
 
 class ciAdachi1985(BiBehavior):
     def getBi(self, i: int, T: float, substances) -> float:
@@ -70,6 +85,11 @@ class deltaMixAdachi1985(DeltaMixtureRuleBehavior):
     ) -> float:
         return 2.0 * self.cm.diffCm(i, y, T, substances)
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return 2.0 * self.cm.ciBehavior.getBiVector(T, substances)
+
 
 class epsilonMixAdachi1985(EpsilonMixtureRuleBehavior):
     def __init__(self):
@@ -85,6 +105,12 @@ class epsilonMixAdachi1985(EpsilonMixtureRuleBehavior):
     ) -> float:
         return -2.0 * self.cm.cm(y, T, substances) * self.cm.diffCm(i, y, T, substances)
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        ci = self.cm.ciBehavior.getBiVector(T, substances)
+        return -2.0 * np.dot(np.asarray(y, dtype=np.float64), ci) * ci
+
 
 class Adachi1985(EOSMixture):
     def __init__(self, _subs, _k):
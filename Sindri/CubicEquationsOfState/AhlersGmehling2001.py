@@ -48,6 +48,20 @@ class ciAG2001(BiBehavior):
     def getCi(self, i: int, T: float, substances: List[SubstanceProp]) -> float:
         return self.cc(i, substances) * self.beta(i, T, substances)
 
+    def dbeta(self, i: int, T: float, substances: List[SubstanceProp]) -> float:
+        tc = substances[i].Tc
+        tr = T / tc
+        gamma = self.gamma(i, substances)
+        eta = self.eta(i, substances)
+        alpha = self.theta.alpha(i, T, substances)
+        dalpha = self.theta.dalpha(i, T, substances)
+        x = eta * np.abs(tr - alpha)
+        dx = eta * np.sign(tr - alpha) * (1.0 / tc - dalpha)
+        return -0.35 * gamma * x ** (gamma - 1.0) * dx / (0.35 + x ** gamma) ** 2
+
+    def getdBidT(self, i: int, T: float, substances: List[SubstanceProp]) -> float:
+        return self.cc(i, substances) * self.dbeta(i, T, substances)
+
 
 class cmAG2001:
     def __init__(self):
@@ -65,11 +79,15 @@ class BMixtureRuleBehaviorVolumeTranslated(ClassicBMixture):
     def __init__(self):
         self.cm = cmAG2001()
 
-    def bm(self, y, T: float, bib: BiBehavior, substances) -> float:
-        s1 = 0.0
-        for i in range(len(y)):
-            s1 += y[i] * bib.getBi(i, T, substances)
-        return s1 - self.cm.cm(y, T, substances)
+    def getBiVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        return bib.getBiVector(T, substances) - self.cm.ciBehavior.getBiVector(
+            T, substances
+        )
+
+    def getdBidTVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        return bib.getdBidTVector(T, substances) - self.cm.ciBehavior.getdBidTVector(
+            T, substances
+        )
 
     def diffBm(self, i: int, y, T: float, bib: BiBehavior, substances) -> float:
         return bib.getBi(i, T, substances) - self.cm.ciBehavior.getCi(i, T, substances)
@@ -97,6 +115,23 @@ class deltaMixAG2001(DeltaMixtureRuleBehavior):
             i, y, T, substances
         )
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return 2.0 * bmb.diffBmFromArrays(y, bi) + 4.0 * self.cm.ciBehavior.getBiVector(
+            T, substances
+        )
+
+    def getdDeltamdT(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> float:
+        dbi = bmb.getdBidTVector(T, bib, substances)
+        dci = self.cm.ciBehavior.getdBidTVector(T, substances)
+        return 2.0 * bmb.bmFromArrays(y, dbi) + 4.0 * np.dot(
+            np.asarray(y, dtype=np.float64), dci
+        )
+
 
 class epsilonMixAG2001(EpsilonMixtureRuleBehavior):
     def __init__(self):
@@ -117,6 +152,26 @@ class epsilonMixAG2001(EpsilonMixtureRuleBehavior):
             i, y, T, bib, substances
         ) + 4.0 * self.cm.cm(y, T, substances) * self.cm.diffCm(i, y, T, substances)
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        ci = self.cm.ciBehavior.getBiVector(T, substances)
+        c = np.dot(np.asarray(y, dtype=np.float64), ci)
+        return -2.0 * bmb.bmFromArrays(y, bi) * bmb.diffBmFromArrays(
+            y, bi
+        ) + 4.0 * c * ci
+
+    def getdEpsilonmdT(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> float:
+        b = bmb.bm(y, T, bib, substances)
+        db = bmb.bmFromArrays(y, bmb.getdBidTVector(T, bib, substances))
+        c = self.cm.cm(y, T, substances)
+        dci = self.cm.ciBehavior.getdBidTVector(T, substances)
+        dc = np.dot(np.asarray(y, dtype=np.float64), dci)
+        return -2.0 * b * db + 4.0 * c * dc
+
 
 class AG2001(PR1976):
     def __init__(self, _subs, _k):
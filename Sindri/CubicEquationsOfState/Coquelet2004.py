@@ -2,7 +2,8 @@ from CubicEquationsOfState.MathiasAndCopeman1983 import (
     MathiasCopeman1983,
     thetaiMathiasCopeman1983,
 )
-import numpy as np
+from CubicEquationsOfState.PengAndRobinson1976 import kernelPR1976
+from EOSKernels import registerEOSKernel, ALPHA_MATHIAS_COPEMAN
 from typing import List
 from compounds import SubstanceProp
 
@@ -42,3 +43,9 @@ class Coquelet2004(MathiasCopeman1983):
         super().__init__(_subs, _k)
         self.eosname = "Coquelet, et al. (2004)"
         self.thetaiBehavior = thetaiCoquelet2004()
+
+
+registerEOSKernel(
+    Coquelet2004,
+    kernelPR1976(ALPHA_MATHIAS_COPEMAN, params=thetaiCoquelet2004().alphaParameters),
+)
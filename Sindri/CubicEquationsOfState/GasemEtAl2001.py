@@ -1,17 +1,22 @@
-from CubicEquationsOfState.PengAndRobinson1976 import PR1976, thetaiPR1976
-import numpy as np
+from CubicEquationsOfState.PengAndRobinson1976 import (
+    PR1976,
+    kernelPR1976,
+    thetaiKernelAlphaPR1976,
+)
+from EOSKernels import registerEOSKernel, ALPHA_GASEM
 
 
-class thetaiGasem2001(thetaiPR1976):
-    def alpha(self, i: int, T: float, substances):
-        tr = T / substances[i].Tc
-        w = substances[i].omega
+class thetaiGasem2001(thetaiKernelAlphaPR1976):
+    # alpha = exp((A + B tr) (1 - tr^(C + D omega + E omega^2)))
+    alpha_code = ALPHA_GASEM
+
+    def alphaParameters(self, substances):
         A = 2.0
         B = 0.836
         C = 0.134
         D = 0.508
         E = -0.0467
-        return np.exp((A + B * tr) * (1.0 - tr ** (C + D * w + E * w * w)))
+        return [[A, B, C + D * s.omega + E * s.omega * s.omega] for s in substances]
 
 
 class Gasem2001(PR1976):
@@ -19,3 +24,8 @@ class Gasem2001(PR1976):
         super().__init__(_subs, _k)
         self.eosname = "Gasem, et al. (2001)"
         self.thetaiBehavior = thetaiGasem2001()
+
+
+registerEOSKernel(
+    Gasem2001, kernelPR1976(ALPHA_GASEM, params=thetaiGasem2001().alphaParameters)
+)
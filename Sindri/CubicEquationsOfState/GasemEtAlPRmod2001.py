@@ -1,10 +1,14 @@
-from CubicEquationsOfState.PengAndRobinson1976 import PR1976, thetaiPR1976
+from CubicEquationsOfState.PengAndRobinson1976 import PR1976, kernelPR1976, thetaiPR1976
+from EOSKernels import registerEOSKernel, ALPHA_SOAVE
+
+
+def mGasemPRmod2001(w):
+    return 0.386590 + 1.50226 * w - 0.16870 * w * w
 
 
 class thetaiGasemPRmod2001(thetaiPR1976):
     def m(self, i: int, T: float, substances):
-        w = substances[i].omega
-        return 0.386590 + 1.50226 * w - 0.16870 * w * w
+        return mGasemPRmod2001(substances[i].omega)
 
 
 class GasemPRmod2001(PR1976):
@@ -12,3 +16,6 @@ class GasemPRmod2001(PR1976):
         super().__init__(_subs, _k)
         self.eosname = "Gasem, et al. PR modification (2001)"
         self.thetaiBehavior = thetaiGasemPRmod2001()
+
+
+registerEOSKernel(GasemPRmod2001, kernelPR1976(ALPHA_SOAVE, mGasemPRmod2001))
@@ -1,19 +1,13 @@
-from CubicEquationsOfState.PengAndRobinson1976 import PR1976, thetaiPR1976
-import numpy as np
+from CubicEquationsOfState.PengAndRobinson1976 import PR1976, kernelPR1976
+from CubicEquationsOfState.Twu1995 import thetaiTwu1995
+from EOSKernels import registerEOSKernel, ALPHA_TWU
 
+# (N0, M0, L0, N1, M1, L1) of the Twu alpha function
+GASEM_TWU_MOD_2001 = (-0.207176, 1.94800, 0.092099, -0.502297, 2.09626, 0.603486)
 
-class thetaiGasemTwuMod2001(thetaiPR1976):
-    def alpha(self, i: int, T: float, substances):
-        tr = T / substances[i].Tc
-        w = substances[i].omega
-        alpha0 = (tr) ** (-0.207176) * 2.718281828459045235360 ** (
-            0.092099 * (1 - (tr) ** (1.94800))
-        )
-        alpha1 = (tr) ** (-0.502297) * 2.718281828459045235360 ** (
-            0.603486 * (1 - (tr) ** (2.09626))
-        )
-        alpha = alpha0 + w * (alpha1 - alpha0)
-        return alpha
+
+class thetaiGasemTwuMod2001(thetaiTwu1995):
+    twu = GASEM_TWU_MOD_2001
 
 
 class GasemTwuMod2001(PR1976):
@@ -21,3 +15,9 @@ class GasemTwuMod2001(PR1976):
         super().__init__(_subs, _k)
         self.eosname = "Gasem, et al. Twu modification (2001)"
         self.thetaiBehavior = thetaiGasemTwuMod2001()
+
+
+registerEOSKernel(
+    GasemTwuMod2001,
+    kernelPR1976(ALPHA_TWU, params=thetaiGasemTwuMod2001().alphaParameters),
+)
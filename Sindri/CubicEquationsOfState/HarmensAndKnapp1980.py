@@ -1,6 +1,7 @@
 import numpy as np
 
 from EOSMixture import EOSMixture
+from EOSParametersBehavior.SoaveAlpha import dalphaSoave, d2alphaSoave
 from MixtureRules.ClassicMixtureRule import ClassicMixtureRule
 from MixtureRules.MixtureRulesInterface import (
     BiBehavior,
@@ -56,6 +57,20 @@ class thetaiHK1980(ThetaiBehavior):
     def getThetai(self, i: int, T: float, substances) -> float:
         return self.alpha(i, T, substances) * self.a(i, T, substances)
 
+    def dalpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return dalphaSoave(T, substances[i].Tc, _m)
+
+    def d2alpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return d2alphaSoave(T, substances[i].Tc, _m)
+
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        return self.dalpha(i, T, substances) * self.a(i, T, substances)
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        return self.d2alpha(i, T, substances) * self.a(i, T, substances)
+
 
 class deltaMixHK1980(DeltaMixtureRuleBehavior):
     def deltam(
@@ -68,6 +83,18 @@ class deltaMixHK1980(DeltaMixtureRuleBehavior):
     ) -> float:
         return 2.0 * bmb.diffBm(i, y, T, bib, substances)
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return 2.0 * bmb.diffBmFromArrays(y, bi)
+
+    def deltamVector(
+        self, Y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return 2.0 * bmb.bmFromArrays(Y, bi)
+
 
 class epsilonMixHK1980(EpsilonMixtureRuleBehavior):
     def epsilonm(
@@ -82,6 +109,18 @@ class epsilonMixHK1980(EpsilonMixtureRuleBehavior):
             -2.0 * bmb.bm(y, T, bib, substances) * bmb.diffBm(i, y, T, bib, substances)
         )
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return -2.0 * bmb.bmFromArrays(y, bi) * bmb.diffBmFromArrays(y, bi)
+
+    def epsilonmVector(
+        self, Y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return -(bmb.bmFromArrays(Y, bi)) ** 2
+
 
 class HK1980(EOSMixture):
     def __init__(self, _subs, _k):
@@ -1,10 +1,17 @@
-from CubicEquationsOfState.PengAndRobinson1976 import PR1976, thetaiPR1976
-import numpy as np
+from CubicEquationsOfState.PengAndRobinson1976 import (
+    PR1976,
+    kernelPR1976,
+    thetaiKernelAlphaPR1976,
+)
+from EOSKernels import registerEOSKernel, ALPHA_MATHIAS_COPEMAN
 from typing import List
 from compounds import SubstanceProp
 
 
-class thetaiMathiasCopeman1983(thetaiPR1976):
+class thetaiMathiasCopeman1983(thetaiKernelAlphaPR1976):
+    # alpha = exp(c1 (1 - tr)) (1 + c2 x^2 + c3 x^3)^2 with x = 1 - sqrt(tr)
+    alpha_code = ALPHA_MATHIAS_COPEMAN
+
     def __init__(self):
         self.subset = ["water", "methanol", "ethanol"]
 
@@ -36,15 +43,11 @@ class thetaiMathiasCopeman1983(thetaiPR1976):
             _c3 = 0.7661 * w + 0.3041
         return _c3
 
-    def alpha(self, i: int, T: float, substances):
-        c1 = self.c1(i, substances)
-        c2 = self.c2(i, substances)
-        c3 = self.c3(i, substances)
-        tr = T / substances[i].Tc
-        return (
-            np.exp(c1 * (1 - tr))
-            * (1 + c2 * (1 - tr ** 0.5) ** 2 + c3 * (1 - tr ** 0.5) ** 3) ** 2
-        )
+    def alphaParameters(self, substances):
+        return [
+            [self.c1(i, substances), self.c2(i, substances), self.c3(i, substances)]
+            for i in range(len(substances))
+        ]
 
 
 class MathiasCopeman1983(PR1976):
@@ -52,3 +55,11 @@ class MathiasCopeman1983(PR1976):
         super().__init__(_subs, _k)
         self.eosname = "Mathias and Copeman (1983)"
         self.thetaiBehavior = thetaiMathiasCopeman1983()
+
+
+registerEOSKernel(
+    MathiasCopeman1983,
+    kernelPR1976(
+        ALPHA_MATHIAS_COPEMAN, params=thetaiMathiasCopeman1983().alphaParameters
+    ),
+)
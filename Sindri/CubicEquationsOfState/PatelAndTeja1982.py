@@ -1,6 +1,8 @@
 import numpy as np
 
 from EOSMixture import EOSMixture
+from EOSParametersBehavior.ParametersBehaviorInterface import PrecomputedBehavior
+from EOSParametersBehavior.SoaveAlpha import dalphaSoave, d2alphaSoave
 from MixtureRules.ClassicMixtureRule import ClassicMixtureRule
 from MixtureRules.MixtureRulesInterface import (
     BiBehavior,
@@ -31,15 +33,23 @@ def _calc_a_b_c(i: int, T: float, substances):
 
 
 class biPT1982(BiBehavior):
+    def precompute(self, substances):
+        n = len(substances)
+        self._b = np.array([_calc_a_b_c(i, 0.0, substances)[1] for i in range(n)])
+
     def getBi(self, i: int, T: float, substances) -> float:
-        a, b, c = _calc_a_b_c(i, T, substances)
-        return b
+        self.checkPrecomputed(substances)
+        return self._b[i]
 
 
 class thetaiPT1982(ThetaiBehavior):
+    def precompute(self, substances):
+        n = len(substances)
+        self._a = np.array([_calc_a_b_c(i, 0.0, substances)[0] for i in range(n)])
+
     def a(self, i: int, T: float, substances):
-        a, b, c = _calc_a_b_c(i, T, substances)
-        return a
+        self.checkPrecomputed(substances)
+        return self._a[i]
 
     def m(self, i: int, T: float, substances):
         w = substances[i].omega
@@ -54,22 +64,41 @@ class thetaiPT1982(ThetaiBehavior):
         _alpha = self.alpha(i, T, substances)
         return _alpha * self.a(i, T, substances)
 
+    def dalpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return dalphaSoave(T, substances[i].Tc, _m)
+
+    def d2alpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return d2alphaSoave(T, substances[i].Tc, _m)
+
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        return self.dalpha(i, T, substances) * self.a(i, T, substances)
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        return self.d2alpha(i, T, substances) * self.a(i, T, substances)
+
+
+class CBehavior(PrecomputedBehavior):
+    def precompute(self, substances):
+        n = len(substances)
+        self._c = np.array([_calc_a_b_c(i, 0.0, substances)[2] for i in range(n)])
 
-class CBehavior:
     def getCi(self, i: int, T: float, substances):
-        a, b, c = _calc_a_b_c(i, T, substances)
-        return c
+        self.checkPrecomputed(substances)
+        return self._c[i]
 
     def getCm(self, y, T: float, substances):
-        s = 0.0
-        for i in range(len(y)):
-            c = self.getCi(i, T, substances)
-            s += c * y[i]
-        return s
+        self.checkPrecomputed(substances)
+        return np.dot(np.asarray(y, dtype=np.float64), self._c)
 
     def getDiffCm(self, i: int, y, T: float, substances):
         return self.getCi(i, T, substances)
 
+    def getCiVector(self, T: float, substances) -> np.ndarray:
+        self.checkPrecomputed(substances)
+        return self._c
+
 
 class deltaMixPT1982(DeltaMixtureRuleBehavior):
     def __init__(self):
@@ -89,6 +118,12 @@ class deltaMixPT1982(DeltaMixtureRuleBehavior):
         bline = bmb.diffBm(i, y, T, bib, substances)
         return cline + bline
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return self.c.getCiVector(T, substances) + bmb.diffBmFromArrays(y, bi)
+
 
 class epsilonMixPT1982(EpsilonMixtureRuleBehavior):
     def __init__(self):
@@ -110,6 +145,15 @@ class epsilonMixPT1982(EpsilonMixtureRuleBehavior):
         bline = bmb.diffBm(i, y, T, bib, substances)
         return -bline * c - cline * b
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        ci = self.c.getCiVector(T, substances)
+        c = np.dot(np.asarray(y, dtype=np.float64), ci)
+        bi = bmb.getBiVector(T, bib, substances)
+        b = bmb.bmFromArrays(y, bi)
+        return -bmb.diffBmFromArrays(y, bi) * c - ci * b
+
 
 class PT1982(EOSMixture):
     def __init__(self, _subs, _k):
@@ -1,3 +1,5 @@
+import numpy as np
+
 from CubicEquationsOfState.Soave1972 import Soave1972
 from MixtureRules.ClassicMixtureRule import ClassicMixtureRule, ClassicBMixture
 from MixtureRules.MixtureRulesInterface import (
@@ -19,27 +21,28 @@ class CiBehavior:
             * (0.00385 + 0.08775 * w)
         )
 
+    def getCiVector(self, T: float, substances) -> np.ndarray:
+        return np.array(
+            [self.getCi(i, T, substances) for i in range(len(substances))],
+            dtype=np.float64,
+        )
+
 
 class CMixBehavior:
     def __init__(self):
         self.ci = CiBehavior()
 
     def cm(self, y, T: float, substances):
-        s = 0.0
-        for i in range(len(y)):
-            s += y[i] * self.ci.getCi(i, T, substances)
-        return s
+        y = np.asarray(y, dtype=np.float64)
+        return np.dot(y, self.ci.getCiVector(T, substances))
 
 
 class BMixtureRuleBehaviorVolumeTranslated(ClassicBMixture):
     def __init__(self):
         self.cm = CMixBehavior()
 
-    def bm(self, y, T: float, bib: BiBehavior, substances) -> float:
-        s1 = 0.0
-        for i in range(len(y)):
-            s1 += y[i] * bib.getBi(i, T, substances)
-        return s1 - self.cm.cm(y, T, substances)
+    def getBiVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        return bib.getBiVector(T, substances) - self.cm.ci.getCiVector(T, substances)
 
     def diffBm(self, i: int, y, T: float, bib: BiBehavior, substances) -> float:
         return bib.getBi(i, T, substances) - self.cm.ci.getCi(i, T, substances)
@@ -70,6 +73,12 @@ class deltaMixPeneloux1982(DeltaMixtureRuleBehavior):
             + self.cm.ci.getCi(i, T, substances) * 3.0
         )
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return bmb.diffBmFromArrays(y, bi) + self.cm.ci.getCiVector(T, substances) * 3.0
+
 
 class epsilonMixPeneloux1982(EpsilonMixtureRuleBehavior):
     def __init__(self):
@@ -97,6 +106,16 @@ class epsilonMixPeneloux1982(EpsilonMixtureRuleBehavior):
         cline = self.cm.ci.getCi(i, T, substances)
         return bline * c + cline * b + 4.0 * c * cline
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        b = bmb.bmFromArrays(y, bi)
+        bline = bmb.diffBmFromArrays(y, bi)
+        c = self.cm.cm(y, T, substances)
+        cline = self.cm.ci.getCiVector(T, substances)
+        return bline * c + cline * b + 4.0 * c * cline
+
 
 class PenelouxEtAl1982(Soave1972):
     def __init__(self, _subs, _k):
@@ -1,6 +1,8 @@
 import numpy as np
 
 from EOSMixture import EOSMixture
+from EOSKernels import EOSKernel, registerEOSKernel, kernel_alpha, ALPHA_SOAVE
+from EOSParametersBehavior.SoaveAlpha import dalphaSoave, d2alphaSoave
 from MixtureRules.ClassicMixtureRule import ClassicMixtureRule
 from MixtureRules.MixtureRulesInterface import (
     BiBehavior,
@@ -11,19 +13,34 @@ from MixtureRules.MixtureRulesInterface import (
 )
 from constants import R_IG
 
+OMEGA_A = 0.45724
+OMEGA_B = 0.07780
+
+
+def mPR1976(w):
+    return 0.37464 + 1.54226 * w - 0.26992 * w * w
+
 
 class biPR1976(BiBehavior):
     def getBi(self, i: int, T: float, substances) -> float:
-        return 0.07780 / (substances[i].Pc / (R_IG * substances[i].Tc))
+        return OMEGA_B / (substances[i].Pc / (R_IG * substances[i].Tc))
 
 
 class thetaiPR1976(ThetaiBehavior):
+    def precompute(self, substances):
+        tc = np.array([s.Tc for s in substances], dtype=np.float64)
+        pc = np.array([s.Pc for s in substances], dtype=np.float64)
+        w = np.array([s.omega for s in substances], dtype=np.float64)
+        self._a = OMEGA_A * np.power(R_IG * tc, 2) / pc
+        self._m = mPR1976(w)
+
     def a(self, i: int, T: float, substances):
-        return 0.45724 * np.power(R_IG * substances[i].Tc, 2) / substances[i].Pc
+        self.checkPrecomputed(substances)
+        return self._a[i]
 
     def m(self, i: int, T: float, substances):
-        w = substances[i].omega
-        return 0.37464 + 1.54226 * w - 0.26992 * w * w
+        self.checkPrecomputed(substances)
+        return self._m[i]
 
     def alpha(self, i: int, T: float, substances):
         _m = self.m(i, T, substances)
@@ -32,6 +49,60 @@ class thetaiPR1976(ThetaiBehavior):
     def getThetai(self, i: int, T: float, substances) -> float:
         return self.alpha(i, T, substances) * self.a(i, T, substances)
 
+    def dm(self, i: int, T: float, substances):
+        return 0.0
+
+    def d2m(self, i: int, T: float, substances):
+        return 0.0
+
+    def dalpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        _dm = self.dm(i, T, substances)
+        return dalphaSoave(T, substances[i].Tc, _m, _dm)
+
+    def d2alpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        _dm = self.dm(i, T, substances)
+        _d2m = self.d2m(i, T, substances)
+        return d2alphaSoave(T, substances[i].Tc, _m, _dm, _d2m)
+
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        return self.dalpha(i, T, substances) * self.a(i, T, substances)
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        return self.d2alpha(i, T, substances) * self.a(i, T, substances)
+
+
+class thetaiKernelAlphaPR1976(thetaiPR1976):
+    """
+    a_i of Peng and Robinson with one of the alpha functions of the compiled
+    kernels, coded by alpha_code, for the component rows of alphaParameters.
+    The kernel of the model packs the same rows.
+    """
+
+    alpha_code = ALPHA_SOAVE
+
+    def alphaParameters(self, substances):
+        raise NotImplementedError
+
+    def precompute(self, substances):
+        super().precompute(substances)
+        p = np.array(self.alphaParameters(substances), dtype=np.float64)
+        self._alpha_p = p.reshape(len(substances), -1)
+
+    def _alphaTr(self, i: int, T: float, substances):
+        self.checkPrecomputed(substances)
+        return kernel_alpha(T / substances[i].Tc, self._alpha_p[i], self.alpha_code)
+
+    def alpha(self, i: int, T: float, substances):
+        return self._alphaTr(i, T, substances)[0]
+
+    def dalpha(self, i: int, T: float, substances):
+        return self._alphaTr(i, T, substances)[1] / substances[i].Tc
+
+    def d2alpha(self, i: int, T: float, substances):
+        return self._alphaTr(i, T, substances)[2] / substances[i].Tc ** 2
+
 
 class deltaMixPR1976(DeltaMixtureRuleBehavior):
     def deltam(
@@ -44,6 +115,18 @@ class deltaMixPR1976(DeltaMixtureRuleBehavior):
     ) -> float:
         return 2.0 * bmb.diffBm(i, y, T, bib, substances)
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return 2.0 * bmb.diffBmFromArrays(y, bi)
+
+    def deltamVector(
+        self, Y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return 2.0 * bmb.bmFromArrays(Y, bi)
+
 
 class epsilonMixPR1976(EpsilonMixtureRuleBehavior):
     def epsilonm(
@@ -58,6 +141,18 @@ class epsilonMixPR1976(EpsilonMixtureRuleBehavior):
             -2.0 * bmb.bm(y, T, bib, substances) * bmb.diffBm(i, y, T, bib, substances)
         )
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return -2.0 * bmb.bmFromArrays(y, bi) * bmb.diffBmFromArrays(y, bi)
+
+    def epsilonmVector(
+        self, Y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return -(bmb.bmFromArrays(Y, bi)) ** 2
+
 
 class PR1976(EOSMixture):
     def __init__(self, _subs, _k):
@@ -68,3 +163,14 @@ class PR1976(EOSMixture):
         self.thetaiBehavior = thetaiPR1976()
         self.deltaMixBehavior = deltaMixPR1976()
         self.epsilonMixBehavior = epsilonMixPR1976()
+
+
+def kernelPR1976(alpha: int, m=None, params=None) -> EOSKernel:
+    """
+    EOSKernel with the constants of Peng and Robinson, delta = 2 b and
+    epsilon = -b^2, for the models that only change its alpha function.
+    """
+    return EOSKernel(OMEGA_A, OMEGA_B, 2.0, -1.0, alpha, m, params)
+
+
+registerEOSKernel(PR1976, kernelPR1976(ALPHA_SOAVE, mPR1976))
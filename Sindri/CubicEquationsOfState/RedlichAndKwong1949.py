@@ -1,6 +1,7 @@
 import numpy as np
 
 from EOSMixture import EOSMixture
+from EOSKernels import EOSKernel, registerEOSKernel, ALPHA_RK
 from EOSParametersBehavior.ParametersBehaviorInterface import (
     DeltaiBehavior,
     EpsiloniBehavior,
@@ -15,15 +16,18 @@ from MixtureRules.MixtureRulesInterface import (
 )
 from constants import R_IG
 
+OMEGA_A = 0.42748
+OMEGA_B = 0.08664
+
 
 class biRK1949(BiBehavior):
     def getBi(self, i: int, T: float, substances) -> float:
-        return 0.08664 / (substances[i].Pc / (R_IG * substances[i].Tc))
+        return OMEGA_B / (substances[i].Pc / (R_IG * substances[i].Tc))
 
 
 class thetaiRK1949(ThetaiBehavior):
     def a(self, i: int, T: float, substances):
-        return 0.42748 * (R_IG * substances[i].Tc) ** 2 / substances[i].Pc
+        return OMEGA_A * (R_IG * substances[i].Tc) ** 2 / substances[i].Pc
 
     def alpha(self, i: int, T: float, substances):
         return 1.0 / np.sqrt(T / substances[i].Tc)
@@ -32,6 +36,20 @@ class thetaiRK1949(ThetaiBehavior):
         _alpha = self.alpha(i, T, substances)
         return _alpha * self.a(i, T, substances)
 
+    def dalpha(self, i: int, T: float, substances):
+        tc = substances[i].Tc
+        return -0.5 * np.power(T / tc, -1.5) / tc
+
+    def d2alpha(self, i: int, T: float, substances):
+        tc = substances[i].Tc
+        return 0.75 * np.power(T / tc, -2.5) / (tc * tc)
+
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        return self.dalpha(i, T, substances) * self.a(i, T, substances)
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        return self.d2alpha(i, T, substances) * self.a(i, T, substances)
+
 
 class epsiloniRK1949(EpsiloniBehavior):
     def getEpsiloni(self, b: float) -> float:
@@ -60,6 +78,18 @@ class deltaMixRK1949(DeltaMixtureRuleBehavior):
     ) -> float:
         return bmb.diffBm(i, y, T, bib, substances)
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return bmb.diffBmFromArrays(y, bi)
+
+    def deltamVector(
+        self, Y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return bmb.bmFromArrays(Y, bi)
+
 
 class epsilonMixRK1949(EpsilonMixtureRuleBehavior):
     def epsilonm(
@@ -78,6 +108,16 @@ class epsilonMixRK1949(EpsilonMixtureRuleBehavior):
     ) -> float:
         return 0.0
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.zeros(len(substances), dtype=np.float64)
+
+    def epsilonmVector(
+        self, Y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.zeros(len(Y), dtype=np.float64)
+
 
 class RedlichAndKwong1949(EOSMixture):
     def __init__(self, _subs, _k):
@@ -90,3 +130,6 @@ class RedlichAndKwong1949(EOSMixture):
         self.epsiloniBehavior = epsiloniRK1949()
         self.deltaMixBehavior = deltaMixRK1949()
         self.epsilonMixBehavior = epsilonMixRK1949()
+
+
+registerEOSKernel(RedlichAndKwong1949, EOSKernel(OMEGA_A, OMEGA_B, 1.0, 0.0, ALPHA_RK))
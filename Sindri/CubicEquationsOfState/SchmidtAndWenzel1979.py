@@ -1,6 +1,7 @@
 import numpy as np
 
 from EOSMixture import EOSMixture
+from EOSParametersBehavior.SoaveAlpha import dalphaSoave, d2alphaSoave
 from MixtureRules.ClassicMixtureRule import ClassicMixtureRule
 from MixtureRules.MixtureRulesInterface import (
     BiBehavior,
@@ -28,10 +29,21 @@ def _calc_a_and_b(T: float, Tc: float, Pc: float, w: float):
     return a, b
 
 
+def _calc_a_and_b_vectors(substances):
+    ab = np.array(
+        [_calc_a_and_b(0.0, s.Tc, s.Pc, s.omega) for s in substances],
+        dtype=np.float64,
+    ).reshape(len(substances), 2)
+    return ab[:, 0], ab[:, 1]
+
+
 class biSW1979(BiBehavior):
+    def precompute(self, substances):
+        a, self._b = _calc_a_and_b_vectors(substances)
+
     def getBi(self, i: int, T: float, substances) -> float:
-        a, b = _calc_a_and_b(T, substances[i].Tc, substances[i].Pc, substances[i].omega)
-        return b
+        self.checkPrecomputed(substances)
+        return self._b[i]
 
 
 class thetaiSW1979(ThetaiBehavior):
@@ -44,9 +56,12 @@ class thetaiSW1979(ThetaiBehavior):
         k = k0 + (5.0 * tr - 3.0 * k0 - 1.0) ** 2 / 70.0
         return k
 
+    def precompute(self, substances):
+        self._a, b = _calc_a_and_b_vectors(substances)
+
     def a(self, i: int, T: float, substances):
-        a, b = _calc_a_and_b(T, substances[i].Tc, substances[i].Pc, substances[i].omega)
-        return a
+        self.checkPrecomputed(substances)
+        return self._a[i]
 
     def alpha(self, i: int, T: float, substances):
         _m = self.m(i, T, substances)
@@ -56,12 +71,44 @@ class thetaiSW1979(ThetaiBehavior):
         _alpha = self.alpha(i, T, substances)
         return _alpha * self.a(i, T, substances)
 
+    def dm(self, i: int, T: float, substances):
+        w = substances[i].omega
+        tc = substances[i].Tc
+        if T / tc > 1:
+            return 0.0
+        k0 = 0.465 + w * (1.347 - 0.528 * w)
+        return 10.0 * (5.0 * T / tc - 3.0 * k0 - 1.0) / (70.0 * tc)
+
+    def d2m(self, i: int, T: float, substances):
+        tc = substances[i].Tc
+        if T / tc > 1:
+            return 0.0
+        return 50.0 / (70.0 * tc * tc)
+
+    def dalpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        _dm = self.dm(i, T, substances)
+        return dalphaSoave(T, substances[i].Tc, _m, _dm)
+
+    def d2alpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        _dm = self.dm(i, T, substances)
+        _d2m = self.d2m(i, T, substances)
+        return d2alphaSoave(T, substances[i].Tc, _m, _dm, _d2m)
+
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        return self.dalpha(i, T, substances) * self.a(i, T, substances)
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        return self.d2alpha(i, T, substances) * self.a(i, T, substances)
+
 
 def getW(y, substances):
-    s = 0.0
-    for i in range(len(y)):
-        s += substances[i].omega * y[i]
-    return -3.0 * s
+    return -3.0 * np.dot(np.asarray(y, dtype=np.float64), getOmegaVector(substances))
+
+
+def getOmegaVector(substances) -> np.ndarray:
+    return np.array([s.omega for s in substances], dtype=np.float64)
 
 
 class deltaMixSW1979(DeltaMixtureRuleBehavior):
@@ -80,6 +127,15 @@ class deltaMixSW1979(DeltaMixtureRuleBehavior):
             - bmb.bm(y, T, bib, substances) * substances[i].omega
         )
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        u = 1.0 - getW(y, substances)
+        bi = bmb.getBiVector(T, bib, substances)
+        return u * bmb.diffBmFromArrays(y, bi) - bmb.bmFromArrays(
+            y, bi
+        ) * getOmegaVector(substances)
+
 
 class epsilonMixSW1979(EpsilonMixtureRuleBehavior):
     def epsilonm(
@@ -97,6 +153,16 @@ class epsilonMixSW1979(EpsilonMixtureRuleBehavior):
         diffb = bmb.diffBm(i, y, T, bib, substances)
         return diffw * b * b + w * 2.0 * b * diffb
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        w = getW(y, substances)
+        diffw = getOmegaVector(substances)
+        bi = bmb.getBiVector(T, bib, substances)
+        b = bmb.bmFromArrays(y, bi)
+        diffb = bmb.diffBmFromArrays(y, bi)
+        return diffw * b * b + w * 2.0 * b * diffb
+
 
 class SW1979(EOSMixture):
     def __init__(self, _subs, _k):
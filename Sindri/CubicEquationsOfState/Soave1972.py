@@ -1,21 +1,41 @@
 import numpy as np
 
-from CubicEquationsOfState.Wilson1964 import Wilson1964, thetaiWilson1964
+from CubicEquationsOfState.Wilson1964 import (
+    Wilson1964,
+    kernelWilson1964,
+    thetaiWilson1964,
+)
+from EOSKernels import registerEOSKernel, ALPHA_SOAVE
+from EOSParametersBehavior.SoaveAlpha import dalphaSoave, d2alphaSoave
+
+
+def mSoave1972(w):
+    return 0.48 + w * (1.574 - 0.176 * w)
 
 
 class thetaiSoave1972(thetaiWilson1964):
     def m(self, i: int, T: float, substances):
-        w = substances[i].omega
-        return 0.48 + w * (1.574 - 0.176 * w)
+        return mSoave1972(substances[i].omega)
 
     def alpha(self, i: int, T: float, substances):
         tr = T / substances[i].Tc
         m = self.m(i, T, substances)
         return (1.0 + m * (1.0 - np.sqrt(tr))) ** 2
 
+    def dalpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return dalphaSoave(T, substances[i].Tc, _m)
+
+    def d2alpha(self, i: int, T: float, substances):
+        _m = self.m(i, T, substances)
+        return d2alphaSoave(T, substances[i].Tc, _m)
+
 
 class Soave1972(Wilson1964):
     def __init__(self, _subs, _k):
         super().__init__(_subs, _k)
         self.eosname = "Soave (1972)"
         self.thetaiBehavior = thetaiSoave1972()
+
+
+registerEOSKernel(Soave1972, kernelWilson1964(ALPHA_SOAVE, mSoave1972))
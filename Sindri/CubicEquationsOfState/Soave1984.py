@@ -2,14 +2,23 @@ from typing import List
 
 import numpy as np
 
-from CubicEquationsOfState.vanderWaals1890 import thetaivanderWaals1890, vanderWaals1890
+from CubicEquationsOfState.vanderWaals1890 import (
+    kernelvanderWaals1890,
+    thetaivanderWaals1890,
+    vanderWaals1890,
+)
+from EOSKernels import registerEOSKernel, ALPHA_SOAVE
+from EOSParametersBehavior.SoaveAlpha import dalphaSoave, d2alphaSoave
 from compounds import SubstanceProp
 
 
+def mSoave1984(w):
+    return 0.4998 + w * (1.5928 + w * (-0.19563 + w * 0.025))
+
+
 class thetaiSoave1984(thetaivanderWaals1890):
     def m(self, i: int, T: float, substances: List[SubstanceProp]):
-        w = substances[i].omega
-        return 0.4998 + w * (1.5928 + w * (-0.19563 + w * 0.025))
+        return mSoave1984(substances[i].omega)
 
     def alpha(self, i: int, T: float, substances: List[SubstanceProp]):
         tr = T / substances[i].Tc
@@ -21,9 +30,28 @@ class thetaiSoave1984(thetaivanderWaals1890):
         alpha = self.alpha(i, T, substances)
         return a * alpha
 
+    def dalpha(self, i: int, T: float, substances: List[SubstanceProp]):
+        _m = self.m(i, T, substances)
+        return dalphaSoave(T, substances[i].Tc, _m)
+
+    def d2alpha(self, i: int, T: float, substances: List[SubstanceProp]):
+        _m = self.m(i, T, substances)
+        return d2alphaSoave(T, substances[i].Tc, _m)
+
+    def getdThetaidT(self, i: int, T: float, substances: List[SubstanceProp]) -> float:
+        return self.a(i, T, substances) * self.dalpha(i, T, substances)
+
+    def getd2ThetaidT2(
+        self, i: int, T: float, substances: List[SubstanceProp]
+    ) -> float:
+        return self.a(i, T, substances) * self.d2alpha(i, T, substances)
+
 
 class Soave1984(vanderWaals1890):
     def __init__(self, _subs, _k):
         super().__init__(_subs, _k)
         self.eosname = "Soave (1984)"
         self.thetaiBehavior = thetaiSoave1984()
+
+
+registerEOSKernel(Soave1984, kernelvanderWaals1890(ALPHA_SOAVE, mSoave1984))
@@ -1,31 +1,63 @@
-from CubicEquationsOfState.PengAndRobinson1976 import PR1976, thetaiPR1976
+import numpy as np
+
+from CubicEquationsOfState.PengAndRobinson1976 import PR1976, kernelPR1976, thetaiPR1976
+from EOSKernels import registerEOSKernel, ALPHA_STRYJEK_VERA
 
 
 class thetaiSV1986(thetaiPR1976):
+    def precompute(self, substances):
+        super().precompute(substances)
+        k1 = np.zeros(len(substances), dtype=np.float64)
+        for i in range(len(substances)):
+            name = substances[i].Name
+            if name == "hexadecane":
+                k1[i] = 0.02665
+            elif name == "hexane":
+                k1[i] = 0.05104
+            elif name == "cyclohexane":
+                k1[i] = 0.07023
+            elif name == "methane":
+                k1[i] = -0.00159
+            elif name == "benzene":
+                k1[i] = 0.07019
+        w = np.array([s.omega for s in substances], dtype=np.float64)
+        self._k0 = 0.378893 + 1.48971530 * w - 0.17131848 * w ** 2 + 0.0196554 * w ** 3
+        self._k1 = k1
+
     def m(self, i: int, T: float, substances):
-        w = substances[i].omega
-        name = substances[i].Name
-        k0 = 0.378893 + 1.48971530 * w - 0.17131848 * w ** 2 + 0.0196554 * w ** 3
-        k1 = 0
-
-        if name == "hexadecane":
-            k1 = 0.02665
-        elif name == "hexane":
-            k1 = 0.05104
-        elif name == "cyclohexane":
-            k1 = 0.07023
-        elif name == "methane":
-            k1 = -0.00159
-        elif name == "benzene":
-            k1 = 0.07019
+        k1 = self.getk1(i, substances)
+        k0 = self._k0[i]
 
         Tr = T / substances[i].Tc
         k = k0 + k1 * (1 + Tr) * (0.7 - Tr)
         return k
 
+    def getk1(self, i: int, substances):
+        self.checkPrecomputed(substances)
+        return self._k1[i]
+
+    def dm(self, i: int, T: float, substances):
+        tc = substances[i].Tc
+        return self.getk1(i, substances) * (-0.3 - 2.0 * T / tc) / tc
+
+    def d2m(self, i: int, T: float, substances):
+        tc = substances[i].Tc
+        return -2.0 * self.getk1(i, substances) / (tc * tc)
+
 
 class SV1986(PR1976):
     def __init__(self, _subs, _k):
         super().__init__(_subs, _k)
         self.eosname = "Stryjek and Vera (1986)"
         self.thetaiBehavior = thetaiSV1986()
+
+
+def _kernelParametersSV1986(substances):
+    thetai = thetaiSV1986()
+    k1 = [thetai.getk1(i, substances) for i in range(len(substances))]
+    return np.column_stack((thetai._k0, k1))
+
+
+registerEOSKernel(
+    SV1986, kernelPR1976(ALPHA_STRYJEK_VERA, params=_kernelParametersSV1986)
+)
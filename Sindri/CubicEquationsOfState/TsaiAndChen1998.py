@@ -1,5 +1,7 @@
 from typing import List
 
+import numpy as np
+
 from CubicEquationsOfState.PengAndRobinson1976 import PR1976, biPR1976, thetaiPR1976
 from EOSParametersBehavior.ParametersBehaviorInterface import BiBehavior
 from MixtureRules.ClassicMixtureRule import ClassicBMixture, ClassicMixtureRule
@@ -13,13 +15,21 @@ from constants import R_IG
 
 
 class tiTC1998(BiBehavior):
+    def precompute(self, substances: List[SubstanceProp]):
+        n = len(substances)
+        self._k1 = np.array([self.getk1(i, 0.0, substances) for i in range(n)])
+        self._k3 = np.array([self.getk3(i, substances) for i in range(n)])
+        self._k2 = self.getk2(self._k3)
+
+    def getK(self, i: int, substances: List[SubstanceProp]):
+        self.checkPrecomputed(substances)
+        return self._k1[i], self._k2[i], self._k3[i]
+
     def getBi(self, i: int, T: float, substances: List[SubstanceProp]) -> float:
         return self.getTi(i, T, substances)
 
     def getTi(self, i: int, T: float, substances: List[SubstanceProp]) -> float:
-        k1 = self.getk1(i, T, substances)
-        k3 = self.getk3(i, substances)
-        k2 = self.getk2(k3)
+        k1, k2, k3 = self.getK(i, substances)
         tc = substances[i].Tc
         pc = substances[i].Pc
         one_minus_tr_pow_two_thirds = 1.0 - (T / tc) ** (2.0 / 3.0)
@@ -47,6 +57,21 @@ class tiTC1998(BiBehavior):
             k = -0.04426
         return k
 
+    def getdTidT(self, i: int, T: float, substances: List[SubstanceProp]) -> float:
+        k1, k2, k3 = self.getK(i, substances)
+        tc = substances[i].Tc
+        pc = substances[i].Pc
+        one_minus_tr_pow_two_thirds = 1.0 - (T / tc) ** (2.0 / 3.0)
+        d_one_minus_tr_pow_two_thirds = -(2.0 / 3.0) * (T / tc) ** (-1.0 / 3.0) / tc
+        return (
+            (R_IG * tc / pc)
+            * (k2 + 2.0 * k3 * one_minus_tr_pow_two_thirds)
+            * d_one_minus_tr_pow_two_thirds
+        )
+
+    def getdBidT(self, i: int, T: float, substances: List[SubstanceProp]) -> float:
+        return self.getdTidT(i, T, substances)
+
 
 class tmTC1998:
     def __init__(self):
@@ -61,10 +86,19 @@ class tmTC1998:
 
 
 class thetaiTC1998(thetaiPR1976):
+    def precompute(self, substances: List[SubstanceProp]):
+        super().precompute(substances)
+        n = len(substances)
+        self._M = np.array([self.getM(i, substances) for i in range(n)])
+        self._N = np.array([self.getN(i, substances) for i in range(n)])
+
+    def getMN(self, i: int, substances: List[SubstanceProp]):
+        self.checkPrecomputed(substances)
+        return self._M[i], self._N[i]
+
     def alpha(self, i: int, T: float, substances: List[SubstanceProp]):
         tr = T / substances[i].Tc
-        M = self.getM(i, substances)
-        N = self.getN(i, substances)
+        M, N = self.getMN(i, substances)
         return (1.0 + M * (1.0 - tr) + N * (1.0 - tr) * (0.7 - tr)) ** 2
 
     def getM(self, i: int, substances: List[SubstanceProp]):
@@ -81,6 +115,22 @@ class thetaiTC1998(thetaiPR1976):
 
         return N
 
+    def dalpha(self, i: int, T: float, substances: List[SubstanceProp]):
+        tc = substances[i].Tc
+        tr = T / tc
+        M, N = self.getMN(i, substances)
+        g = 1.0 + M * (1.0 - tr) + N * (1.0 - tr) * (0.7 - tr)
+        dg = -M + N * (2.0 * tr - 1.7)
+        return 2.0 * g * dg / tc
+
+    def d2alpha(self, i: int, T: float, substances: List[SubstanceProp]):
+        tc = substances[i].Tc
+        tr = T / tc
+        M, N = self.getMN(i, substances)
+        g = 1.0 + M * (1.0 - tr) + N * (1.0 - tr) * (0.7 - tr)
+        dg = -M + N * (2.0 * tr - 1.7)
+        return 2.0 * (dg * dg + 2.0 * N * g) / tc ** 2
+
 
 class deltaMixTC1998(DeltaMixtureRuleBehavior):
     def __init__(self):
@@ -98,6 +148,23 @@ class deltaMixTC1998(DeltaMixtureRuleBehavior):
             i, y, T, substances
         )
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return 2.0 * bmb.diffBmFromArrays(y, bi) + 4.0 * self.tm.tiBehavior.getBiVector(
+            T, substances
+        )
+
+    def getdDeltamdT(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> float:
+        dbi = bmb.getdBidTVector(T, bib, substances)
+        dci = self.tm.tiBehavior.getdBidTVector(T, substances)
+        return 2.0 * bmb.bmFromArrays(y, dbi) + 4.0 * np.dot(
+            np.asarray(y, dtype=np.float64), dci
+        )
+
 
 class epsilonMixTC1998(EpsilonMixtureRuleBehavior):
     def __init__(self):
@@ -118,6 +185,26 @@ class epsilonMixTC1998(EpsilonMixtureRuleBehavior):
             i, y, T, bib, substances
         ) + 4.0 * self.tm.tm(y, T, substances) * self.tm.diffTm(i, y, T, substances)
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        ci = self.tm.tiBehavior.getBiVector(T, substances)
+        c = np.dot(np.asarray(y, dtype=np.float64), ci)
+        return -2.0 * bmb.bmFromArrays(y, bi) * bmb.diffBmFromArrays(
+            y, bi
+        ) + 4.0 * c * ci
+
+    def getdEpsilonmdT(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> float:
+        b = bmb.bm(y, T, bib, substances)
+        db = bmb.bmFromArrays(y, bmb.getdBidTVector(T, bib, substances))
+        c = self.tm.tm(y, T, substances)
+        dci = self.tm.tiBehavior.getdBidTVector(T, substances)
+        dc = np.dot(np.asarray(y, dtype=np.float64), dci)
+        return -2.0 * b * db + 4.0 * c * dc
+
 
 class biTC1998(BiBehavior):
     def __init__(self):
@@ -133,11 +220,15 @@ class BMixtureRuleBehaviorVolumeTranslated(ClassicBMixture):
     def __init__(self):
         self.tm = tmTC1998()
 
-    def bm(self, y, T: float, bib: BiBehavior, substances) -> float:
-        s1 = 0.0
-        for i in range(len(y)):
-            s1 += y[i] * bib.getBi(i, T, substances)
-        return s1 - self.tm.tm(y, T, substances)
+    def getBiVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        return bib.getBiVector(T, substances) - self.tm.tiBehavior.getBiVector(
+            T, substances
+        )
+
+    def getdBidTVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        return bib.getdBidTVector(T, substances) - self.tm.tiBehavior.getdBidTVector(
+            T, substances
+        )
 
     def diffBm(self, i: int, y, T: float, bib: BiBehavior, substances) -> float:
         return bib.getBi(i, T, substances) - self.tm.tiBehavior.getTi(i, T, substances)
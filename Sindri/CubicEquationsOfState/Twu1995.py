@@ -1,19 +1,21 @@
-from CubicEquationsOfState.PengAndRobinson1976 import PR1976, thetaiPR1976
-import numpy as np
+from CubicEquationsOfState.PengAndRobinson1976 import (
+    PR1976,
+    kernelPR1976,
+    thetaiKernelAlphaPR1976,
+)
+from EOSKernels import registerEOSKernel, ALPHA_TWU
 
+# (N0, M0, L0, N1, M1, L1) of alpha = alpha0 + omega (alpha1 - alpha0), with
+# alpha_k = tr^Nk exp(Lk (1 - tr^Mk))
+TWU1995 = (-0.171813, 1.77634, 0.125283, -0.607352, 2.20517, 0.511614)
 
-class thetaiTwu1995(thetaiPR1976):
-    def alpha(self, i: int, T: float, substances):
-        tr = T / substances[i].Tc
-        w = substances[i].omega
-        alpha0 = (tr) ** (-0.171813) * 2.718281828459045235360 ** (
-            0.125283 * (1 - (tr) ** 1.77634)
-        )
-        alpha1 = (tr) ** (-0.607352) * 2.718281828459045235360 ** (
-            0.511614 * (1 - (tr) ** 2.20517)
-        )
-        alpha = alpha0 + w * (alpha1 - alpha0)
-        return alpha
+
+class thetaiTwu1995(thetaiKernelAlphaPR1976):
+    alpha_code = ALPHA_TWU
+    twu = TWU1995
+
+    def alphaParameters(self, substances):
+        return [[s.omega, *self.twu] for s in substances]
 
 
 class Twu1995(PR1976):
@@ -21,3 +23,8 @@ class Twu1995(PR1976):
         super().__init__(_subs, _k)
         self.eosname = "Twu, et al. (1995)"
         self.thetaiBehavior = thetaiTwu1995()
+
+
+registerEOSKernel(
+    Twu1995, kernelPR1976(ALPHA_TWU, params=thetaiTwu1995().alphaParameters)
+)
@@ -1,4 +1,7 @@
+import numpy as np
+
 from EOSMixture import EOSMixture
+from EOSKernels import EOSKernel, registerEOSKernel, ALPHA_WILSON
 from EOSParametersBehavior.ParametersBehaviorInterface import (
     DeltaiBehavior,
     EpsiloniBehavior,
@@ -13,25 +16,44 @@ from MixtureRules.MixtureRulesInterface import (
 )
 from constants import R_IG
 
+OMEGA_A = 0.42748
+OMEGA_B = 0.08664
+
+
+def mWilson1964(w):
+    return 1.57 + 1.62 * w
+
 
 class biWilson1964(BiBehavior):
     def getBi(self, i: int, T: float, substances) -> float:
-        return 0.08664 / (substances[i].Pc / (R_IG * substances[i].Tc))
+        return OMEGA_B / (substances[i].Pc / (R_IG * substances[i].Tc))
 
 
 class thetaiWilson1964(ThetaiBehavior):
     def a(self, i: int, T: float, substances):
-        return 0.42748 * (R_IG * substances[i].Tc) ** 2 / substances[i].Pc
+        return OMEGA_A * (R_IG * substances[i].Tc) ** 2 / substances[i].Pc
 
     def alpha(self, i: int, T: float, substances):
         tr = T / substances[i].Tc
-        w = substances[i].omega
-        return (1.0 + (1.57 + 1.62 * w) * (1.0 / tr - 1.0)) * tr
+        m = mWilson1964(substances[i].omega)
+        return (1.0 + m * (1.0 / tr - 1.0)) * tr
 
     def getThetai(self, i: int, T: float, substances) -> float:
         _alpha = self.alpha(i, T, substances)
         return _alpha * self.a(i, T, substances)
 
+    def dalpha(self, i: int, T: float, substances):
+        return (1.0 - mWilson1964(substances[i].omega)) / substances[i].Tc
+
+    def d2alpha(self, i: int, T: float, substances):
+        return 0.0
+
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        return self.dalpha(i, T, substances) * self.a(i, T, substances)
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        return self.d2alpha(i, T, substances) * self.a(i, T, substances)
+
 
 class epsiloniWilson1964(EpsiloniBehavior):
     def getEpsiloni(self, b: float) -> float:
@@ -60,6 +82,18 @@ class deltaMixWilson1964(DeltaMixtureRuleBehavior):
     ) -> float:
         return bmb.diffBm(i, y, T, bib, substances)
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return bmb.diffBmFromArrays(y, bi)
+
+    def deltamVector(
+        self, Y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        bi = bmb.getBiVector(T, bib, substances)
+        return bmb.bmFromArrays(Y, bi)
+
 
 class epsilonMixWilson1964(EpsilonMixtureRuleBehavior):
     def epsilonm(
@@ -78,6 +112,16 @@ class epsilonMixWilson1964(EpsilonMixtureRuleBehavior):
     ) -> float:
         return 0.0
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.zeros(len(substances), dtype=np.float64)
+
+    def epsilonmVector(
+        self, Y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.zeros(len(Y), dtype=np.float64)
+
 
 class Wilson1964(EOSMixture):
     def __init__(self, _subs, _k):
@@ -90,3 +134,13 @@ class Wilson1964(EOSMixture):
         self.epsiloniBehavior = epsiloniWilson1964()
         self.deltaMixBehavior = deltaMixWilson1964()
         self.epsilonMixBehavior = epsilonMixWilson1964()
+
+
+def kernelWilson1964(alpha: int, m=None, params=None) -> EOSKernel:
+    """
+    EOSKernel with the constants of Wilson, delta = b and epsilon = 0.
+    """
+    return EOSKernel(OMEGA_A, OMEGA_B, 1.0, 0.0, alpha, m, params)
+
+
+registerEOSKernel(Wilson1964, kernelWilson1964(ALPHA_WILSON, mWilson1964))
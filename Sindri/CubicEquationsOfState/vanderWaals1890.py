@@ -1,4 +1,7 @@
+import numpy as np
+
 from EOSMixture import EOSMixture
+from EOSKernels import EOSKernel, registerEOSKernel, ALPHA_CONSTANT
 from EOSParametersBehavior.ParametersBehaviorInterface import (
     DeltaiBehavior,
     EpsiloniBehavior,
@@ -13,19 +16,28 @@ from MixtureRules.MixtureRulesInterface import (
 )
 from constants import R_IG
 
+OMEGA_A = 0.421875
+OMEGA_B = 0.125
+
 
 class bivanderWaals1890(BiBehavior):
     def getBi(self, i: int, T: float, substances) -> float:
-        return 0.125 / (substances[i].Pc / (R_IG * substances[i].Tc))
+        return OMEGA_B / (substances[i].Pc / (R_IG * substances[i].Tc))
 
 
 class thetaivanderWaals1890(ThetaiBehavior):
     def a(self, i: int, T: float, substances):
-        return 0.421875 * (R_IG * substances[i].Tc) ** 2 / substances[i].Pc
+        return OMEGA_A * (R_IG * substances[i].Tc) ** 2 / substances[i].Pc
 
     def getThetai(self, i: int, T: float, substances) -> float:
         return self.a(i, T, substances)
 
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        return 0.0
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        return 0.0
+
 
 class epsilonivanderWaals1890(EpsiloniBehavior):
     def getEpsiloni(self, b: float) -> float:
@@ -54,6 +66,16 @@ class deltaMixvanderWaals1890(DeltaMixtureRuleBehavior):
     ) -> float:
         return 0.0
 
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.zeros(len(substances), dtype=np.float64)
+
+    def deltamVector(
+        self, Y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.zeros(len(Y), dtype=np.float64)
+
 
 class epsilonMixvanderWaals1890(EpsilonMixtureRuleBehavior):
     def epsilonm(
@@ -72,6 +94,16 @@ class epsilonMixvanderWaals1890(EpsilonMixtureRuleBehavior):
     ) -> float:
         return 0.0
 
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.zeros(len(substances), dtype=np.float64)
+
+    def epsilonmVector(
+        self, Y, T: float, bib: BiBehavior, bmb: BMixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.zeros(len(Y), dtype=np.float64)
+
 
 class vanderWaals1890(EOSMixture):
     def __init__(self, _subs, _k):
@@ -84,3 +116,13 @@ class vanderWaals1890(EOSMixture):
         self.epsiloniBehavior = epsilonivanderWaals1890()
         self.deltaMixBehavior = deltaMixvanderWaals1890()
         self.epsilonMixBehavior = epsilonMixvanderWaals1890()
+
+
+def kernelvanderWaals1890(alpha: int, m=None, params=None) -> EOSKernel:
+    """
+    EOSKernel with the constants of van der Waals, delta = epsilon = 0.
+    """
+    return EOSKernel(OMEGA_A, OMEGA_B, 0.0, 0.0, alpha, m, params)
+
+
+registerEOSKernel(vanderWaals1890, kernelvanderWaals1890(ALPHA_CONSTANT))
@@ -0,0 +1,783 @@
+import numpy as np
+from numba import njit, float64, int64, prange
+
+from constants import R_IG
+
+ALPHA_CONSTANT = 0
+ALPHA_SOAVE = 1
+ALPHA_RK = 2
+ALPHA_WILSON = 3
+ALPHA_STRYJEK_VERA = 4
+ALPHA_TWU = 5
+ALPHA_GASEM = 6
+ALPHA_MATHIAS_COPEMAN = 7
+
+_eos_kernels = {}
+
+
+class EOSKernel:
+    """
+    Compiled evaluation of a two-parameter cubic equation of state.
+
+    Covers the models where b_i = omega_b * R * Tc / Pc, theta_i = a_i * alpha_i(T),
+    delta = u * b and epsilon = w * b^2, mixed with the classic van der Waals rule.
+    The component constants are packed into arrays once, and every call goes
+    straight to the compiled kernels below without touching the behavior objects.
+    """
+
+    def __init__(
+        self,
+        omega_a: float,
+        omega_b: float,
+        u: float,
+        w: float,
+        alpha: int,
+        m=None,
+        params=None,
+    ):
+        self.omega_a = omega_a
+        self.omega_b = omega_b
+        self.u = u
+        self.w = w
+        self.alpha = alpha
+        # m(omega) for the Soave and Wilson alpha functions
+        self.m = m
+        # params(substances), the (n, p) parameters of the other alpha functions
+        self.params = params
+
+    def pack(self, substances, k):
+        n = len(substances)
+        tc = np.array([s.Tc for s in substances], dtype=np.float64)
+        pc = np.array([s.Pc for s in substances], dtype=np.float64)
+        omega = np.array([s.omega for s in substances], dtype=np.float64)
+        ac = self.omega_a * np.power(R_IG * tc, 2) / pc
+        bc = self.omega_b * R_IG * tc / pc
+        if self.params is not None:
+            m = np.array(self.params(substances), dtype=np.float64).reshape(n, -1)
+        elif self.m is not None:
+            m = np.array(self.m(omega), dtype=np.float64).reshape(n, 1)
+        else:
+            m = np.zeros((n, 1))
+        kij = np.array(k, dtype=np.float64)
+        return ac, bc, tc, m, kij
+
+    def getKernelArgs(self, data):
+        """
+        Returns the packed arrays followed by the model constants, in the order the
+        compiled routines take them.
+        """
+        ac, bc, tc, m, kij = data
+        return ac, bc, tc, m, kij, self.alpha, self.u, self.w
+
+    def getMixtureParameters(self, data, y, T: float):
+        """
+        Returns (b, theta, delta, epsilon), their composition derivatives and their
+        temperature derivatives.
+        """
+        ac, bc, tc, m, kij = data
+        return kernel_mixture_parameters(
+            np.asarray(y, dtype=np.float64),
+            T,
+            ac,
+            bc,
+            tc,
+            m,
+            kij,
+            self.alpha,
+            self.u,
+            self.w,
+        )
+
+
+def registerEOSKernel(eosclass, kernel: EOSKernel):
+    _eos_kernels[eosclass] = kernel
+
+
+def getEOSKernel(eosclass):
+    return _eos_kernels.get(eosclass)
+
+
+@njit((float64, float64, float64, float64), cache=True)
+def _kernel_twu_helper(tr, N, M, L):
+    """
+    Returns tr^N * exp(L * (1 - tr^M)) and its first two derivatives in tr.
+    """
+    a = tr ** N * np.exp(L * (1.0 - tr ** M))
+    dlna = N / tr - L * M * tr ** (M - 1.0)
+    d2lna = -N / (tr * tr) - L * M * (M - 1.0) * tr ** (M - 2.0)
+    return a, a * dlna, a * (dlna * dlna + d2lna)
+
+
+@njit((float64, float64[:], int64), cache=True)
+def kernel_alpha(tr, p, alpha):
+    """
+    Returns alpha(tr) and its first two derivatives in tr, for the alpha function
+    coded by alpha with the component parameters p (a row of the packed m). The
+    thetai behaviors of these alpha functions evaluate it too.
+    """
+    if alpha == ALPHA_SOAVE or alpha == ALPHA_STRYJEK_VERA:
+        m, dm, d2m = p[0], 0.0, 0.0
+        if alpha == ALPHA_STRYJEK_VERA:
+            # m = k0 + k1 (1 + tr) (0.7 - tr)
+            m += p[1] * (1.0 + tr) * (0.7 - tr)
+            dm = p[1] * (-0.3 - 2.0 * tr)
+            d2m = -2.0 * p[1]
+        sqrt_tr = np.sqrt(tr)
+        g = 1.0 + m * (1.0 - sqrt_tr)
+        dg = dm * (1.0 - sqrt_tr) - 0.5 * m / sqrt_tr
+        d2g = d2m * (1.0 - sqrt_tr) - dm / sqrt_tr + 0.25 * m / (tr * sqrt_tr)
+        return g * g, 2.0 * g * dg, 2.0 * (dg * dg + g * d2g)
+    elif alpha == ALPHA_RK:
+        return 1.0 / np.sqrt(tr), -0.5 * tr ** -1.5, 0.75 * tr ** -2.5
+    elif alpha == ALPHA_WILSON:
+        return tr + p[0] * (1.0 - tr), 1.0 - p[0], 0.0
+    elif alpha == ALPHA_TWU:
+        # alpha0 + omega (alpha1 - alpha0), p = (omega, N0, M0, L0, N1, M1, L1)
+        a0, da0, d2a0 = _kernel_twu_helper(tr, p[1], p[2], p[3])
+        a1, da1, d2a1 = _kernel_twu_helper(tr, p[4], p[5], p[6])
+        return (
+            a0 + p[0] * (a1 - a0),
+            da0 + p[0] * (da1 - da0),
+            d2a0 + p[0] * (d2a1 - d2a0),
+        )
+    elif alpha == ALPHA_GASEM:
+        # exp((A + B tr) (1 - tr^q)), p = (A, B, q)
+        A, B, q = p[0], p[1], p[2]
+        f = (A + B * tr) * (1.0 - tr ** q)
+        df = B * (1.0 - tr ** q) - (A + B * tr) * q * tr ** (q - 1.0)
+        d2f = -2.0 * B * q * tr ** (q - 1.0) - (A + B * tr) * q * (q - 1.0) * tr ** (
+            q - 2.0
+        )
+        e = np.exp(f)
+        return e, e * df, e * (df * df + d2f)
+    elif alpha == ALPHA_MATHIAS_COPEMAN:
+        # exp(c1 (1 - tr)) (1 + c2 x^2 + c3 x^3)^2 with x = 1 - sqrt(tr)
+        c1, c2, c3 = p[0], p[1], p[2]
+        x = 1.0 - np.sqrt(tr)
+        dx = -0.5 / np.sqrt(tr)
+        d2x = 0.25 * tr ** -1.5
+        h = 1.0 + c2 * x * x + c3 * x * x * x
+        dh = (2.0 * c2 * x + 3.0 * c3 * x * x) * dx
+        d2h = (2.0 * c2 + 6.0 * c3 * x) * dx * dx + (
+            2.0 * c2 * x + 3.0 * c3 * x * x
+        ) * d2x
+        e = np.exp(c1 * (1.0 - tr))
+        H = h * h
+        dH = 2.0 * h * dh
+        d2H = 2.0 * (dh * dh + h * d2h)
+        return e * H, e * (dH - c1 * H), e * (c1 * c1 * H - 2.0 * c1 * dH + d2H)
+    return 1.0, 0.0, 0.0
+
+
+@njit(
+    (float64, float64[:], float64[:], float64[:, :], int64),
+    cache=True,
+)
+def _kernel_thetai_helper(T, ac, tc, m, alpha):
+    n = ac.shape[0]
+    thetai = np.empty(n)
+    dthetai = np.empty(n)
+    for i in range(n):
+        a, da, _ = kernel_alpha(T / tc[i], m[i], alpha)
+        thetai[i] = ac[i] * a
+        dthetai[i] = ac[i] * da / tc[i]
+    return thetai, dthetai
+
+
+@njit(
+    (float64, float64[:], float64[:], float64[:, :], int64),
+    cache=True,
+)
+def _kernel_d2thetai_helper(T, ac, tc, m, alpha):
+    n = ac.shape[0]
+    d2thetai = np.empty(n)
+    for i in range(n):
+        d2a = kernel_alpha(T / tc[i], m[i], alpha)[2]
+        d2thetai[i] = ac[i] * d2a / (tc[i] * tc[i])
+    return d2thetai
+
+
+@njit(
+    (float64, float64[:], float64[:], float64[:, :], float64[:, :], int64),
+    cache=True,
+)
+def kernel_thetaij(T, ac, tc, m, kij, alpha):
+    """
+    Returns sqrt(theta_i * theta_j) * (1 - k_ij) at T. It only depends on T, so a
+    loop at fixed T evaluates it once and shares it between all its phases.
+    """
+    n = ac.shape[0]
+    thetai, _ = _kernel_thetai_helper(T, ac, tc, m, alpha)
+    thetaij = np.empty((n, n))
+    for i in range(n):
+        for j in range(n):
+            thetaij[i, j] = np.sqrt(thetai[i] * thetai[j]) * (1.0 - kij[i, j])
+    return thetaij
+
+
+@njit(
+    (float64, float64[:], float64[:], float64[:, :], float64[:, :], int64),
+    cache=True,
+)
+def kernel_thetaij_dT(T, ac, tc, m, kij, alpha):
+    """
+    Returns theta_ij of kernel_thetaij and its temperature derivative.
+    """
+    n = ac.shape[0]
+    thetai, dthetai = _kernel_thetai_helper(T, ac, tc, m, alpha)
+    thetaij = np.empty((n, n))
+    dthetaij = np.empty((n, n))
+    for i in range(n):
+        for j in range(n):
+            sqrt_ij = np.sqrt(thetai[i] * thetai[j])
+            thetaij[i, j] = sqrt_ij * (1.0 - kij[i, j])
+            dthetaij[i, j] = (
+                (dthetai[i] * thetai[j] + thetai[i] * dthetai[j])
+                / (2.0 * sqrt_ij)
+                * (1.0 - kij[i, j])
+            )
+    return thetaij, dthetaij
+
+
+@njit(
+    (
+        float64[:],
+        float64,
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:, :],
+        float64[:, :],
+        int64,
+        float64,
+        float64,
+    ),
+    cache=True,
+)
+def kernel_mixture_parameters(y, T, ac, bc, tc, m, kij, alpha, u, w):
+    n = y.shape[0]
+    thetai, dthetai = _kernel_thetai_helper(T, ac, tc, m, alpha)
+
+    bm = 0.0
+    for i in range(n):
+        bm += y[i] * bc[i]
+
+    thetam = 0.0
+    dthetamdT = 0.0
+    diffthetam = np.zeros(n)
+    for i in range(n):
+        for j in range(n):
+            sqrt_ij = np.sqrt(thetai[i] * thetai[j])
+            thetaij = sqrt_ij * (1.0 - kij[i, j])
+            dthetaij = (
+                (dthetai[i] * thetai[j] + thetai[i] * dthetai[j])
+                / (2.0 * sqrt_ij)
+                * (1.0 - kij[i, j])
+            )
+            thetam += y[i] * y[j] * thetaij
+            dthetamdT += y[i] * y[j] * dthetaij
+            diffthetam[i] += y[j] * thetaij
+            diffthetam[j] += y[i] * thetaij
+
+    deltam = u * bm
+    epsilonm = w * bm * bm
+    diffbm = bc.copy()
+    diffdeltam = u * bc
+    diffepsilonm = 2.0 * w * bm * bc
+
+    # b_i does not depend on the temperature for these models
+    dT = np.array([0.0, dthetamdT, 0.0, 0.0])
+    return (
+        bm,
+        thetam,
+        deltam,
+        epsilonm,
+        diffbm,
+        diffthetam,
+        diffdeltam,
+        diffepsilonm,
+        dT,
+    )
+
+
+@njit(
+    (
+        float64[:],
+        float64,
+        float64,
+        float64,
+        float64[:, :],
+        float64[:, :],
+        float64[:],
+        float64,
+        float64,
+        float64,
+    ),
+    cache=True,
+)
+def kernel_lnphi_derivatives_aij(y, P, T, Z, aij, daij, bc, u, w, R_IG):
+    """
+    kernel_lnphi_derivatives from theta_ij and d theta_ij/dT already evaluated at
+    T, for loops that share them between phases.
+    """
+    n = y.shape[0]
+    Di = 2.0 * np.dot(aij, y)
+    DiT = 2.0 * np.dot(daij, y)
+    D = 0.5 * np.dot(y, Di)
+    DT = 0.5 * np.dot(y, DiT)
+    B = np.dot(y, bc)
+    Bi = bc
+    V = Z * R_IG * T / P
+
+    sqrt_disc = np.sqrt(max(u * u - 4.0 * w, 0.0))
+    delta1 = 0.5 * (u + sqrt_disc)
+    delta2 = 0.5 * (u - sqrt_disc)
+    V1 = V + delta1 * B
+    V2 = V + delta2 * B
+
+    g_V = B / (V * (V - B))
+    g_B = -1.0 / (V - B)
+    g_VV = -1.0 / (V - B) ** 2 + 1.0 / V ** 2
+    g_BV = 1.0 / (V - B) ** 2
+    g_BB = -1.0 / (V - B) ** 2
+
+    if delta1 - delta2 > 1e-12:
+        f = np.log(V1 / V2) / (R_IG * B * (delta1 - delta2))
+    else:
+        f = 1.0 / (R_IG * V1)
+    f_V = -1.0 / (R_IG * V1 * V2)
+    f_B = -(f + V * f_V) / B
+    f_VV = (V1 + V2) / (R_IG * V1 * V1 * V2 * V2)
+    f_BV = -(2.0 * f_V + V * f_VV) / B
+    f_BB = -(2.0 * f_B + V * f_BV) / B
+
+    F_n = -np.log(1.0 - B / V)
+    F_B = -g_B - D * f_B / T
+    F_D = -f / T
+    F_nV = -g_V
+    F_nB = -g_B
+    F_BT = D * f_B / T ** 2 - DT * f_B / T
+    F_BV = -g_BV - D * f_BV / T
+    F_BB = -g_BB - D * f_BB / T
+    F_DT = f / T ** 2
+    F_BD = -f_B / T
+    F_DV = -f_V / T
+    F_VV = -g_VV - D * f_VV / T
+    F_VT = D * f_V / T ** 2 - DT * f_V / T
+
+    RT = R_IG * T
+    dPdV = -RT * F_VV - RT / V ** 2
+    dPdT = -RT * F_VT + P / T
+
+    lnphi = np.empty(n)
+    dlnphidT = np.empty(n)
+    dlnphidP = np.empty(n)
+    dlnphidn = np.empty((n, n))
+    dPdn = np.empty(n)
+    for i in range(n):
+        F_i = F_n + F_B * Bi[i] + F_D * Di[i]
+        F_iT = F_BT * Bi[i] + F_DT * Di[i] + F_D * DiT[i]
+        F_iV = F_nV + F_BV * Bi[i] + F_DV * Di[i]
+        dPdn[i] = -RT * F_iV + RT / V
+        Vi = -dPdn[i] / dPdV
+        lnphi[i] = F_i - np.log(Z)
+        dlnphidT[i] = F_iT + 1.0 / T - Vi * dPdT / RT
+        dlnphidP[i] = Vi / RT - 1.0 / P
+
+    for i in range(n):
+        for j in range(n):
+            F_ij = (
+                F_nB * (Bi[i] + Bi[j])
+                + F_BD * (Bi[i] * Di[j] + Bi[j] * Di[i])
+                + F_BB * Bi[i] * Bi[j]
+                + F_D * 2.0 * aij[i, j]
+            )
+            dlnphidn[i, j] = F_ij + 1.0 + dPdn[i] * dPdn[j] / (RT * dPdV)
+
+    return lnphi, dlnphidT, dlnphidP, dlnphidn
+
+
+@njit(
+    (
+        float64[:],
+        float64,
+        float64,
+        float64,
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:, :],
+        float64[:, :],
+        int64,
+        float64,
+        float64,
+        float64,
+    ),
+    cache=True,
+)
+def kernel_lnphi_derivatives(y, P, T, Z, ac, bc, tc, m, kij, alpha, u, w, R_IG):
+    """
+    Returns ln(phi_i), d ln(phi_i)/dT, d ln(phi_i)/dP and n d ln(phi_i)/dn_j.
+
+    Uses the reduced residual Helmholtz energy F = -n g - D f / T of Michelsen and
+    Mollerup, with V^2 + u b V + w b^2 = (V + delta1 b)(V + delta2 b). Evaluated
+    for one mole of mixture.
+    """
+    aij, daij = kernel_thetaij_dT(T, ac, tc, m, kij, alpha)
+    return kernel_lnphi_derivatives_aij(y, P, T, Z, aij, daij, bc, u, w, R_IG)
+
+
+@njit(
+    (
+        float64[:],
+        float64,
+        float64,
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:, :],
+        float64[:, :],
+        int64,
+        float64,
+        float64,
+        float64,
+    ),
+    cache=True,
+)
+def kernel_critical_Q(nv, T, V, ac, bc, tc, m, kij, alpha, u, w, R_IG):
+    """
+    Returns Q_ij = d ln(f_i) / d n_j at constant T and V for the mole numbers nv
+    in the volume V, and the pressure.
+
+    With F = -N g(V, B) - D f(V, B) / T as in kernel_lnphi_derivatives,
+    Q_ij = delta_ij / n_i + F_ij. B is linear in the mole numbers and
+    D_ij = 2 a_ij, so that F_BB, F_BD, F_nB and F_D are the only terms left.
+    """
+    n = nv.shape[0]
+    thetai, dthetai = _kernel_thetai_helper(T, ac, tc, m, alpha)
+    aij = np.empty((n, n))
+    for i in range(n):
+        for j in range(n):
+            aij[i, j] = np.sqrt(thetai[i] * thetai[j]) * (1.0 - kij[i, j])
+
+    N = np.sum(nv)
+    Di = 2.0 * np.dot(aij, nv)
+    D = 0.5 * np.dot(nv, Di)
+    B = np.dot(nv, bc)
+
+    sqrt_disc = np.sqrt(max(u * u - 4.0 * w, 0.0))
+    delta1 = 0.5 * (u + sqrt_disc)
+    delta2 = 0.5 * (u - sqrt_disc)
+    V1 = V + delta1 * B
+    V2 = V + delta2 * B
+
+    g_B = -1.0 / (V - B)
+    g_BB = -1.0 / (V - B) ** 2
+    if delta1 - delta2 > 1e-12:
+        f = np.log(V1 / V2) / (R_IG * B * (delta1 - delta2))
+    else:
+        f = 1.0 / (R_IG * V1)
+    f_V = -1.0 / (R_IG * V1 * V2)
+    f_VV = (V1 + V2) / (R_IG * V1 * V1 * V2 * V2)
+    f_B = -(f + V * f_V) / B
+    f_BV = -(2.0 * f_V + V * f_VV) / B
+    f_BB = -(2.0 * f_B + V * f_BV) / B
+
+    F_nB = -g_B
+    F_BB = -N * g_BB - D * f_BB / T
+    F_BD = -f_B / T
+    F_D = -f / T
+
+    Q = np.empty((n, n))
+    for i in range(n):
+        for j in range(n):
+            Q[i, j] = (
+                F_nB * (bc[i] + bc[j])
+                + F_BB * bc[i] * bc[j]
+                + F_BD * (bc[i] * Di[j] + bc[j] * Di[i])
+                + F_D * 2.0 * aij[i, j]
+            )
+        Q[i, i] += 1.0 / nv[i]
+
+    P = N * R_IG * T / (V - B) - D / (V1 * V2)
+    return Q, P
+
+
+@njit(
+    (
+        float64[:],
+        float64[:],
+        float64,
+        float64,
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:, :],
+        float64[:, :],
+        int64,
+        float64,
+        float64,
+        float64,
+    ),
+    cache=True,
+)
+def kernel_critical_C(nv, dn, T, V, ac, bc, tc, m, kij, alpha, u, w, R_IG):
+    """
+    Returns the cubic form C = sum_ijk d3A/(dn_i dn_j dn_k) dn_i dn_j dn_k / RT
+    at constant T and V, the derivative of dn^T Q dn of kernel_critical_Q along dn.
+
+    N and B are linear in the mole numbers, D is quadratic, so along dn they
+    change by sum(dn), b.dn and D_i.dn, and D_i by 2 a.dn. f is homogeneous of
+    degree -1 in (V, B), which gives its B derivatives from the V ones.
+    """
+    n = nv.shape[0]
+    thetai, dthetai = _kernel_thetai_helper(T, ac, tc, m, alpha)
+    aij = np.empty((n, n))
+    for i in range(n):
+        for j in range(n):
+            aij[i, j] = np.sqrt(thetai[i] * thetai[j]) * (1.0 - kij[i, j])
+
+    N = np.sum(nv)
+    Di = 2.0 * np.dot(aij, nv)
+    D = 0.5 * np.dot(nv, Di)
+    B = np.dot(nv, bc)
+
+    sqrt_disc = np.sqrt(max(u * u - 4.0 * w, 0.0))
+    delta1 = 0.5 * (u + sqrt_disc)
+    delta2 = 0.5 * (u - sqrt_disc)
+    V1 = V + delta1 * B
+    V2 = V + delta2 * B
+
+    g_BB = -1.0 / (V - B) ** 2
+    g_BBB = -2.0 / (V - B) ** 3
+    if delta1 - delta2 > 1e-12:
+        f = np.log(V1 / V2) / (R_IG * B * (delta1 - delta2))
+    else:
+        f = 1.0 / (R_IG * V1)
+    p = V1 * V2
+    f_V = -1.0 / (R_IG * p)
+    f_VV = (V1 + V2) / (R_IG * p * p)
+    f_VVV = 2.0 * (p - (V1 + V2) ** 2) / (R_IG * p * p * p)
+    f_B = -(f + V * f_V) / B
+    f_BV = -(2.0 * f_V + V * f_VV) / B
+    f_BVV = -(3.0 * f_VV + V * f_VVV) / B
+    f_BB = -(2.0 * f_B + V * f_BV) / B
+    f_BBV = -(3.0 * f_BV + V * f_BVV) / B
+    f_BBB = -(3.0 * f_BB + V * f_BBV) / B
+
+    s_N = np.sum(dn)
+    s_B = np.dot(dn, bc)
+    s_D = np.dot(dn, Di)
+    s_a = np.dot(dn, np.dot(aij, dn))
+
+    F_BD = -f_B / T
+    dF_nB = -g_BB * s_B
+    dF_BB = -s_N * g_BB - N * g_BBB * s_B - (s_D * f_BB + D * f_BBB * s_B) / T
+    dF_BD = -f_BB * s_B / T
+    dF_D = -f_B * s_B / T
+
+    C = -np.sum(dn * dn * dn / (nv * nv))
+    C += 2.0 * dF_nB * s_N * s_B + dF_BB * s_B * s_B
+    C += 2.0 * dF_BD * s_B * s_D + 4.0 * F_BD * s_B * s_a + 2.0 * dF_D * s_a
+    return C
+
+
+_critical_args = (
+    float64[:],
+    float64[:],
+    float64[:],
+    float64[:, :],
+    float64[:, :],
+    int64,
+    float64,
+    float64,
+    float64,
+)
+
+
+@njit(
+    (float64[:], float64, float64, float64, int64) + _critical_args,
+    cache=True,
+)
+def _kernel_critical_C(z, T, V, tol, kmax, ac, bc, tc, m, kij, alpha, u, w, R_IG):
+    """
+    Solves lambda_min(Q*(T, V)) = 0 for T by the secant method, from T, where
+    Q*_ij = sqrt(z_i z_j) Q_ij. Returns T, the cubic form C along the direction
+    dn_i = sqrt(z_i) v_i of the eigenvector v of lambda_min, and a flag that is
+    False if the secant did not converge. C is kernel_critical_C, and dn is
+    oriented so that its change of B is positive.
+    """
+    args = (ac, bc, tc, m, kij, alpha, u, w, R_IG)
+    sz = np.sqrt(z)
+    S = np.outer(sz, sz)
+    T0 = T
+    lam0 = np.linalg.eigh(S * kernel_critical_Q(z, T0, V, *args)[0])[0][0]
+    T1 = 1.01 * T
+    for _ in range(kmax):
+        lam1 = np.linalg.eigh(S * kernel_critical_Q(z, T1, V, *args)[0])[0][0]
+        if lam1 == lam0:
+            break
+        T2 = T1 - lam1 * (T1 - T0) / (lam1 - lam0)
+        if T2 <= 0.0:
+            T2 = 0.5 * T1
+        T0, lam0 = T1, lam1
+        T1 = T2
+        if abs(T1 - T0) < tol * T1:
+            v = np.linalg.eigh(S * kernel_critical_Q(z, T1, V, *args)[0])[1][:, 0]
+            dn = sz * v
+            if np.dot(dn, bc) < 0.0:
+                dn = -dn
+            return T1, kernel_critical_C(z, dn, T1, V, *args), True
+    return T1, 0.0, False
+
+
+@njit(
+    (float64[:], float64, float64, float64, int64) + _critical_args,
+    cache=True,
+)
+def kernel_critical_point(
+    z, T, kappa, tol, kmax, ac, bc, tc, m, kij, alpha, u, w, R_IG
+):
+    """
+    Heidemann and Khalil's critical point of one mole of the feed z, in the
+    nested form of Michelsen. For a molar volume V = kappa * b, the temperature
+    where the smallest eigenvalue of Q vanishes comes from _kernel_critical_C,
+    along with the cubic form C of the third composition derivatives of the
+    Helmholtz energy. The outer secant method takes kappa to C = 0.
+
+    T and kappa are the starting point. Returns T, P, V and the number of outer
+    iterations, with nan for T, P and V if it did not converge.
+    """
+    args = (ac, bc, tc, m, kij, alpha, u, w, R_IG)
+    B = np.sum(z * bc)
+
+    T, C0, ok = _kernel_critical_C(z, T, kappa * B, tol, kmax, *args)
+    if not ok:
+        return np.nan, np.nan, np.nan, 0
+    kappa0 = kappa
+    kappa = 1.05 * kappa
+    for ite in range(1, kmax + 1):
+        T, C, ok = _kernel_critical_C(z, T, kappa * B, tol, kmax, *args)
+        if not ok or C == C0:
+            break
+        step = -C * (kappa - kappa0) / (C - C0)
+        kappa0, C0 = kappa, C
+        # do not cross the covolume
+        kappa = max(kappa + step, 0.5 * (1.0 + kappa))
+        if abs(kappa - kappa0) < tol * kappa:
+            T, C, ok = _kernel_critical_C(z, T, kappa * B, tol, kmax, *args)
+            if not ok:
+                break
+            P = kernel_critical_Q(z, T, kappa * B, *args)[1]
+            return T, P, kappa * B, ite
+    return np.nan, np.nan, np.nan, kmax
+
+
+@njit(
+    (float64[:, :], float64[:], float64[:], float64, int64) + _critical_args,
+    parallel=True,
+    cache=True,
+)
+def kernel_critical_points_batch(
+    Z, T, kappa, tol, kmax, ac, bc, tc, m, kij, alpha, u, w, R_IG
+):
+    """
+    kernel_critical_point for each row of Z, in parallel. Returns an (N, 3)
+    array of T, P and V, and the number of iterations of each row.
+    """
+    args = (ac, bc, tc, m, kij, alpha, u, w, R_IG)
+    N = Z.shape[0]
+    out = np.empty((N, 3))
+    ites = np.empty(N, dtype=np.int64)
+    for i in prange(N):
+        Tc, Pc, Vc, ite = kernel_critical_point(
+            Z[i].copy(), T[i], kappa[i], tol, kmax, *args
+        )
+        out[i, 0] = Tc
+        out[i, 1] = Pc
+        out[i, 2] = Vc
+        ites[i] = ite
+    return out, ites
+
+
+@njit(
+    (
+        float64[:],
+        float64,
+        float64,
+        float64,
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:, :],
+        float64[:, :],
+        int64,
+        float64,
+        float64,
+        float64,
+    ),
+    cache=True,
+)
+def kernel_residual_props(y, P, T, Z, ac, bc, tc, m, kij, alpha, u, w, R_IG):
+    """
+    Returns the residual enthalpy, entropy and isobaric heat capacity, real fluid
+    minus ideal gas at the same T and P, of one mole of mixture at the root Z.
+
+    With F = A^r(T, V) / RT as in kernel_lnphi_derivatives,
+    H^R = -R T^2 F_T + RT (Z - 1), S^R = -R (T F_T + F) + R ln(Z) and
+    Cp^R = -R T^2 F_TT - 2 R T F_T - T (dP/dT)^2 / (dP/dV) - R.
+    """
+    n = y.shape[0]
+    thetai, dthetai = _kernel_thetai_helper(T, ac, tc, m, alpha)
+    d2thetai = _kernel_d2thetai_helper(T, ac, tc, m, alpha)
+    D = 0.0
+    DT = 0.0
+    DTT = 0.0
+    for i in range(n):
+        for j in range(n):
+            sqrt_ij = np.sqrt(thetai[i] * thetai[j])
+            dsqrt_ij = (dthetai[i] * thetai[j] + thetai[i] * dthetai[j]) / (
+                2.0 * sqrt_ij
+            )
+            d2sqrt_ij = (
+                d2thetai[i] * thetai[j]
+                + 2.0 * dthetai[i] * dthetai[j]
+                + thetai[i] * d2thetai[j]
+            ) / (2.0 * sqrt_ij) - dsqrt_ij * dsqrt_ij / sqrt_ij
+            yy = y[i] * y[j] * (1.0 - kij[i, j])
+            D += yy * sqrt_ij
+            DT += yy * dsqrt_ij
+            DTT += yy * d2sqrt_ij
+    B = np.dot(y, bc)
+    V = Z * R_IG * T / P
+
+    sqrt_disc = np.sqrt(max(u * u - 4.0 * w, 0.0))
+    delta1 = 0.5 * (u + sqrt_disc)
+    delta2 = 0.5 * (u - sqrt_disc)
+    V1 = V + delta1 * B
+    V2 = V + delta2 * B
+
+    g = np.log(1.0 - B / V)
+    g_V = B / (V * (V - B))
+    g_VV = -1.0 / (V - B) ** 2 + 1.0 / V ** 2
+    if delta1 - delta2 > 1e-12:
+        f = np.log(V1 / V2) / (R_IG * B * (delta1 - delta2))
+    else:
+        f = 1.0 / (R_IG * V1)
+    f_V = -1.0 / (R_IG * V1 * V2)
+    f_VV = (V1 + V2) / (R_IG * V1 * V1 * V2 * V2)
+
+    F = -g - D * f / T
+    F_T = D * f / T ** 2 - DT * f / T
+    F_TT = -2.0 * D * f / T ** 3 + 2.0 * DT * f / T ** 2 - DTT * f / T
+    F_VV = -g_VV - D * f_VV / T
+    F_VT = D * f_V / T ** 2 - DT * f_V / T
+
+    RT = R_IG * T
+    dPdV = -RT * F_VV - RT / V ** 2
+    dPdT = -RT * F_VT + P / T
+
+    HR = -R_IG * T * T * F_T + RT * (Z - 1.0)
+    SR = -R_IG * (T * F_T + F) + R_IG * np.log(Z)
+    CpR = -R_IG * T * T * F_TT - 2.0 * RT * F_T - T * dPdT * dPdT / dPdV - R_IG
+    return HR, SR, CpR
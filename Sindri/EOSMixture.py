@@ -1,17 +1,29 @@
 import os
+from collections import OrderedDict
 from typing import List
 
 import numpy as np
-from numba import njit, float64, int64
-from scipy.integrate import quad
+from numba import njit, float64, int64, boolean, prange
 
 import VLEBinaryDiagrams
+from EOSKernels import (
+    getEOSKernel,
+    kernel_critical_point,
+    kernel_critical_points_batch,
+    kernel_lnphi_derivatives,
+    kernel_lnphi_derivatives_aij,
+    kernel_mixture_parameters,
+    kernel_residual_props,
+    kernel_thetaij,
+    kernel_thetaij_dT,
+)
 from EOSParametersBehavior.ParametersBehaviorInterface import (
     BiBehavior,
     DeltaiBehavior,
     ThetaiBehavior,
     EpsiloniBehavior,
 )
+from EOSParametersBehavior.ParametersSnapshot import ParametersSnapshot
 from MixtureRules.MixtureRulesInterface import (
     DeltaMixtureRuleBehavior,
     EpsilonMixtureRuleBehavior,
@@ -22,7 +34,7 @@ from Properties import DeltaProp, Props
 from compounds import MixtureProp
 from compounds import SubstanceProp
 from constants import R_IG, DBL_EPSILON
-from polyEqSolver import solve_cubic
+from polyEqSolver import solve_cubic_roots
 from units import conv_unit
 
 x_vec_for_plot = [
@@ -95,6 +107,11 @@ class EOSMixture:
         self.Pcs = np.zeros(self.n)
         self.Tcs = np.zeros(self.n)
         self.omegas = np.zeros(self.n)
+        self._snapshot = None
+        self._kernel_data = None
+        self._pure_systems = [None] * self.n
+        self._psat_cache = [OrderedDict() for _ in range(self.n)]
+        self._tsat_cache = [OrderedDict() for _ in range(self.n)]
         self.subs_ids = self.getSubstancesIDs()
         self.vle_method = "phi-phi"
         self.has_UNIFAC = self.hasUNIFAC()
@@ -113,51 +130,132 @@ class EOSMixture:
             return False
         return has_unifac_in_db(self.subs_ids)
 
-    def getZfromPT(self, P: float, T: float, y):
-
-        b = self.mixRuleBehavior.bm(y, T, self.biBehavior, self.substances)
-        theta = self.mixRuleBehavior.thetam(
-            y, T, self.thetaiBehavior, self.substances, self.k
-        )
+    def getParametersSnapshot(self, T: float) -> ParametersSnapshot:
+        """
+        Evaluates b_i(T), theta_i(T) and sqrt(theta_i * theta_j) * (1 - k_ij) of all
+        components at once.
+
+        The last snapshot is kept, so every call at the same temperature (as done in the
+        VLE loops) reuses the arrays instead of calling the behaviors again. It is only
+        reused while the values of k are unchanged, as k is edited in place.
+        """
+        if (
+            self._snapshot is None
+            or self._snapshot.T != T
+            or not np.array_equal(self._snapshot.k, self.k)
+        ):
+            bi = self.mixRuleBehavior.getBiVector(T, self.biBehavior, self.substances)
+            thetai = self.thetaiBehavior.getThetaiVector(T, self.substances)
+            thetaij = self.mixRuleBehavior.getThetaij(thetai, self.k)
+            k = np.array(self.k, dtype=np.float64)
+            self._snapshot = ParametersSnapshot(T, bi, thetai, thetaij, k)
+        return self._snapshot
+
+    def getKernel(self):
+        """
+        Returns the compiled kernel registered for this model and its packed
+        component arrays, or (None, None) if the model has no kernel.
+
+        Only the exact registered class uses the kernel, so subclasses that swap
+        any behavior keep going through the behavior objects. The arrays are packed
+        again when the substances or the values of k change, as k is edited in place.
+        """
+        kernel = getEOSKernel(type(self))
+        if kernel is None:
+            return None, None
+        if (
+            self._kernel_data is None
+            or self._kernel_data[0] is not self.substances
+            or not np.array_equal(self._kernel_data[1][4], self.k)
+        ):
+            self._kernel_data = (self.substances, kernel.pack(self.substances, self.k))
+        return kernel, self._kernel_data[1]
+
+    def getMixtureParameters(self, y, T: float):
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            return kernel.getMixtureParameters(data, y, T)[:4]
+        snapshot = self.getParametersSnapshot(T)
+        b = self.mixRuleBehavior.bmFromArrays(y, snapshot.bi)
+        theta = self.mixRuleBehavior.thetamFromArrays(y, snapshot.thetaij)
         delta = self.deltaMixBehavior.deltam(
             y, T, self.biBehavior, self.mixRuleBehavior, self.substances
         )
         epsilon = self.epsilonMixBehavior.epsilonm(
             y, T, self.biBehavior, self.mixRuleBehavior, self.substances
         )
+        return b, theta, delta, epsilon
+
+    def getZfromPT(self, P: float, T: float, y):
+        b, theta, delta, epsilon = self.getMixtureParameters(y, T)
         return _getZfromPT_helper(b, theta, delta, epsilon, T, P, R_IG)
 
-    def getPfromTV(self, T: float, V: float, y) -> float:
-        b = self.mixRuleBehavior.bm(y, T, self.biBehavior, self.substances)
-        theta = self.mixRuleBehavior.thetam(
-            y, T, self.thetaiBehavior, self.substances, self.k
-        )
-        delta = self.deltaMixBehavior.deltam(
-            y, T, self.biBehavior, self.mixRuleBehavior, self.substances
+    def getZliqZvap(self, P: float, T: float, y):
+        """
+        Returns the smallest and the largest non-negative roots of the cubic.
+        """
+        b, theta, delta, epsilon = self.getMixtureParameters(y, T)
+        return _getZliqZvap_helper(b, theta, delta, epsilon, T, P, R_IG)
+
+    def getMixtureParametersVector(self, Y, T: float):
+        """
+        Returns b, theta, delta and epsilon arrays for each row of the (N, n)
+        composition array Y, all at the same temperature.
+        """
+        Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+        snapshot = self.getParametersSnapshot(T)
+        b = self.mixRuleBehavior.bmFromArrays(Y, snapshot.bi)
+        theta = self.mixRuleBehavior.thetamFromArrays(Y, snapshot.thetaij)
+        delta = self.deltaMixBehavior.deltamVector(
+            Y, T, self.biBehavior, self.mixRuleBehavior, self.substances
         )
-        epsilon = self.epsilonMixBehavior.epsilonm(
-            y, T, self.biBehavior, self.mixRuleBehavior, self.substances
+        epsilon = self.epsilonMixBehavior.epsilonmVector(
+            Y, T, self.biBehavior, self.mixRuleBehavior, self.substances
         )
+        return b, theta, delta, epsilon
+
+    def getZliqZvapBatch(self, P, T, Y):
+        """
+        Returns the liquid and vapor Z arrays of N states at once.
+
+        P and T are arrays of length N (or scalars) and Y is an (N, n) array of
+        compositions. With a compiled kernel, the mixture parameters of every row
+        and all the cubics are evaluated in a single parallel call. Otherwise the
+        mixture parameters are evaluated once per distinct temperature, and only
+        the cubics are solved in a compiled call.
+        """
+        Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+        N = Y.shape[0]
+        P = np.array(np.broadcast_to(np.asarray(P, dtype=np.float64), (N,)))
+        T = np.array(np.broadcast_to(np.asarray(T, dtype=np.float64), (N,)))
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            return _kernel_getZliqZvap_batch_helper(
+                Y, T, P, *kernel.getKernelArgs(data), R_IG
+            )
+        b = np.empty(N)
+        theta = np.empty(N)
+        delta = np.empty(N)
+        epsilon = np.empty(N)
+        Tunique, inverse = np.unique(T, return_inverse=True)
+        for k, Tk in enumerate(Tunique):
+            rows = np.flatnonzero(inverse == k)
+            params = self.getMixtureParametersVector(Y[rows], Tk)
+            b[rows], theta[rows], delta[rows], epsilon[rows] = params
+        return _getZliqZvap_batch_helper(b, theta, delta, epsilon, T, P, R_IG)
+
+    def getPfromTV(self, T: float, V: float, y) -> float:
+        b, theta, delta, epsilon = self.getMixtureParameters(y, T)
         p = R_IG * T / (V - b) - theta / (V * (V + delta) + epsilon)
         return p
 
     def getPhi_i(self, i: int, y, P: float, T: float, Z: float):
 
-        bm = self.mixRuleBehavior.bm(y, T, self.biBehavior, self.substances)
-        thetam = self.mixRuleBehavior.thetam(
-            y, T, self.thetaiBehavior, self.substances, self.k
-        )
-        deltam = self.deltaMixBehavior.deltam(
-            y, T, self.biBehavior, self.mixRuleBehavior, self.substances
-        )
-        epsilonm = self.epsilonMixBehavior.epsilonm(
-            y, T, self.biBehavior, self.mixRuleBehavior, self.substances
-        )
+        snapshot = self.getParametersSnapshot(T)
+        bm, thetam, deltam, epsilonm = self.getMixtureParameters(y, T)
         # derivatives
-        diffthetam = self.mixRuleBehavior.diffThetam(
-            i, y, T, self.thetaiBehavior, self.substances, self.k
-        )
-        diffbm = self.mixRuleBehavior.diffBm(i, y, T, self.biBehavior, self.substances)
+        diffthetam = self.mixRuleBehavior.diffThetamFromArrays(y, snapshot.thetaij)[i]
+        diffbm = self.mixRuleBehavior.diffBmFromArrays(y, snapshot.bi)[i]
         diffdeltam = self.deltaMixBehavior.diffDeltam(
             i, y, T, self.biBehavior, self.mixRuleBehavior, self.substances
         )
@@ -180,10 +278,102 @@ class EOSMixture:
             DBL_EPSILON,
         )
 
+    def getLnPhiVector(self, y, P: float, T: float, Z: float) -> np.ndarray:
+        """
+        Returns ln(phi_i) of all components at once.
+
+        The mixture parameters and their composition derivatives are evaluated a
+        single time, and the per-component work is done in one compiled kernel.
+        """
+        y = np.asarray(y, dtype=np.float64)
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            (
+                bm,
+                thetam,
+                deltam,
+                epsilonm,
+                diffbm,
+                diffthetam,
+                diffdeltam,
+                diffepsilonm,
+                _,
+            ) = kernel.getMixtureParameters(data, y, T)
+        else:
+            snapshot = self.getParametersSnapshot(T)
+            bm, thetam, deltam, epsilonm = self.getMixtureParameters(y, T)
+            # derivatives
+            diffthetam = self.mixRuleBehavior.diffThetamFromArrays(y, snapshot.thetaij)
+            diffbm = self.mixRuleBehavior.diffBmFromArrays(y, snapshot.bi)
+            diffdeltam = self.deltaMixBehavior.diffDeltamVector(
+                y, T, self.biBehavior, self.mixRuleBehavior, self.substances
+            )
+            diffepsilonm = self.epsilonMixBehavior.diffEpsilonmVector(
+                y, T, self.biBehavior, self.mixRuleBehavior, self.substances
+            )
+        return _getLnPhi_vector_helper(
+            P,
+            T,
+            Z,
+            R_IG,
+            bm,
+            thetam,
+            deltam,
+            epsilonm,
+            np.asarray(diffthetam, dtype=np.float64),
+            np.asarray(diffbm, dtype=np.float64),
+            np.asarray(diffdeltam, dtype=np.float64),
+            np.asarray(diffepsilonm, dtype=np.float64),
+            DBL_EPSILON,
+        )
+
+    def getLnPhiDerivatives(self, y, P: float, T: float, Z: float):
+        """
+        Returns ln(phi_i), d ln(phi_i)/dT, d ln(phi_i)/dP and the matrix
+        n d ln(phi_i)/dn_j at the root Z, for one mole of mixture.
+
+        Models with a compiled kernel get the analytic derivatives. The others fall
+        back to central finite differences that follow the same root of the cubic.
+        """
+        y = np.asarray(y, dtype=np.float64)
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            return kernel_lnphi_derivatives(
+                y, P, T, Z, *kernel.getKernelArgs(data), R_IG
+            )
+
+        zliq, zvap = self.getZliqZvap(P, T, y)
+        liquid = abs(Z - zliq) <= abs(Z - zvap)
+        hT = 1e-4 * T
+        hP = 1e-6 * P
+        hn = 1e-6
+        dlnphidT = (
+            self._getLnPhiOnBranch(y, P, T + hT, liquid)
+            - self._getLnPhiOnBranch(y, P, T - hT, liquid)
+        ) / (2.0 * hT)
+        dlnphidP = (
+            self._getLnPhiOnBranch(y, P + hP, T, liquid)
+            - self._getLnPhiOnBranch(y, P - hP, T, liquid)
+        ) / (2.0 * hP)
+        dlnphidn = np.empty((self.n, self.n))
+        for j in range(self.n):
+            e = np.zeros(self.n)
+            e[j] = hn
+            dlnphidn[:, j] = (
+                self._getLnPhiOnBranch((y + e) / (1.0 + hn), P, T, liquid)
+                - self._getLnPhiOnBranch((y - e) / (1.0 - hn), P, T, liquid)
+            ) / (2.0 * hn)
+        return self.getLnPhiVector(y, P, T, Z), dlnphidT, dlnphidP, dlnphidn
+
+    def _getLnPhiOnBranch(self, y, P: float, T: float, liquid: bool) -> np.ndarray:
+        z = self.getZliqZvap(P, T, y)[0 if liquid else 1]
+        return self.getLnPhiVector(y, P, T, z)
+
+    def getPhiVector(self, y, P: float, T: float, Z: float) -> np.ndarray:
+        return np.exp(self.getLnPhiVector(y, P, T, Z))
+
     def getFugacity(self, y, _P: float, _T: float, _V: float, _Z: float) -> float:
-        f = 0.0
-        for i in range(self.n):
-            f += y[i] * self.getPhi_i(i, y, _P, _T, _Z)
+        f = np.sum(np.asarray(y) * self.getPhiVector(y, _P, _T, _Z))
         return f * _P
 
     def getAllProps(
@@ -191,8 +381,7 @@ class EOSMixture:
     ) -> (Props, Props):
         log = ""
 
-        zs = self.getZfromPT(P, T, y)
-        zliq, zvap = np.min(zs), np.max(zs)
+        zliq, zvap = self.getZliqZvap(P, T, y)
         vliq, vvap = zliq * R_IG * T / P, zvap * R_IG * T / P
 
         MixSubs = MixtureProp(self.substances, y)
@@ -231,45 +420,60 @@ class EOSMixture:
         return retPropsliq, retPropsvap
 
     def getdZdT(self, P: float, T: float, y) -> [float, float]:
-        h = 1e-5
-        z_plus_h = self.getZfromPT(P, T + h, y)
-        z_minus_h = self.getZfromPT(P, T - h, y)
-        zs = (z_plus_h - z_minus_h) / (2.0 * h)
-        return np.min(zs), np.max(zs)
-
-    # TODO speed up this part with numba
-    def getDepartureProps(self, y, P, T, V, Z):
-        def _Zfunc(v, t):
-            bm = self.mixRuleBehavior.bm(y, t, self.biBehavior, self.substances)
-            thetam = self.mixRuleBehavior.thetam(
-                y, t, self.thetaiBehavior, self.substances, self.k
-            )
-            delta = self.deltaMixBehavior.deltam(
-                y, t, self.biBehavior, self.mixRuleBehavior, self.substances
-            )
-            epsilon = self.epsilonMixBehavior.epsilonm(
-                y, t, self.biBehavior, self.mixRuleBehavior, self.substances
-            )
-            return v / (v - bm) - (thetam / (R_IG * t)) * v / (
-                v ** 2 + v * delta + epsilon
+        """
+        Returns (dZ/dT)_P of the liquid and of the vapor root.
+        """
+        b, theta, delta, epsilon = self.getMixtureParameters(y, T)
+        db, dtheta, ddelta, depsilon = self.getdMixtureParametersdT(y, T)
+        dzs = [
+            _getdZdT_helper(
+                P, T, z, R_IG, b, theta, delta, epsilon, db, dtheta, ddelta, depsilon
             )
+            for z in self.getZliqZvap(P, T, y)
+        ]
+        return dzs[0], dzs[1]
+
+    def getdMixtureParametersdT(self, y, T: float):
+        """
+        Returns the temperature derivatives of (b, theta, delta, epsilon).
+        """
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            return tuple(kernel.getMixtureParameters(data, y, T)[8])
+        snapshot = self.getParametersSnapshot(T)
+        dbi = self.mixRuleBehavior.getdBidTVector(T, self.biBehavior, self.substances)
+        dthetai = self.thetaiBehavior.getdThetaidTVector(T, self.substances)
+        dthetaij = self.mixRuleBehavior.getdThetaijdT(snapshot.thetai, dthetai, self.k)
+        db = self.mixRuleBehavior.bmFromArrays(y, dbi)
+        dtheta = self.mixRuleBehavior.thetamFromArrays(y, dthetaij)
+        ddelta = self.deltaMixBehavior.getdDeltamdT(
+            y, T, self.biBehavior, self.mixRuleBehavior, self.substances
+        )
+        depsilon = self.epsilonMixBehavior.getdEpsilonmdT(
+            y, T, self.biBehavior, self.mixRuleBehavior, self.substances
+        )
+        return db, dtheta, ddelta, depsilon
 
-        def _dZdT(v, t):
-            h = 1e-5
-            return (_Zfunc(v, t + h) - _Zfunc(v, t - h)) / (2.0 * h)
-
-        def _URfunc(v, t):
-            return t * _dZdT(v, t) / v
-
-        def _ARfunc(v, t):
-            return (1.0 - _Zfunc(v, t)) / v
-
-        # calculate UR
-        # nhau = _URfunc(V, T)
-        UR_RT = quad(_URfunc, V, np.inf, args=(T,))[0]
+    def getDepartureProps(self, y, P, T, V, Z):
+        bm, thetam, deltam, epsilonm = self.getMixtureParameters(y, T)
+        dbm, dthetam, ddeltam, depsilonm = self.getdMixtureParametersdT(y, T)
+        # calculate UR and AR
+        UR_RT, AR_RT = _getDepartureProps_helper(
+            T,
+            V,
+            Z,
+            R_IG,
+            bm,
+            thetam,
+            deltam,
+            epsilonm,
+            dbm,
+            dthetam,
+            ddeltam,
+            depsilonm,
+            DBL_EPSILON,
+        )
         UR = UR_RT * T * R_IG
-        # calculate AR
-        AR_RT = quad(_ARfunc, V, np.inf, args=(T,))[0] + np.log(Z)
         AR = AR_RT * T * R_IG
         # calculate HR
         HR_RT = UR_RT + 1.0 - Z
@@ -301,12 +505,33 @@ class EOSMixture:
         delta = state.subtract(ref)
         return delta
 
-    def getCpHSGUA(self, y, Tref: float, T: float, Pref: float, P: float):
-        zs = self.getZfromPT(P, T, y)
-        zsref = self.getZfromPT(Pref, Tref, y)
+    def getResidualProps(self, y, P: float, T: float, Z: float):
+        """
+        Returns the residual enthalpy, entropy and isobaric heat capacity, real
+        fluid minus ideal gas at the same T and P, at the root Z.
+
+        Models with a compiled kernel get all three in closed form. The others take
+        H and S from getDepartureProps, and Cp from a central difference of H on the
+        same root of the cubic.
+        """
+        y = np.asarray(y, dtype=np.float64)
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            return kernel_residual_props(y, P, T, Z, *kernel.getKernelArgs(data), R_IG)
+
+        zliq, zvap = self.getZliqZvap(P, T, y)
+        liquid = abs(Z - zliq) <= abs(Z - zvap)
+        dep = self.getDepartureProps(y, P, T, Z * R_IG * T / P, Z)
+        h = 1e-4 * T
+        HR = []
+        for Th in (T + h, T - h):
+            Zh = self.getZliqZvap(P, Th, y)[0 if liquid else 1]
+            HR.append(-self.getDepartureProps(y, P, Th, Zh * R_IG * Th / P, Zh).H)
+        return -dep.H, -dep.S, (HR[0] - HR[1]) / (2.0 * h)
 
-        zliq, zvap = np.min(zs), np.max(zs)
-        zliqref, zvapref = np.min(zsref), np.max(zsref)
+    def getCpHSGUA(self, y, Tref: float, T: float, Pref: float, P: float):
+        zliq, zvap = self.getZliqZvap(P, T, y)
+        zliqref, zvapref = self.getZliqZvap(Pref, Tref, y)
 
         vliq, vvap = zliq * R_IG * T / P, zvap * R_IG * T / P
         vliqref, vvapref = zliqref * R_IG * Tref / Pref, zvapref * R_IG * Tref / Pref
@@ -330,11 +555,23 @@ class EOSMixture:
     def _getPb_guess(self, x, T):
         return _helper_getPb_guess(x, T, self.Pcs, self.Tcs, self.omegas)
 
+    def _getWarmK(self, x, y, P: float, T: float) -> np.ndarray:
+        """
+        K = y / x from a guessed vapor composition, with Wilson's K where x_i = 0.
+        """
+        k = np.exp(
+            np.log(self.Pcs / P) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / T)
+        )
+        y = np.asarray(y, dtype=np.float64)
+        nz = (x > 0.0) & (y > 0.0)
+        k[nz] = y[nz] / x[nz]
+        return k
+
     def _getPd_guess(self, y, T):
         return _helper_getPd_guess(y, T, self.Pcs, self.Tcs, self.omegas)
 
     def getCapPhi_i(self, i: int, y, P: float, T: float) -> float:
-        zv = np.max(self.getZfromPT(P, T, y))
+        zv = self.getZliqZvap(P, T, y)[1]
         return self.getPhi_i(i, y, P, T, zv)
 
     def getPSat_i(self, i: int, T: float) -> float:
@@ -344,11 +581,54 @@ class EOSMixture:
         if has_antoine and check_antoine_range:
             P = self.substances[i].getPvpAntoine(T)
         else:
-            P = self.substances[i].getPvpAW(T)
+            P = self._getPSatEOS_i(i, T)
+        return P
+
+    def _getPureSystem(self, i: int):
+        """
+        Component i alone, kept between calls and rebuilt (clearing its Psat
+        and Tsat caches) only if the substance or the equation of state changed.
+        """
+        system = self._pure_systems[i]
+        if (
+            system is None
+            or system.substances[0] is not self.substances[i]
+            or system.eosname != self.eosname
+        ):
             from EOSPureSubstanceInterface import EOSPureSubstanceInterface
 
             system = EOSPureSubstanceInterface([self.substances[i]], self.eosname)
-            P, it = system.getPvp(T, P)
+            self._pure_systems[i] = system
+            self._psat_cache[i].clear()
+            self._tsat_cache[i].clear()
+        return system
+
+    def _getPSatEOS_i(self, i: int, T: float) -> float:
+        """
+        Vapor pressure of component i from the equation of state, cached by
+        temperature (least recently used out first).
+
+        A new temperature starts from Ambrose-Walton, scaled by its ratio to the
+        cached vapor pressure at the nearest temperature. Above the critical
+        temperature, where a secant may step, Wilson's equation extrapolates
+        from the critical point.
+        """
+        s = self.substances[i]
+        if T >= s.Tc:
+            return s.Pc * np.exp(5.373 * (1.0 + s.omega) * (1.0 - s.Tc / T))
+        system = self._getPureSystem(i)
+        cache = self._psat_cache[i]
+        if T in cache:
+            cache.move_to_end(T)
+            return cache[T]
+        P = self.substances[i].getPvpAW(T)
+        if cache:
+            T0 = min(cache, key=lambda t: abs(t - T))
+            P *= cache[T0] / self.substances[i].getPvpAW(T0)
+        P, it = system.getPvp(T, P)
+        cache[T] = P
+        if len(cache) > _SAT_CACHE_SIZE:
+            cache.popitem(last=False)
         return P
 
     def getTSat_i(self, i: int, P: float) -> float:
@@ -357,16 +637,48 @@ class EOSMixture:
         if has_antoine:
             t = self.substances[i].getAntoineTsat(P)
         else:
-            t = 300.0  # check this!
+            t = self._getTSatEOS_i(i, P)
         return t
 
+    def _getTSatEOS_i(self, i: int, P: float) -> float:
+        """
+        Saturation temperature of component i from the equation of state, cached
+        by pressure (least recently used out first).
+
+        A new pressure starts from Lee-Kesler, shifted in 1/T by its difference to
+        the cached Tsat at the nearest pressure. At or above the critical pressure
+        there is no saturation, and Tc is returned as the estimate.
+        """
+        s = self.substances[i]
+        if s.Tc == 0 or s.Pc == 0:
+            raise ValueError(
+                "{} has no Antoine parameters, and no Tc and Pc to estimate its "
+                "saturation temperature".format(s.Name)
+            )
+        if P >= s.Pc:
+            return s.Tc
+        system = self._getPureSystem(i)
+        cache = self._tsat_cache[i]
+        if P in cache:
+            cache.move_to_end(P)
+            return cache[P]
+        u = 1.0 / s.getTsatLK(P)
+        if cache:
+            P0 = min(cache, key=lambda p: abs(np.log(p / P)))
+            u += 1.0 / cache[P0] - 1.0 / s.getTsatLK(P0)
+        T, it = system.getTsat(P, 1.0 / u)
+        cache[P] = T
+        if len(cache) > _SAT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return T
+
     def getTsat(self, P: float):
         tsat = np.asarray([self.getTSat_i(i, P) for i in range(self.n)])
         return tsat
 
     def getCapPhiSat_i(self, i: int, y, T: float) -> float:
         P = self.getPSat_i(i, T)
-        zv = np.max(self.getZfromPT(P, T, y))
+        zv = self.getZliqZvap(P, T, y)[1]
         return self.getPhi_i(i, y, P, T, zv)
 
     def getDefCapPhi_i(self, i: int, y, P: float, T: float) -> float:
@@ -379,24 +691,30 @@ class EOSMixture:
         return np.sum(x * gamma * Psat / CapPhi)
 
     def getPhiVap(self, y, P, T):
-        phivap = np.zeros(self.n, dtype=np.float64)
-        zsvap = self.getZfromPT(P, T, y)
-        zvap = np.max(zsvap)
-        for i in range(self.n):
-            phivap[i] = self.getPhi_i(i, y, P, T, zvap)
-        return phivap
+        zvap = self.getZliqZvap(P, T, y)[1]
+        return self.getPhiVector(y, P, T, zvap)
 
     def getCapPhi(self, y, P, T):
-        capphi = np.ones(self.n, dtype=np.float64)
-        for i in range(self.n):
-            capphi[i] = self.getCapPhi_i(i, y, P, T)
-        return capphi
+        # every CapPhi_i is evaluated at the same vapor root
+        return self.getPhiVap(y, P, T)
 
-    def getBubblePointPressure(self, x, T: float, tol=1e3 * DBL_EPSILON, kmax=1000):
+    def getBubblePointPressure(
+        self,
+        x,
+        T: float,
+        tol=1e3 * DBL_EPSILON,
+        kmax=1000,
+        accelerate=False,
+        guess=None,
+    ):
         if self.vle_method == "phi-phi":
-            return self.getBubblePointPressure_phi_phi(x, T, tol=tol, kmax=kmax)
+            return self.getBubblePointPressure_phi_phi(
+                x, T, tol=tol, kmax=kmax, accelerate=accelerate, guess=guess
+            )
         elif self.vle_method == "UNIFAC":
-            return self.getBubblePointPressure_UNIFAC(x, T, tol=tol, kmax=kmax)
+            return self.getBubblePointPressure_UNIFAC(
+                x, T, tol=tol, kmax=kmax, guess=guess
+            )
         else:
             raise NotImplementedError("gamma-phi not implemented")
 
@@ -408,7 +726,13 @@ class EOSMixture:
         Psat = np.asarray([self.getPSat_i(i, T) for i in range(self.n)])
         return Psat
 
-    def getBubblePointPressure_UNIFAC(self, x, T, tol=1e3 * DBL_EPSILON, kmax=100):
+    def getBubblePointPressure_UNIFAC(
+        self, x, T, tol=1e3 * DBL_EPSILON, kmax=100, guess=None
+    ):
+        """
+        guess is an optional (P, y) pair, e.g. the solution at a nearby x, used to
+        start CapPhi instead of the ideal gas.
+        """
 
         assert len(x) == self.n
         assert np.sum(x) == 1.0
@@ -416,7 +740,10 @@ class EOSMixture:
         x = np.atleast_1d(x)
 
         gamma = self.unifac_model.getGamma(x, T)
-        capphi = np.ones(self.n, dtype=np.float64)
+        if guess is None:
+            capphi = np.ones(self.n, dtype=np.float64)
+        else:
+            capphi = self.getCapPhi(np.asarray(guess[1], dtype=np.float64), guess[0], T)
         PSat = self.getPsat(T)
 
         pb = self.get_P_eq_12_11(x, gamma, PSat, capphi)
@@ -435,61 +762,134 @@ class EOSMixture:
         k = self.get_k_gamma_phi(gamma, PSat, pb, capphi)
         return y, pb, phivap, gamma, k, ite
 
-    def getBubblePointPressure_phi_phi(self, x, T, tol=1e3 * DBL_EPSILON, kmax=1000):
+    def getBubblePointPressure_phi_phi(
+        self, x, T, tol=1e3 * DBL_EPSILON, kmax=1000, accelerate=False, guess=None
+    ):
+        """
+        Successive substitution on K = phi_L / phi_V. With accelerate=True, every
+        few iterations ln K is extrapolated along the dominant eigenvalue of the
+        iteration (GDEM), and the step is dropped if it raises the residual.
+
+        guess is an optional (P, y) pair to start from instead of Wilson's K.
+        """
 
         assert len(x) == self.n
         assert np.sum(x) == 1.0
 
         x = np.atleast_1d(x)
-        pb = self._getPb_guess(x, T)
+        if guess is None:
+            pb = self._getPb_guess(x, T)
+            k = np.exp(
+                np.log(self.Pcs / pb) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / T)
+            )
+        else:
+            pb = guess[0]
+            k = self._getWarmK(x, guess[1], pb, T)
+
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            return _kernel_bubble_P_helper(
+                np.asarray(x, dtype=np.float64),
+                T,
+                pb,
+                k,
+                tol,
+                kmax,
+                accelerate,
+                self.Pcs,
+                self.Tcs,
+                self.omegas,
+                *kernel.getKernelArgs(data),
+                R_IG,
+                DBL_EPSILON,
+            )
 
-        k = np.exp(
-            np.log(self.Pcs / pb) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / T)
-        )
         y = x * k / np.sum(x * k)
 
         err = 100
         ite = 0
-
-        phivap = np.empty(self.n, dtype=np.float64)
-        philiq = np.empty(self.n, dtype=np.float64)
+        # ln K and ln P are accelerated together, as P moves along with K
+        state_prev = np.append(np.log(k), np.log(pb))
+        step = np.zeros(self.n + 1)
+        saved = None
 
         while err > tol and ite < kmax:
             ite += 1
 
-            zsvap = self.getZfromPT(pb, T, y)
-            zsliq = self.getZfromPT(pb, T, x)
-
-            zvap = np.max(zsvap)
-            zliq = np.min(zsliq)
+            zvap = self.getZliqZvap(pb, T, y)[1]
+            zliq = self.getZliqZvap(pb, T, x)[0]
 
-            for i in range(self.n):
-                phivap[i] = self.getPhi_i(i, y, pb, T, zvap)
-                philiq[i] = self.getPhi_i(i, x, pb, T, zliq)
+            phivap = self.getPhiVector(y, pb, T, zvap)
+            philiq = self.getPhiVector(x, pb, T, zliq)
 
             k = philiq / phivap
+            yt = np.sum(x * k)
+            err = np.abs(1.0 - yt)
+            if saved is not None:
+                if err > saved[2]:
+                    # the extrapolated step did not help, take the plain one
+                    y, pb, err = saved
+                    saved = None
+                    continue
+                saved = None
+
+            state = np.append(np.log(k), np.log(pb * yt))
+            step_old, step = step, state - state_prev
+            state_prev = state
+            if accelerate and ite % _GDEM_PERIOD == 0:
+                factor = _gdem_factor_helper(step_old, step)
+                if factor > 0.0:
+                    saved = (x * k, pb * yt, err)
+                    state = state + factor * step
+                    k = np.exp(state[:-1])
+                    yt = np.exp(state[-1]) / pb
+
             y = x * k
-            yt = np.sum(y)
             pb = pb * yt
-            err = np.abs(1.0 - yt)
 
         return y, pb, phivap, philiq, k, ite
 
     ####### DEW POINT ###########
 
-    def getDewPointPressure(self, y, T: float, tol=1e3 * DBL_EPSILON, kmax=1000):
+    def getDewPointPressure(
+        self, y, T: float, tol=1e3 * DBL_EPSILON, kmax=1000, accelerate=False
+    ):
         if self.vle_method == "phi-phi":
-            return self.getDewPointPressure_phi_phi(y, T, tol=tol, kmax=kmax)
+            return self.getDewPointPressure_phi_phi(
+                y, T, tol=tol, kmax=kmax, accelerate=accelerate
+            )
         elif self.vle_method == "UNIFAC":
             return self.getDewPointPressure_UNIFAC(y, T, tol=tol, kmax=kmax)
         else:
             raise NotImplementedError("gamma-phi not implemented")
 
-    def getDewPointPressure_phi_phi(self, y, T, tol=1e3 * DBL_EPSILON, kmax=1000):
+    def getDewPointPressure_phi_phi(
+        self, y, T, tol=1e3 * DBL_EPSILON, kmax=1000, accelerate=False
+    ):
+        """
+        Successive substitution on K = phi_L / phi_V, optionally accelerated as in
+        getBubblePointPressure_phi_phi.
+        """
         assert len(y) == self.n
         assert np.sum(y) == 1.0
 
         y = np.atleast_1d(y)
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            return _kernel_dew_P_helper(
+                np.asarray(y, dtype=np.float64),
+                T,
+                tol,
+                kmax,
+                accelerate,
+                self.Pcs,
+                self.Tcs,
+                self.omegas,
+                *kernel.getKernelArgs(data),
+                R_IG,
+                DBL_EPSILON,
+            )
+
         pd = self._getPd_guess(y, T)
 
         k = np.exp(
@@ -500,29 +900,44 @@ class EOSMixture:
 
         err = 100
         ite = 0
-
-        phivap = np.empty(self.n, dtype=np.float64)
-        philiq = np.empty(self.n, dtype=np.float64)
+        # ln K and ln P are accelerated together, as P moves along with K
+        state_prev = np.append(np.log(k), np.log(pd))
+        step = np.zeros(self.n + 1)
+        saved = None
 
         while err > tol and ite < kmax:
             ite += 1
 
-            zsvap = self.getZfromPT(pd, T, y)
-            zsliq = self.getZfromPT(pd, T, x)
-
-            zvap = np.max(zsvap)
-            zliq = np.min(zsliq)
+            zvap = self.getZliqZvap(pd, T, y)[1]
+            zliq = self.getZliqZvap(pd, T, x)[0]
 
-            for i in range(self.n):
-                phivap[i] = self.getPhi_i(i, y, pd, T, zvap)
-                philiq[i] = self.getPhi_i(i, x, pd, T, zliq)
+            phivap = self.getPhiVector(y, pd, T, zvap)
+            philiq = self.getPhiVector(x, pd, T, zliq)
 
             k = philiq / phivap
-            x = y / k
-            xt = np.sum(x)
-            pd = pd / xt
+            xt = np.sum(y / k)
             err = np.abs(1.0 - xt)
-            x = x / xt
+            if saved is not None:
+                if err > saved[2]:
+                    # the extrapolated step did not help, take the plain one
+                    x, pd, err = saved
+                    saved = None
+                    continue
+                saved = None
+
+            state = np.append(np.log(k), np.log(pd / xt))
+            step_old, step = step, state - state_prev
+            state_prev = state
+            if accelerate and ite % _GDEM_PERIOD == 0:
+                factor = _gdem_factor_helper(step_old, step)
+                if factor > 0.0:
+                    saved = (y / k / xt, pd / xt, err)
+                    state = state + factor * step
+                    k = np.exp(state[:-1])
+                    xt = pd / np.exp(state[-1])
+
+            x = y / k / np.sum(y / k)
+            pd = pd / xt
 
         return x, pd, phivap, philiq, k, ite
 
@@ -572,11 +987,17 @@ class EOSMixture:
         k = self.get_k_gamma_phi(gamma, Psat, pd, capphi)
         return x, pd, phivap, gamma, k, ite
 
-    def getBubblePointTemperature(self, x, P: float, tol=1e3 * DBL_EPSILON, kmax=100):
+    def getBubblePointTemperature(
+        self, x, P: float, tol=1e3 * DBL_EPSILON, kmax=100, guess=None
+    ):
         if self.vle_method == "phi-phi":
-            return self.getBubblePointTemperature_phi_phi(x, P, tol=tol, kmax=kmax)
+            return self.getBubblePointTemperature_phi_phi(
+                x, P, tol=tol, kmax=kmax, guess=guess
+            )
         elif self.vle_method == "UNIFAC":
-            return self.getBubblePointTemperature_UNIFAC(x, P, tol=tol, kmax=kmax)
+            return self.getBubblePointTemperature_UNIFAC(
+                x, P, tol=tol, kmax=kmax, guess=guess
+            )
         else:
             raise NotImplementedError("gamma-phi not implemented")
 
@@ -584,15 +1005,27 @@ class EOSMixture:
         k = gamma * psat / (P * capphi)
         return k
 
-    def getBubblePointTemperature_UNIFAC(self, x, P, tol=1e3 * DBL_EPSILON, kmax=100):
+    def getBubblePointTemperature_UNIFAC(
+        self, x, P, tol=1e3 * DBL_EPSILON, kmax=100, guess=None
+    ):
+        """
+        Secant method on sum(x K) - 1. guess is an optional (T, y) pair; the
+        secant then starts next to it rather than at the mean of the saturation
+        temperatures.
+        """
         assert len(x) == self.n
         x = np.atleast_1d(x)
         assert np.sum(x) == 1.0
 
-        tsat = self.getTsat(P)
-
-        tb = np.float(np.sum(x * tsat))
-        capphi = np.ones(self.n, dtype=np.float64)
+        if guess is None:
+            tsat = self.getTsat(P)
+            tb = float(np.sum(x * tsat))
+            capphi = np.ones(self.n, dtype=np.float64)
+            tb1 = tb * 1.1
+        else:
+            tb = guess[0]
+            capphi = self.getCapPhi(np.asarray(guess[1], dtype=np.float64), P, tb)
+            tb1 = tb * (1.0 + _WARM_T_STEP)
         psat = self.getPsat(tb)
         gamma = self.unifac_model.getGamma(x, tb)
         k = self.get_k_gamma_phi(gamma, psat, P, capphi)
@@ -600,7 +1033,6 @@ class EOSMixture:
         tb2 = tb
         f2 = np.sum(x * k) - 1.0
 
-        tb1 = tb * 1.1
         y = x * k / np.sum(x * k)
         capphi = self.getCapPhi(y, P, tb1)
         psat = self.getPsat(tb1)
@@ -634,72 +1066,35 @@ class EOSMixture:
         phivap = self.getPhiVap(y, P, tb)
         return y, tb, phivap, gamma, k, ite
 
-    # TODO optimize this! here, I used the secant method for Tb convergence.
-    def getBubblePointTemperature_phi_phi(self, x, P, tol=1e3 * DBL_EPSILON, kmax=100):
+    def getBubblePointTemperature_phi_phi(
+        self, x, P, tol=1e3 * DBL_EPSILON, kmax=100, guess=None
+    ):
+        """
+        Newton's method on (ln K, ln T), see _kernel_saturation_T_helper. Without
+        a guess it starts from Wilson's K at the temperature where sum(x K) = 1
+        with them; with a (T, y) guess, from the K of the equation of state there.
+        """
 
         assert len(x) == self.n
         x = np.atleast_1d(x)
         assert np.sum(x) == 1.0
 
-        Tbi = np.empty(self.n)
-        for i in range(self.n):
-            if self.substances[i].Tb > 0:
-                Tbi[i] = self.substances[i].Tb
-            else:
-                Tbi[i] = 100.0
-
-        tb = _helper_bubble_T_guess_from_wilson(
-            x, P, np.sum(x * Tbi), self.Pcs, self.Tcs, self.omegas
-        )
-
-        k = np.exp(
-            np.log(self.Pcs / P) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / tb)
-        )
-
-        err = 100
-        ite = 0
-
-        tb2 = tb
-        f2 = np.sum(x * k) - 1.0
-
-        tb1 = tb * 1.1
-        k = np.exp(
-            np.log(self.Pcs / P) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / tb1)
-        )
-        f1 = np.sum(x * k) - 1.0
-
-        y = x * k / np.sum(x * k)
-
-        phivap = np.empty(self.n, dtype=np.float64)
-        philiq = np.empty(self.n, dtype=np.float64)
-
-        while err > tol and ite < kmax:
-            ite += 1
-
-            tb = tb1 - f1 * ((tb1 - tb2) / (f1 - f2))
-
-            zsvap = self.getZfromPT(P, tb, y)
-            zsliq = self.getZfromPT(P, tb, x)
-
-            zvap = np.max(zsvap)
-            zliq = np.min(zsliq)
-
+        if guess is None:
+            Tbi = np.empty(self.n)
             for i in range(self.n):
-                phivap[i] = self.getPhi_i(i, y, P, tb, zvap)
-                philiq[i] = self.getPhi_i(i, x, P, tb, zliq)
+                if self.substances[i].Tb > 0:
+                    Tbi[i] = self.substances[i].Tb
+                else:
+                    Tbi[i] = 100.0
 
-            k = philiq / phivap
-
-            y = x * k
-            yt = np.sum(y)
-            err = np.abs(1.0 - yt)
-            y = y / yt
-            tb2 = tb1
-            tb1 = tb
-            f2 = f1
-            f1 = np.sum(k * x) - 1.0
-
-        return y, tb, phivap, philiq, k, ite
+            tb = np.sum(x * Tbi)
+            k0 = np.ones(self.n)
+        else:
+            tb = guess[0]
+            k0 = self._getWarmK(x, guess[1], P, tb)
+        return self._getSaturationTemperature(
+            x, P, tb, k0, guess is not None, tol, kmax, True
+        )
 
     def getDewPointTemperature(self, y, P: float, tol=1e3 * DBL_EPSILON, kmax=100):
         if self.vle_method == "phi-phi":
@@ -778,125 +1173,568 @@ class EOSMixture:
                 Tdi[i] = 100.0
 
         td = np.sum(y * Tdi)
-
-        k = np.exp(
-            np.log(self.Pcs / P) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / td)
+        return self._getSaturationTemperature(
+            y, P, td, np.ones(self.n), False, tol, kmax, False
         )
 
-        td2 = td
-        f2 = np.sum(y / k) - 1.0
+    def _getSaturationTemperature(
+        self, z, P: float, T: float, k, warm: bool, tol: float, kmax: int, bubble
+    ):
+        """
+        Bubble (or dew) temperature by _kernel_saturation_T_helper, or without a
+        kernel by _getSaturationTemperatureLoop. Raises ValueError if they do not
+        converge in kmax iterations.
+        """
+        z = np.asarray(z, dtype=np.float64)
+        sign = 1.0 if bubble else -1.0
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            ret = _kernel_saturation_T_helper(
+                z,
+                P,
+                T,
+                np.asarray(k, dtype=np.float64),
+                warm,
+                tol,
+                kmax,
+                bubble,
+                self.Pcs,
+                self.Tcs,
+                self.omegas,
+                *kernel.getKernelArgs(data),
+                R_IG,
+            )
+        else:
+            ret = self._getSaturationTemperatureLoop(
+                z, P, T, k, warm, tol, kmax, bubble
+            )
+        if np.abs(1.0 - np.sum(z * ret[4] ** sign)) > tol:
+            raise ValueError(
+                "{} temperature did not converge in {} iterations".format(
+                    "Bubble" if bubble else "Dew", kmax
+                )
+            )
+        return ret
 
-        td1 = td * 1.1
-        k = np.exp(
-            np.log(self.Pcs / P) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / td1)
-        )
-        f1 = np.sum(y / k) - 1.0
+    def _getSaturationTemperatureLoop(
+        self, z, P: float, T: float, k, warm: bool, tol: float, kmax: int, bubble
+    ):
+        """
+        Python counterpart of _kernel_saturation_T_helper. Finite differences of
+        ln(phi) in composition would cost 2 n evaluations of each phase, so the
+        Jacobian keeps only the temperature column, by a forward difference, and
+        treats ln K as in successive substitution.
+        """
+        n = self.n
+        if not warm:
+            T = _helper_T_guess_from_wilson(
+                z, P, T, self.Pcs, self.Tcs, self.omegas, bubble
+            )
+            k = np.exp(
+                np.log(self.Pcs / P) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / T)
+            )
+        X = np.append(np.log(k), np.log(T))
+        sign = 1.0 if bubble else -1.0
+        phivap = np.ones(n, dtype=np.float64)
+        philiq = np.ones(n, dtype=np.float64)
 
-        err = 100
         ite = 0
-        # x = np.full(self.n, 1.0 / self.n)
-        x = (y / k) / np.sum(y / k)
-
-        phivap = np.empty(self.n, dtype=np.float64)
-        philiq = np.empty(self.n, dtype=np.float64)
-
-        while err > tol and ite < kmax:
+        while ite < kmax:
             ite += 1
-
-            td = td1 - f1 * ((td1 - td2) / (f1 - f2))
-
-            zsvap = self.getZfromPT(P, td, y)
-            zsliq = self.getZfromPT(P, td, x)
-
-            zvap = np.max(zsvap)
-            zliq = np.min(zsliq)
-
-            for i in range(self.n):
-                phivap[i] = self.getPhi_i(i, y, P, td, zvap)
-                philiq[i] = self.getPhi_i(i, x, P, td, zliq)
-
+            T = np.exp(X[n])
+            inc = z * np.exp(sign * X[:n])
+            total = np.sum(inc)
+            inc = inc / total
+            x, y = (z, inc) if bubble else (inc, z)
+            lnphil = self._getLnPhiOnBranch(x, P, T, True)
+            lnphiv = self._getLnPhiOnBranch(y, P, T, False)
+            philiq = np.exp(lnphil)
+            phivap = np.exp(lnphiv)
             k = philiq / phivap
-
-            x = y / k
-            xt = np.sum(x)
-            err = np.abs(1.0 - xt)
-
-            x = x / xt
-            td2 = td1
-            td1 = td
-            f2 = f1
-            f1 = np.sum(y / k) - 1.0
-
-        return x, td, phivap, philiq, k, ite
-
-    def getFlash(self, z, P: float, T: float, tol=1e5 * DBL_EPSILON, kmax=1000):
+            err = np.abs(1.0 - np.sum(z * k**sign))
+            if err <= tol:
+                break
+
+            F = np.append(X[:n] + lnphiv - lnphil, np.log(total))
+            hT = 1e-4 * T
+            J = np.zeros((n + 1, n + 1))
+            J[:n, :n] = np.eye(n)
+            J[:n, n] = (
+                self._getLnPhiOnBranch(y, P, T + hT, False)
+                - self._getLnPhiOnBranch(x, P, T + hT, True)
+                - lnphiv
+                + lnphil
+            ) / 1e-4
+            J[n, :n] = sign * inc
+            dX = _helper_saturation_T_step(F, J)
+            dX *= min(1.0, 0.2 / max(abs(dX[n]), 1e-300))
+            X = X + dX
+
+        inc = z * k**sign
+        return inc / np.sum(inc), T, phivap, philiq, k, ite
+
+    def getFlash(
+        self,
+        z,
+        P: float,
+        T: float,
+        tol=1e5 * DBL_EPSILON,
+        kmax=1000,
+        accelerate=False,
+        negative_flash=False,
+    ):
         if self.vle_method == "phi-phi":
-            return self.getFlash_phi_phi(z, P, T, tol=tol, kmax=kmax)
+            return self.getFlash_phi_phi(
+                z,
+                P,
+                T,
+                tol=tol,
+                kmax=kmax,
+                accelerate=accelerate,
+                negative_flash=negative_flash,
+            )
         elif self.vle_method == "UNIFAC":
-            return self.getFlash_UNIFAC(z, P, T, tol=tol, kmax=kmax)
+            return self.getFlash_UNIFAC(
+                z, P, T, tol=tol, kmax=kmax, negative_flash=negative_flash
+            )
         else:
             raise NotImplementedError("gamma-phi not implemented")
 
-    def getFlash_phi_phi(self, z, P: float, T: float, tol=1e5 * DBL_EPSILON, kmax=1000):
+    def getStabilityAnalysis(self, z, P: float, T: float, tol=1e-10, kmax=1000):
+        """
+        Michelsen's tangent plane stability test of the feed z at P and T.
+
+        A vapor-like and a liquid-like trial phase, both started from Wilson's K,
+        are driven by successive substitution to a stationary point of the tangent
+        plane distance. Returns (True, None) if the feed is stable as a single
+        phase, or (False, K) with K estimated from the trial phases that went
+        below the tangent plane.
+        """
+        z = np.asarray(z, dtype=np.float64)
+        lnz = np.log(z)
+
+        # the feed phase is the root with the lowest Gibbs energy
+        d = None
+        for zroot in self.getZliqZvap(P, T, z):
+            lnphi = self.getLnPhiVector(z, P, T, zroot)
+            if d is None or np.sum(z * (lnz + lnphi)) < np.sum(z * d):
+                d = lnz + lnphi
+
+        lnk = np.log(self.Pcs / P) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / T)
+        W = []
+        for sign, root in ((1.0, 1), (-1.0, 0)):
+            lnW = lnz + sign * lnk
+            for ite in range(kmax):
+                Wt = np.exp(lnW)
+                w = Wt / np.sum(Wt)
+                zroot = self.getZliqZvap(P, T, w)[root]
+                lnW_new = d - self.getLnPhiVector(w, P, T, zroot)
+                step = np.max(np.abs(lnW_new - lnW))
+                lnW = lnW_new
+                if step < tol or np.sum((lnW - lnz) ** 2) < 1e-8:
+                    break
+            trivial = np.sum((lnW - lnz) ** 2) < 1e-6
+            tm = 1.0 - np.sum(np.exp(lnW))
+            W.append(None if trivial or tm > -1e-10 else np.exp(lnW))
+
+        Wvap, Wliq = W
+        if Wvap is None and Wliq is None:
+            return True, None
+        if Wliq is None:
+            return False, Wvap / z
+        if Wvap is None:
+            return False, z / Wliq
+        return False, Wvap / Wliq
+
+    def getFlash_phi_phi(
+        self,
+        z,
+        P: float,
+        T: float,
+        tol=1e5 * DBL_EPSILON,
+        kmax=1000,
+        accelerate=False,
+        negative_flash=False,
+    ):
+        """
+        Successive substitution on K = phi_L / phi_V, optionally accelerated as in
+        getBubblePointPressure_phi_phi. The acceleration is judged on the fixed-point
+        residual |ln K(x, y) - ln K used to get x and y|.
+
+        With negative_flash=True the stability pre-check is skipped and the
+        iteration starts from Wilson's K. A vapor fraction outside [0, 1] then
+        means that the feed is a single phase.
+        """
 
         assert self.n == len(z)
         z = np.atleast_1d(z)
         assert np.sum(z) == 1.0
 
-        # check if is flash problem
-        y, pd, pv, pl, k, ite = self.getDewPointPressure(z, T)
-        x, pb, pv, pl, k, ite = self.getBubblePointPressure(z, T)
-
-        if not (pd <= P <= pb):
-            raise ValueError("P is not between Pdew and Pbubble")
+        if negative_flash:
+            k = np.exp(
+                np.log(self.Pcs / P) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / T)
+            )
+        else:
+            # check if is flash problem
+            stable, k = self.getStabilityAnalysis(z, P, T)
+            if stable:
+                raise ValueError("P is not between Pdew and Pbubble")
 
-        v = (pb - P) / (pb - pd)
+        z = np.asarray(z, dtype=np.float64)
+        v = _RachfordRice(0.5, k, z, 1e-8, 500, negative_flash)
+        x = z / (1.0 + v * (k - 1.0))
+        y = k * x
 
         err = 100
         ite = 0
 
-        phivap = np.empty(self.n, dtype=np.float64)
-        philiq = np.empty(self.n, dtype=np.float64)
-
-        y = np.full(self.n, 1.0 / self.n)
-        x = np.full(self.n, 1.0 / self.n)
+        lnk_prev = np.log(k)
+        lnk_used = None
+        dlnk = np.zeros(self.n)
+        saved = None
 
         while err > tol and ite < kmax:
             ite += 1
-            zsvap = self.getZfromPT(P, T, y)
-            zsliq = self.getZfromPT(P, T, x)
+            zvap = self.getZliqZvap(P, T, y)[1]
+            zliq = self.getZliqZvap(P, T, x)[0]
 
-            zvap = np.max(zsvap)
-            zliq = np.min(zsliq)
-
-            for i in range(self.n):
-                phivap[i] = self.getPhi_i(i, y, P, T, zvap)
-                philiq[i] = self.getPhi_i(i, x, P, T, zliq)
+            phivap = self.getPhiVector(y, P, T, zvap)
+            philiq = self.getPhiVector(x, P, T, zliq)
 
             k = philiq / phivap
-
+            lnk = np.log(k)
+            res = np.inf if lnk_used is None else np.max(np.abs(lnk - lnk_used))
+            if saved is not None:
+                if res > saved[4]:
+                    # the extrapolated step did not help, take the plain one
+                    x, y, v, lnk_used = saved[:4]
+                    saved = None
+                    continue
+                saved = None
+
+            dlnk_old, dlnk = dlnk, lnk - lnk_prev
+            lnk_prev = lnk
             vold = v
-            v = _RachfordRice(v, k, z, tol=1e-8, kmax=500)
+            if accelerate and ite % _GDEM_PERIOD == 0:
+                factor = _gdem_factor_helper(dlnk_old, dlnk)
+                if factor > 0.0:
+                    vp = _RachfordRice(v, k, z, 1e-8, 500, negative_flash)
+                    xp = z / (1.0 + vp * (k - 1.0))
+                    saved = (xp, k * xp, vp, lnk, res)
+                    lnk = lnk + factor * dlnk
+                    k = np.exp(lnk)
+
+            v = _RachfordRice(v, k, z, 1e-8, 500, negative_flash)
             x = z / (1.0 + v * (k - 1.0))
             y = k * x
+            lnk_used = lnk
             err = np.abs(v - vold)
 
         return x, y, v, phivap, philiq, k, ite
 
-    def getFlash_UNIFAC(self, z, P: float, T: float, tol=1e5 * DBL_EPSILON, kmax=1000):
+    def getRachfordRiceBatch(
+        self, K, Z, v=None, negative_flash=False, tol=1e-12, kmax=100
+    ) -> np.ndarray:
+        """
+        Solves the Rachford-Rice equation for each row of the (N, n) arrays of K
+        values and feed compositions at once. v is an optional initial guess.
+        """
+        K = np.atleast_2d(np.asarray(K, dtype=np.float64))
+        Z = np.atleast_2d(np.asarray(Z, dtype=np.float64))
+        if v is None:
+            v = np.full(K.shape[0], 0.5)
+        v = np.array(np.broadcast_to(np.asarray(v, dtype=np.float64), (K.shape[0],)))
+        return _RachfordRice_batch_helper(v, K, Z, tol, kmax, negative_flash)
+
+    def _getLnPhiMinG(self, y, P: float, T: float):
+        """
+        ln(phi_i) of y and its Z, on the root with the lowest Gibbs energy.
+        """
+        best = None
+        for zroot in set(self.getZliqZvap(P, T, y)):
+            lnphi = self.getLnPhiVector(y, P, T, zroot)
+            if best is None or np.sum(y * lnphi) < np.sum(y * best[0]):
+                best = (lnphi, zroot)
+        return best
+
+    def _getStationaryPoint(self, d, X, lnk, P: float, T: float, tol, kmax):
+        """
+        Python counterpart of _kernel_stationary_point_helper.
+        """
+        best_tm, best_w = 0.0, X[0]
+        for lnW in _stability_trials_helper(X[0], lnk):
+            for _ in range(kmax):
+                Wt = np.exp(lnW)
+                w = Wt / np.sum(Wt)
+                lnW_new = d - self._getLnPhiMinG(w, P, T)[0]
+                step = np.max(np.abs(lnW_new - lnW))
+                lnW = lnW_new
+                if step < tol or _multiphase_trivial_helper(w, X):
+                    break
+            Wt = np.exp(lnW)
+            tm = 1.0 - np.sum(Wt)
+            w = Wt / np.sum(Wt)
+            if tm < best_tm and not _multiphase_trivial_helper(w, X):
+                best_tm, best_w = tm, w
+        return best_tm, best_w
+
+    def getMultiphaseFlash(
+        self, z, P: float, T: float, max_phases=3, tol=1e-10, kmax=1000
+    ):
+        """
+        Isothermal flash of the feed z at P and T into as many as max_phases
+        phases, each on the root of the cubic with the lowest Gibbs energy.
+
+        Starting from the feed as a single phase, a phase is added whenever the
+        tangent plane test of the current solution finds a trial phase below the
+        tangent plane. The test tries Wilson's vapor and liquid and one near-pure
+        phase per component, so that liquid-liquid splits are found. With the
+        phases in place, successive substitution updates the fugacity
+        coefficients, and _multiphase_RachfordRice the phase fractions. Phases
+        whose fraction goes to zero or that become a copy of another are dropped.
+
+        Models with a compiled kernel evaluate theta_ij once per flash and share
+        it between all phases. Returns the phase fractions, the (nphases, n)
+        phase compositions and their Z, lightest phase first, and the number of
+        iterations.
+        """
+        z = np.asarray(z, dtype=np.float64)
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            beta, X, Zs, nph, ite = _kernel_multiphase_flash_helper(
+                z,
+                P,
+                T,
+                max_phases,
+                tol,
+                kmax,
+                self.Pcs,
+                self.Tcs,
+                self.omegas,
+                *kernel.getKernelArgs(data),
+                R_IG,
+                DBL_EPSILON,
+            )
+            return beta[:nph], X[:nph], Zs[:nph], ite
+
+        lnk = np.log(self.Pcs / P) + 5.373 * (1 + self.omegas) * (1.0 - self.Tcs / T)
+        lnphi0, Z0 = self._getLnPhiMinG(z, P, T)
+        beta = np.array([1.0])
+        X = np.array([z])
+        lnphi = np.array([lnphi0])
+        Zs = np.array([Z0])
+        ite = 0
+        while len(beta) < max_phases and ite < kmax:
+            d = np.log(X[0]) + lnphi[0]
+            tm, w = self._getStationaryPoint(d, X, lnk, P, T, tol, kmax)
+            if tm > -_TM_TOL:
+                break
+            lnphiw, Zw = self._getLnPhiMinG(w, P, T)
+            beta = np.append(beta, 0.0)
+            X = np.vstack((X, w))
+            lnphi = np.vstack((lnphi, lnphiw))
+            Zs = np.append(Zs, Zw)
+
+            err = np.inf
+            while err > tol and ite < kmax:
+                ite += 1
+                beta = _multiphase_RachfordRice(beta, lnphi, z, 1e-12, 100)
+                X = _multiphase_compositions_helper(beta, lnphi, z)
+                keep = _multiphase_keep_helper(beta, X)
+                beta, X, lnphi = beta[keep], X[keep], lnphi[keep]
+                new = [self._getLnPhiMinG(x, P, T) for x in X]
+                lnphi_new = np.array([lnphi_k for lnphi_k, _ in new])
+                Zs = np.array([Z for _, Z in new])
+                err = np.max(np.abs(lnphi_new - lnphi))
+                lnphi = lnphi_new
+
+        # the lightest phase first
+        order = np.argsort(-Zs)
+        return beta[order], X[order], Zs[order], ite
+
+    def getMultiphaseFlashBatch(self, Z, P, T, max_phases=3, tol=1e-10, kmax=1000):
+        """
+        getMultiphaseFlash for each row of the (N, n) array of feeds Z at once,
+        in parallel for models with a compiled kernel. P and T may be scalars or
+        one value per row.
+
+        Returns the (N, max_phases) phase fractions, the (N, max_phases, n) phase
+        compositions, the (N, max_phases) Z, the number of phases and the number
+        of iterations of each row. The slots past the number of phases hold a zero
+        fraction and nan.
+        """
+        Z = np.atleast_2d(np.asarray(Z, dtype=np.float64))
+        N = Z.shape[0]
+        P = np.array(np.broadcast_to(np.asarray(P, dtype=np.float64), (N,)))
+        T = np.array(np.broadcast_to(np.asarray(T, dtype=np.float64), (N,)))
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            return _kernel_multiphase_flash_batch_helper(
+                Z,
+                P,
+                T,
+                max_phases,
+                tol,
+                kmax,
+                self.Pcs,
+                self.Tcs,
+                self.omegas,
+                *kernel.getKernelArgs(data),
+                R_IG,
+                DBL_EPSILON,
+            )
+
+        beta = np.zeros((N, max_phases))
+        X = np.full((N, max_phases, self.n), np.nan)
+        Zs = np.full((N, max_phases), np.nan)
+        nph = np.empty(N, dtype=np.int64)
+        ites = np.empty(N, dtype=np.int64)
+        for i in range(N):
+            b, x, zs, ites[i] = self.getMultiphaseFlash(
+                Z[i], P[i], T[i], max_phases, tol, kmax
+            )
+            nph[i] = len(b)
+            beta[i, : nph[i]] = b
+            X[i, : nph[i]] = x
+            Zs[i, : nph[i]] = zs
+        return beta, X, Zs, nph, ites
+
+    def _getPhaseSumProps(self, P: float, T: float, beta, X, Zs, Tref, Pref):
+        """
+        Enthalpy and entropy of the phases from getMultiphaseFlash, from the ideal
+        gas at Tref and Pref, and dH/dT of the system kept at equilibrium at P.
+
+        dH/dT adds to the heat capacity of the phases at fixed composition the
+        enthalpy carried by the mass transfer between them. The transfer rates
+        dn_k/dT of every phase but the last come from differentiating
+        ln(f_k) = ln(f_last) with respect to T. As the system stays at equilibrium,
+        dS/dT = (dH/dT) / T.
+        """
+        Hi = np.array([s.getH(Tref, T) for s in self.substances])
+        Si = np.array([s.getS(Tref, T, Pref, P) for s in self.substances])
+        Cpi = np.array([s.getCp(T) for s in self.substances])
+        H = 0.0
+        S = 0.0
+        dHdT = 0.0
+        for k in range(len(beta)):
+            x = X[k]
+            HR, SR, CpR = self.getResidualProps(x, P, T, Zs[k])
+            lnx = np.log(x, out=np.zeros_like(x), where=x > 0.0)
+            H += beta[k] * (np.dot(x, Hi) + HR)
+            S += beta[k] * (np.dot(x, Si) - R_IG * np.dot(x, lnx) + SR)
+            dHdT += beta[k] * (np.dot(x, Cpi) + CpR)
+
+        p = len(beta)
+        if p > 1:
+            n = self.n
+            dT = []
+            G = []
+            for k in range(p):
+                _, dlnphidT, _, dlnphidn = self.getLnPhiDerivatives(X[k], P, T, Zs[k])
+                dT.append(dlnphidT)
+                G.append((np.diag(1.0 / X[k]) - 1.0 + dlnphidn) / beta[k])
+            M = np.zeros(((p - 1) * n, (p - 1) * n))
+            rhs = np.zeros((p - 1) * n)
+            for k in range(p - 1):
+                rhs[k * n : (k + 1) * n] = dT[-1] - dT[k]
+                for j in range(p - 1):
+                    M[k * n : (k + 1) * n, j * n : (j + 1) * n] = G[-1]
+                M[k * n : (k + 1) * n, k * n : (k + 1) * n] += G[k]
+            dndT = np.linalg.solve(M, rhs)
+            # partial molar enthalpies differ by their residual parts only
+            dHdT += R_IG * T * T * np.dot(rhs, dndT)
+        return H, S, dHdT
+
+    def _getFlashPX(
+        self, z, P: float, spec: float, entropy: bool, T, Tref, Pref, tol, kmax
+    ):
+        """
+        Newton's method on T for getFlashPH and getFlashPS. Each iteration is one
+        getMultiphaseFlash and the derivatives of _getPhaseSumProps. H and S
+        increase with T, so the iterates keep a bracket of the solution, and a
+        Newton step that leaves it is replaced by bisection.
+        """
+        z = np.asarray(z, dtype=np.float64)
+        lo, hi = 0.0, np.inf
+        for ite in range(1, kmax + 1):
+            beta, X, Zs, _ = self.getMultiphaseFlash(z, P, T)
+            H, S, dHdT = self._getPhaseSumProps(P, T, beta, X, Zs, Tref, Pref)
+            f = (S if entropy else H) - spec
+            dfdT = dHdT / T if entropy else dHdT
+            if f > 0.0:
+                hi = min(hi, T)
+            else:
+                lo = max(lo, T)
+            Tnew = T - f / dfdT
+            if not lo < Tnew < hi:
+                Tnew = 0.5 * (lo + hi) if np.isfinite(hi) else 2.0 * T
+            if abs(Tnew - T) < tol * T:
+                return T, beta, X, Zs, ite
+            T = Tnew
+        raise ValueError("PH/PS flash did not converge in {} iterations".format(kmax))
+
+    def getFlashPH(
+        self, z, P: float, H: float, T=None, Tref=298.15, Pref=1e5, tol=1e-9, kmax=50
+    ):
+        """
+        Isenthalpic flash: the temperature and the phases of the feed z at P with
+        the molar enthalpy H, from the ideal gas at Tref and Pref.
+
+        T is the starting temperature, Tref if not given. Returns T, then the phase
+        fractions, compositions and Z of getMultiphaseFlash at T, and the number of
+        outer iterations.
+        """
+        T = Tref if T is None else T
+        return self._getFlashPX(z, P, H, False, T, Tref, Pref, tol, kmax)
+
+    def getFlashPS(
+        self, z, P: float, S: float, T=None, Tref=298.15, Pref=1e5, tol=1e-9, kmax=50
+    ):
+        """
+        Isentropic flash: as getFlashPH, with the molar entropy S, from the ideal
+        gas at Tref and Pref, as the specification.
+        """
+        T = Tref if T is None else T
+        return self._getFlashPX(z, P, S, True, T, Tref, Pref, tol, kmax)
+
+    def getPhaseSumProps(self, z, P: float, T: float, Tref=298.15, Pref=1e5):
+        """
+        Molar enthalpy and entropy of the feed z at P and T, split into its phases
+        by getMultiphaseFlash, from the ideal gas at Tref and Pref. These are the
+        H and S that getFlashPH and getFlashPS take.
+        """
+        beta, X, Zs, _ = self.getMultiphaseFlash(z, P, T)
+        return self._getPhaseSumProps(P, T, beta, X, Zs, Tref, Pref)[:2]
+
+    def getFlash_UNIFAC(
+        self,
+        z,
+        P: float,
+        T: float,
+        tol=1e5 * DBL_EPSILON,
+        kmax=1000,
+        negative_flash=False,
+    ):
+        """
+        With negative_flash=True the check against the dew and bubble pressures is
+        skipped, as in getFlash_phi_phi, and the vapor fraction starts from 0.5.
+        """
 
         assert self.n == len(z)
         z = np.atleast_1d(z)
         assert np.sum(z) == 1.0
 
-        # check if is flash problem
-        y, pd, pv, pl, k, ite = self.getDewPointPressure(z, T)
-        x, pb, pv, pl, k, ite = self.getBubblePointPressure(z, T)
+        if negative_flash:
+            v = 0.5
+        else:
+            # check if is flash problem
+            y, pd, pv, pl, k, ite = self.getDewPointPressure(z, T)
+            x, pb, pv, pl, k, ite = self.getBubblePointPressure(z, T)
 
-        if not (pd <= P <= pb):
-            raise ValueError("P is not between Pdew and Pbubble")
+            if not (pd <= P <= pb):
+                raise ValueError("P is not between Pdew and Pbubble")
 
-        v = (pb - P) / (pb - pd)
+            v = (pb - P) / (pb - pd)
 
         psat = self.getPsat(T)
         y = np.full(self.n, 1.0 / self.n)
@@ -913,128 +1751,560 @@ class EOSMixture:
             k = self.get_k_gamma_phi(gamma, psat, P, capphi)
 
             vold = v
-            v = _RachfordRice(v, k, z, tol=1e-8, kmax=500)
+            v = _RachfordRice(v, k, z, 1e-8, 500, negative_flash)
             x = z / (1.0 + v * (k - 1.0))
             y = k * x
             err = np.abs(v - vold)
 
         return x, y, v, phivap, gamma, k, ite
 
-    def isobaricBinaryMixtureGenData(self, P, x=None, Punit="Pa", Tunit="K"):
+    def _envelopeNewton(self, z, X, spec: int, value: float, bubble: bool, tol, kmax):
+        """
+        Newton's method for the phase envelope equations of getPhaseEnvelope, in
+        X = (ln K, ln T, ln P) with X[spec] fixed at value. The feed is the liquid
+        on the bubble side and the vapor past the critical point.
+
+        Returns the converged X, dX/dS for S = X[spec] and the number of
+        iterations, or None if Newton's method did not converge.
+        """
+        n = self.n
+        feed_root, trial_root = (0, 1) if bubble else (1, 0)
+        X = X.copy()
+        X[spec] = value
+        for ite in range(1, kmax + 1):
+            T = np.exp(X[n])
+            P = np.exp(X[n + 1])
+            y = z * np.exp(X[:n])
+            S = np.sum(y)
+            w = y / S
+            zf = self.getZliqZvap(P, T, z)[feed_root]
+            zt = self.getZliqZvap(P, T, w)[trial_root]
+            lnphif, dTf, dPf, _ = self.getLnPhiDerivatives(z, P, T, zf)
+            lnphit, dTt, dPt, dnt = self.getLnPhiDerivatives(w, P, T, zt)
+
+            F = np.zeros(n + 2)
+            F[:n] = X[:n] + lnphit - lnphif
+            F[n] = S - 1.0
+            F[n + 1] = X[spec] - value
+            J = np.zeros((n + 2, n + 2))
+            J[:n, :n] = np.eye(n) + dnt * w[None, :]
+            J[:n, n] = T * (dTt - dTf)
+            J[:n, n + 1] = P * (dPt - dPf)
+            J[n, :n] = y
+            J[n + 1, spec] = 1.0
+            try:
+                dX = np.linalg.solve(J, -F)
+            except np.linalg.LinAlgError:
+                return None
+            if not np.all(np.isfinite(dX)):
+                return None
+            # keep T and P from jumping by more than a factor of about 1.5
+            dX *= min(1.0, 0.4 / max(abs(dX[n]), abs(dX[n + 1]), 1e-300))
+            X += dX
+            if np.max(np.abs(dX)) < tol:
+                rhs = np.zeros(n + 2)
+                rhs[n + 1] = 1.0
+                return X, np.linalg.solve(J, rhs), ite
+        return None
+
+    def getPhaseEnvelope(
+        self, z, P0=1e5, max_points=300, step=0.1, max_step=0.5, tol=1e-9, kmax=20
+    ):
+        """
+        Traces the P-T phase envelope of the feed z by Michelsen's continuation
+        method, from the bubble point at P0 through the critical point and down
+        the dew curve to P0 again.
+
+        The variables are X = (ln K, ln T, ln P) with K = y / z for the incipient
+        phase y. Each point solves ln K + ln(phi(y)) - ln(phi(z)) = 0 and
+        sum(y - z) = 0 with one variable specified: the one that changes the most
+        along the curve, from the sensitivity dX/dS. The next point is predicted
+        along dX/dS. The step grows when Newton's method converges in a few
+        iterations and shrinks when it does not. Close to the critical point, the
+        step on ln K jumps across K = 1, so that Newton's method is not drawn to
+        the trivial solution.
+
+        Returns T, P, K at each point and a boolean mask that is True on the bubble
+        side, followed by the (T, P) of the critical point, of the cricondenbar
+        and of the cricondentherm. The critical point is interpolated between the
+        two points that bracket it, and the cricondenbar and cricondentherm
+        between the two points around each extremum. Any of them not found is None.
+        """
+        z = np.asarray(z, dtype=np.float64)
+        n = self.n
+        lnPcs = np.log(self.Pcs)
+        b = 5.373 * (1 + self.omegas) * self.Tcs
+
+        # Wilson's bubble point at P0. Newton's method on u = 1/T, where
+        # ln(sum(z K)) is convex and decreasing, converges from a high T
+        u = 1.0 / (2.0 * np.max(self.Tcs))
+        for _ in range(100):
+            lnk = lnPcs - np.log(P0) + 5.373 * (1 + self.omegas) - b * u
+            zk = z * np.exp(lnk)
+            du = np.log(np.sum(zk)) / (np.sum(zk * b) / np.sum(zk))
+            u += du
+            if abs(du) < 1e-12 * u:
+                break
+        X = np.append(lnk, [-np.log(u), np.log(P0)])
+
+        ret = self._envelopeNewton(z, X, n + 1, np.log(P0), True, tol, 50)
+        if ret is None:
+            raise ValueError("No bubble point found at P0 = {} Pa".format(P0))
+        X, dXdS, ite = ret
+        ref = int(np.argmax(np.abs(X[:n])))
+        bubble = True
+        spec = n + 1
+        # dX/dS oriented along the direction of travel, starting upwards in P
+        tangent = dXdS / dXdS[spec]
+
+        Xs = [X]
+        tangents = [tangent]
+        sides = [bubble]
+        h = step
+        while len(Xs) < max_points:
+            spec = int(np.argmax(np.abs(tangent)))
+            ds = h * np.sign(tangent[spec])
+            side = bubble
+            if spec < n and X[spec] * ds < 0.0 and abs(X[spec]) < 2.0 * h:
+                # jump across the critical point instead of landing next to it
+                ds = -2.0 * X[spec]
+                side = not bubble
+            Xpred = X + tangent / tangent[spec] * ds
+            ret = self._envelopeNewton(z, Xpred, spec, X[spec] + ds, side, tol, kmax)
+            if ret is None or ret[2] > 6:
+                h *= 0.5
+                if h < 1e-6:
+                    break
+                continue
+            X, dXdS, ite = ret
+            # keep the orientation of the tangent along the direction of travel
+            if np.dot(dXdS, X - Xs[-1]) < 0.0:
+                dXdS = -dXdS
+            tangent = dXdS
+            bubble = side
+            Xs.append(X)
+            tangents.append(tangent)
+            sides.append(bubble)
+            if ite <= 3:
+                h = min(1.5 * h, max_step)
+            if not bubble and X[n + 1] < np.log(P0):
+                break
+
+        Xs = np.array(Xs)
+        tangents = np.array(tangents)
+        T = np.exp(Xs[:, n])
+        P = np.exp(Xs[:, n + 1])
+        K = np.exp(Xs[:, :n])
+        bubble = np.array(sides)
+
+        critical = None
+        for i in range(len(Xs) - 1):
+            if bubble[i] and not bubble[i + 1]:
+                lnT, lnP = _hermite_at_zero(Xs[i : i + 2], tangents[i : i + 2], ref, n)
+                critical = (np.exp(lnT), np.exp(lnP))
+                break
+
+        cricondenbar = _envelope_extremum(Xs, tangents, n + 1, n)
+        cricondentherm = _envelope_extremum(Xs, tangents, n, n + 1)
+        return T, P, K, bubble, critical, cricondenbar, cricondentherm
+
+    def getCriticalPoint(self, z, T=None, kappa=4.0, tol=1e-10, kmax=100):
+        """
+        Returns the critical temperature, pressure and molar volume of the feed z
+        by the method of Heidemann and Khalil, and the number of iterations.
+
+        At the critical point the matrix Q_ij = d ln(f_i)/dn_j at constant T and V
+        is singular, and the cubic form of the third composition derivatives of
+        the Helmholtz energy along its null vector vanishes. The derivatives come
+        from the compiled kernel, or else from central differences of ln(f_i) by
+        the behaviors. T and V = kappa * b are the starting point, with T from 1.5
+        times the molar average of the Tc's if not given.
+        """
+        z = np.asarray(z, dtype=np.float64)
+        if T is None:
+            T = 1.5 * np.dot(z, self.Tcs)
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            Tc, Pc, Vc, ite = kernel_critical_point(
+                z, T, kappa, tol, kmax, *kernel.getKernelArgs(data), R_IG
+            )
+        else:
+            Tc, Pc, Vc, ite = self._getCriticalPointLoop(z, T, kappa, tol, kmax)
+        if np.isnan(Tc):
+            raise ValueError("No critical point found for z = {}".format(z))
+        return Tc, Pc, Vc, ite
+
+    def getCriticalPointsBatch(self, Z, T=None, kappa=4.0, tol=1e-10, kmax=100):
+        """
+        getCriticalPoint for each row of the (N, n) array of feeds Z at once, in
+        parallel. T and kappa may be scalars or one starting point per row.
+
+        Returns the (N,) arrays Tc, Pc and Vc, nan where no critical point was
+        found, and the number of iterations of each row.
+        """
+        Z = np.atleast_2d(np.asarray(Z, dtype=np.float64))
+        N = Z.shape[0]
+        if T is None:
+            T = 1.5 * np.dot(Z, self.Tcs)
+        T = np.array(np.broadcast_to(np.asarray(T, dtype=np.float64), (N,)))
+        kappa = np.array(np.broadcast_to(np.asarray(kappa, dtype=np.float64), (N,)))
+        kernel, data = self.getKernel()
+        if kernel is not None:
+            out, ites = kernel_critical_points_batch(
+                Z, T, kappa, tol, kmax, *kernel.getKernelArgs(data), R_IG
+            )
+        else:
+            out = np.empty((N, 3))
+            ites = np.empty(N, dtype=np.int64)
+            for i in range(N):
+                Tc, Pc, Vc, ites[i] = self._getCriticalPointLoop(
+                    Z[i], T[i], kappa[i], tol, kmax
+                )
+                out[i] = Tc, Pc, Vc
+        return out[:, 0], out[:, 1], out[:, 2], ites
+
+    def _getCriticalLnF(self, nv, T: float, V: float):
+        """
+        Returns ln(f_i / n_i) of the mole numbers nv in the volume V by the
+        behaviors, and the pressure.
+
+        ln(phi_i) depends on P and Z only through V = Z R T / P and a -ln(Z) term,
+        and ln(P) - ln(Z) = ln(R T / V). Where the volume gives P < 0, Z < 0 too,
+        so |P| and |Z| are passed instead: V is unchanged, and both logarithms
+        are finite and differ by the same ln(R T / V).
+        """
+        N = np.sum(nv)
+        y = nv / N
+        P = self.getPfromTV(T, V / N, y)
+        Z = abs(P * V / (N * R_IG * T))
+        return np.log(abs(P) / N) + self.getLnPhiVector(y, abs(P), T, Z), P
+
+    def _getCriticalQ(self, nv, T: float, V: float):
+        """
+        kernel_critical_Q for the models without a kernel. The delta_ij / n_i term
+        is exact, and the rest comes from central differences of ln(f_i / n_i).
+        """
+        n = len(nv)
+        Q = np.diag(1.0 / nv)
+        for j in range(n):
+            h = min(1e-5 * np.sum(nv), 0.5 * nv[j])
+            dn = np.zeros(n)
+            dn[j] = h
+            Q[:, j] += (
+                self._getCriticalLnF(nv + dn, T, V)[0]
+                - self._getCriticalLnF(nv - dn, T, V)[0]
+            ) / (2.0 * h)
+        return 0.5 * (Q + Q.T)
+
+    def _getCriticalC(self, z, T: float, V: float, tol: float, kmax: int):
+        """
+        _kernel_critical_C for the models without a kernel. The cubic form is
+        -sum(dn_i^3 / z_i^2) plus the second derivative of dn . ln(f / n) at
+        z + s dn along s, by central differences.
+        """
+        sz = np.sqrt(z)
+        S = np.outer(sz, sz)
+        T0 = T
+        lam0 = np.linalg.eigh(S * self._getCriticalQ(z, T0, V))[0][0]
+        T1 = 1.01 * T
+        for _ in range(kmax):
+            lam1 = np.linalg.eigh(S * self._getCriticalQ(z, T1, V))[0][0]
+            if not np.isfinite(lam1) or lam1 == lam0:
+                break
+            T2 = T1 - lam1 * (T1 - T0) / (lam1 - lam0)
+            if T2 <= 0.0:
+                T2 = 0.5 * T1
+            T0, lam0 = T1, lam1
+            T1 = T2
+            if abs(T1 - T0) < tol * T1:
+                v = np.linalg.eigh(S * self._getCriticalQ(z, T1, V))[1][:, 0]
+                dn = sz * v
+                if np.dot(dn, self.getParametersSnapshot(T1).bi) < 0.0:
+                    dn = -dn
+                s = min(1e-3, 0.25 * np.min(z[dn != 0.0] / np.abs(dn[dn != 0.0])))
+                h = [
+                    np.dot(dn, self._getCriticalLnF(z + k * s * dn, T1, V)[0])
+                    for k in (-2.0, -1.0, 0.0, 1.0, 2.0)
+                ]
+                C = (-h[0] + 16.0 * h[1] - 30.0 * h[2] + 16.0 * h[3] - h[4]) / (
+                    12.0 * s**2
+                ) - np.sum(dn**3 / z**2)
+                return T1, C, True
+        return T1, 0.0, False
+
+    def _getCriticalPointLoop(self, z, T: float, kappa: float, tol: float, kmax: int):
+        """
+        kernel_critical_point for the models without a kernel, with Q and C from
+        central differences of ln(f_i) at constant T and V.
+        """
+        B = self.getMixtureParameters(z, T)[0]
+        T, C0, ok = self._getCriticalC(z, T, kappa * B, tol, kmax)
+        if not ok:
+            return np.nan, np.nan, np.nan, 0
+        kappa0 = kappa
+        kappa = 1.05 * kappa
+        for ite in range(1, kmax + 1):
+            T, C, ok = self._getCriticalC(z, T, kappa * B, tol, kmax)
+            if not ok or C == C0:
+                break
+            step = -C * (kappa - kappa0) / (C - C0)
+            kappa0, C0 = kappa, C
+            # do not cross the covolume
+            kappa = max(kappa + step, 0.5 * (1.0 + kappa))
+            if abs(kappa - kappa0) < tol * kappa:
+                T, C, ok = self._getCriticalC(z, T, kappa * B, tol, kmax)
+                if not ok:
+                    break
+                P = self._getCriticalLnF(z, T, kappa * B)[1]
+                return T, P, kappa * B, ite
+        return np.nan, np.nan, np.nan, kmax
+
+    def isobaricBinaryMixtureGenData(
+        self,
+        P,
+        x=None,
+        Punit="Pa",
+        Tunit="K",
+        return_failed=False,
+        adaptive=False,
+        rtol=1e-3,
+        max_points=61,
+    ):
+        """
+        Bubble-point temperatures along x1 at the pressure P, by continuation (see
+        binaryBubbleContinuation). The points that could not be solved are nan,
+        and with return_failed=True their boolean mask is returned as well.
+
+        With adaptive=True, x is refined by binaryBubbleAdaptive within rtol and
+        max_points, starting from 11 evenly spaced points if x is None.
+        """
 
         assert self.n == 2
 
         if x is None:
-            x = x_vec_for_plot
+            x = np.linspace(0.0, 1.0, 11) if adaptive else x_vec_for_plot
 
-        x = np.atleast_1d(x)
-
-        xmix = np.empty(2, dtype=np.float64)
-        y = np.empty(len(x), dtype=np.float64)
-        T = np.empty(len(x), dtype=np.float64)
-        kvec = np.empty(len(x), dtype=np.float64)
-        phi_vap_vec = np.empty(len(x), dtype=np.float64)
-        phi_liq_vec = np.empty(len(x), dtype=np.float64)
-        pv = np.empty(len(x), dtype=np.float64)
-        pl = np.empty(len(x), dtype=np.float64)
-        k = np.empty(len(x), dtype=np.float64)
+        x = np.array(x, dtype=np.float64, ndmin=1)
 
-        for i in range(len(x)):
-            xmix[0] = x[i]
-            xmix[1] = 1.0 - x[i]
+        def solve(xmix, guess):
+            ret = self.getBubblePointTemperature(xmix, P, kmax=100, guess=guess)
+            if self._isTrivialBubblePoint(xmix, ret[0], P, ret[1]):
+                raise ValueError("Trivial bubble point at x1 = {}".format(xmix[0]))
+            return ret
 
-            try:
-                yres, T[i], pv, pl, k, ite = self.getBubblePointTemperature(xmix, P)
-            except:
-                try:
-                    yres = [0, 0]
-                    yres[0] = y[i - 1]
-                    T[i] = T[i - 1]
-                    x[i] = x[i - 1]
-                    pv[0] = phi_vap_vec[i - 1]
-                    pl[0] = phi_liq_vec[i - 1]
-                    k[0] = kvec[i - 1]
-                except:
-                    yres = [0, 0]
-                    yres[0] = y[i + 1]
-                    T[i] = T[i + 1]
-                    x[i] = x[i + 1]
-                    pv[0] = phi_vap_vec[i + 1]
-                    pl[0] = phi_liq_vec[i + 1]
-                    k[0] = kvec[i + 1]
-
-            T[i] = conv_unit(T[i], "K", Tunit)
-            y[i] = yres[0]
-            phi_vap_vec[i] = pv[0]
-            phi_liq_vec[i] = pl[0]
-            kvec[i] = k[0]
+        if adaptive:
+            x, T, y, phi_vap_vec, phi_liq_vec, kvec, failed = self.binaryBubbleAdaptive(
+                solve, x, kmax=100, rtol=rtol, max_points=max_points
+            )
+        else:
+            T, y, phi_vap_vec, phi_liq_vec, kvec, failed = (
+                self.binaryBubbleContinuation(solve, x, kmax=100)
+            )
+        T = conv_unit(T, "K", Tunit)
 
+        if return_failed:
+            return x, y, T, phi_vap_vec, phi_liq_vec, kvec, failed
         return x, y, T, phi_vap_vec, phi_liq_vec, kvec
 
-    def isothermalBinaryMixtureGenData(self, T, x=None, Punit="Pa", Tunit="K"):
+    def isothermalBinaryMixtureGenData(
+        self,
+        T,
+        x=None,
+        Punit="Pa",
+        Tunit="K",
+        return_failed=False,
+        adaptive=False,
+        rtol=1e-3,
+        max_points=61,
+    ):
+        """
+        Bubble-point pressures along x1 at the temperature T, by continuation (see
+        binaryBubbleContinuation). The points that could not be solved are nan,
+        and with return_failed=True their boolean mask is returned as well.
+
+        adaptive, rtol and max_points are as in isobaricBinaryMixtureGenData.
+        """
 
         assert self.n == 2
 
         if x is None:
-            x = x_vec_for_plot
-
-        x = np.atleast_1d(x)
+            x = np.linspace(0.0, 1.0, 11) if adaptive else x_vec_for_plot
 
-        xmix = np.empty(2, dtype=np.float64)
-        y = np.empty(len(x), dtype=np.float64)
-        P = np.empty(len(x), dtype=np.float64)
-        kvec = np.empty(len(x), dtype=np.float64)
-        phi_vap_vec = np.empty(len(x), dtype=np.float64)
-        phi_liq_vec = np.empty(len(x), dtype=np.float64)
-        phi_vap = np.empty(len(x), dtype=np.float64)
-        phi_liq = np.empty(len(x), dtype=np.float64)
-        kv = np.empty(len(x), dtype=np.float64)
+        x = np.array(x, dtype=np.float64, ndmin=1)
 
-        for i in range(len(x)):
-            xmix[0] = x[i]
-            xmix[1] = 1.0 - x[i]
+        def solve(xmix, guess):
+            ret = self.getBubblePointPressure(xmix, T, tol=1e-5, kmax=100, guess=guess)
+            if self._isTrivialBubblePoint(xmix, ret[0], ret[1], T):
+                raise ValueError("Trivial bubble point at x1 = {}".format(xmix[0]))
+            return ret
 
-            try:
-                yres, P[i], phi_vap, phi_liq, kv, ite = self.getBubblePointPressure(
-                    xmix, T, tol=1e-5, kmax=100
-                )
-            except:
-                try:
-                    yres = [0, 0]
-                    yres[0] = y[i - 1]
-                    P[i] = P[i - 1]
-                    x[i] = x[i - 1]
-                    phi_vap[0] = phi_vap_vec[i - 1]
-                    phi_liq[0] = phi_liq_vec[i - 1]
-                    kv[0] = kvec[i - 1]
-                except:
-                    yres = [0, 0]
-                    yres[0] = y[i + 1]
-                    P[i] = P[i + 1]
-                    x[i] = x[i + 1]
-                    phi_vap[0] = phi_vap_vec[i + 1]
-                    phi_liq[0] = phi_liq_vec[i + 1]
-                    kv[0] = kv[i + 1]
-
-            P[i] = conv_unit(P[i], "Pa", Punit)
-            y[i] = yres[0]
-            phi_vap_vec[i] = phi_vap[0]
-            phi_liq_vec[i] = phi_liq[0]
-            kvec[i] = kv[0]
+        if adaptive:
+            x, P, y, phi_vap_vec, phi_liq_vec, kvec, failed = self.binaryBubbleAdaptive(
+                solve, x, kmax=100, rtol=rtol, max_points=max_points
+            )
+        else:
+            P, y, phi_vap_vec, phi_liq_vec, kvec, failed = (
+                self.binaryBubbleContinuation(solve, x, kmax=100)
+            )
+        P = conv_unit(P, "Pa", Punit)
 
+        if return_failed:
+            return x, y, P, phi_vap_vec, phi_liq_vec, kvec, failed
         return x, y, P, phi_vap_vec, phi_liq_vec, kvec
 
-    def isobaricBinaryMixturePlot(
-        self, P, x=None, Punit="Pa", Tunit="K", expfilename="", plottype="both"
+    def _isTrivialBubblePoint(self, x, y, P: float, T: float) -> bool:
+        """
+        True when the phi-phi iteration has collapsed onto y = x, where the liquid
+        and the vapor are the same root of the cubic. An azeotrope also has y = x,
+        but on two distinct roots.
+        """
+        if self.vle_method != "phi-phi" or np.max(np.abs(x - y)) > 1e-3:
+            return False
+        zliq = self.getZliqZvap(P, T, x)[0]
+        zvap = self.getZliqZvap(P, T, y)[1]
+        return np.abs(zvap - zliq) < 1e-3 * zliq
+
+    def binaryBubbleContinuation(self, solve, x, kmax=None, max_halvings=6, tol=1e-4):
+        """
+        Walks along x1, calling solve(xmix, guess) -> (y, var, phivap, philiq, k,
+        ite) for each point. Each solve is seeded with the (var, y) guess
+        extrapolated from the last converged points: linearly from two of them,
+        quadratically from three, with var taken in log so that it stays positive.
+        Near an azeotrope the quadratic follows the extremum of var.
+
+        A point is converged when its results are finite, |sum(x K) - 1| < tol and,
+        if kmax is given, it took fewer than kmax iterations. solve may also raise
+        a ValueError or an ArithmeticError to reject a point.
+        When it fails, the step from the last converged point is halved, up to
+        max_halvings times, and the intermediate points only feed the
+        extrapolation. A cold start is the last resort.
+
+        Returns var, y1, phivap1, philiq1 and K1 at each x1, nan where the point
+        failed, and the boolean mask of the failed points.
+        """
+        x = np.array(x, dtype=np.float64, ndmin=1)
+        out = np.full((5, len(x)), np.nan)
+        failed = np.zeros(len(x), dtype=bool)
+        history = []
+
+        def attempt(x1, guess):
+            values = self._solveBinaryBubblePoint(solve, x1, guess, kmax, tol)
+            if values is not None:
+                history[:] = [h for h in history if h[0] != x1]
+                history.append((float(x1), float(np.log(values[0])), values[1]))
+                del history[:-3]
+            return values
+
+        for i, x1 in enumerate(x):
+            target = x1
+            halvings = 0
+            while True:
+                values = attempt(target, _binary_continuation_guess(history, target))
+                if values is not None:
+                    if target == x1:
+                        break
+                    target = x1
+                    continue
+                if not history or halvings == max_halvings:
+                    values = attempt(x1, None)
+                    break
+                halvings += 1
+                target = 0.5 * (history[-1][0] + target)
+
+            if values is None:
+                failed[i] = True
+            else:
+                out[:, i] = values
+
+        return out[0], out[1], out[2], out[3], out[4], failed
+
+    def _solveBinaryBubblePoint(self, solve, x1: float, guess, kmax, tol: float):
+        """
+        One converged point of binaryBubbleContinuation, as the array (var, y1,
+        phivap1, philiq1, K1), or None.
+        """
+        xmix = np.array([x1, 1.0 - x1])
+        try:
+            y, var, phivap, philiq, k, ite = solve(xmix, guess)
+        except (ArithmeticError, ValueError, np.linalg.LinAlgError):
+            return None
+        values = np.array([var, y[0], phivap[0], philiq[0], k[0]], dtype=float)
+        if not np.isfinite(values).all() or var <= 0.0:
+            return None
+        if np.abs(np.sum(xmix * k) - 1.0) > tol:
+            return None
+        if kmax is not None and ite >= kmax:
+            return None
+        return values
+
+    def binaryBubbleAdaptive(
+        self, solve, x, kmax=None, rtol=1e-3, max_points=61, tol=1e-4
     ):
+        """
+        Adaptive version of binaryBubbleContinuation. x is only the starting grid.
+        Every interval between two converged points gets an error estimate for
+        the linear interpolation of ln(var) and y1, from the second divided
+        differences at its ends: |f[a, b, c]| h^2 / 4. The intervals above rtol
+        are bisected, worst first, until none is left or the grid holds
+        max_points points. Each midpoint is seeded with the quadratic through its
+        neighbours.
+
+        Returns x1 and then the same arrays as binaryBubbleContinuation.
+        """
+        x = np.unique(np.clip(np.array(x, dtype=np.float64, ndmin=1), 0.0, 1.0))
+        out = np.array(self.binaryBubbleContinuation(solve, x, kmax, tol=tol)[:5])
+        points = {x1: out[:, i] for i, x1 in enumerate(x)}
+        # intervals whose midpoint failed, or too narrow to split
+        frozen = set()
+
+        while len(points) < max_points:
+            xs = np.array(sorted(x1 for x1 in points if not np.isnan(points[x1][0])))
+            if len(xs) < 3:
+                break
+            f = np.array([[np.log(points[x1][0]), points[x1][1]] for x1 in xs])
+            errors = _binary_interval_errors(xs, f)
+            order = [
+                i
+                for i in np.argsort(errors)[::-1]
+                if errors[i] > rtol and (xs[i], xs[i + 1]) not in frozen
+            ]
+            if not order:
+                break
+            for i in order[: max_points - len(points)]:
+                a, b = xs[i], xs[i + 1]
+                xm = 0.5 * (a + b)
+                if b - a < 1e-6:
+                    frozen.add((a, b))
+                    continue
+                c = i - 1 if i > 0 else i + 2
+                history = [(xs[j], f[j, 0], f[j, 1]) for j in (c, i, i + 1)]
+                values = self._solveBinaryBubblePoint(
+                    solve, xm, _binary_continuation_guess(history, xm), kmax, tol
+                )
+                if values is None:
+                    frozen.add((a, b))
+                    values = np.full(5, np.nan)
+                points[xm] = values
 
-        assert self.n == 2
+        xs = np.array(sorted(points))
+        out = np.array([points[x1] for x1 in xs]).T
+        return xs, out[0], out[1], out[2], out[3], out[4], np.isnan(out[0])
 
-        if x is None:
-            x = x_vec_for_plot
+    def isobaricBinaryMixturePlot(
+        self,
+        P,
+        x=None,
+        Punit="Pa",
+        Tunit="K",
+        expfilename="",
+        plottype="both",
+        adaptive=False,
+    ):
+
+        assert self.n == 2
 
         x, y, T, phiv, phil, kvec = self.isobaricBinaryMixtureGenData(
-            P, x, Punit=Punit, Tunit=Tunit
+            P, x, Punit=Punit, Tunit=Tunit, adaptive=adaptive
         )
 
         if self.vle_method == "UNIFAC":
@@ -1065,16 +2335,20 @@ class EOSMixture:
         self.vle_method = method
 
     def isothermalBinaryMixturePlot(
-        self, T, x=None, Punit="Pa", Tunit="K", expfilename="", plottype="both"
+        self,
+        T,
+        x=None,
+        Punit="Pa",
+        Tunit="K",
+        expfilename="",
+        plottype="both",
+        adaptive=False,
     ):
 
         assert self.n == 2
 
-        if x is None:
-            x = x_vec_for_plot
-
         x, y, P, phiv, phil, kvec = self.isothermalBinaryMixtureGenData(
-            T, x, Punit=Punit, Tunit=Tunit
+            T, x, Punit=Punit, Tunit=Tunit, adaptive=adaptive
         )
 
         if self.vle_method == "UNIFAC":
@@ -1099,83 +2373,377 @@ class EOSMixture:
         vleplot.plot()
 
 
-@njit(float64(float64, float64[:], float64[:], float64, int64), cache=True)
-def _RachfordRice(v, k, z, tol, kmax):
+def _hermite_cubic(u0, u1, f0, f1, d0, d1):
+    """
+    Coefficients, highest power first, of the cubic in u through (u0, f0) and
+    (u1, f1) with slopes d0 and d1.
+    """
+    h = u1 - u0
+    c2 = (3.0 * (f1 - f0) / h - 2.0 * d0 - d1) / h
+    c3 = (d0 + d1 - 2.0 * (f1 - f0) / h) / (h * h)
+    # in powers of (u - u0), shifted to powers of u
+    return np.polyadd(
+        np.polyadd(c3 * np.poly([u0, u0, u0]), c2 * np.poly([u0, u0])),
+        np.polyadd(d0 * np.poly([u0]), [f0]),
+    )
 
-    v0 = v
-    v1 = 999.0
-    err = 1000.0
 
-    iter = 0
-    while err > tol or iter > kmax:
-        iter += 1
-        f = np.sum(z * (k - 1.0) / (1.0 + v0 * (k - 1.0)))
-        dfdv = -np.sum(z * (k - 1.0) ** 2 / (1.0 + v0 * (k - 1.0)) ** 2)
-        v1 = v0 - f / dfdv
-        err = np.abs(v0 - v1)
-        v0 = v1
-    return v1
+def _hermite_at_zero(X, tangents, ref, n):
+    """
+    ln T and ln P where ln K_ref = 0, from the Hermite cubics in ln K_ref
+    between two envelope points.
+    """
+    u0, u1 = X[:, ref]
+    values = []
+    for j in (n, n + 1):
+        d0, d1 = tangents[:, j] / tangents[:, ref]
+        values.append(np.polyval(_hermite_cubic(u0, u1, X[0, j], X[1, j], d0, d1), 0))
+    return values
 
 
-@njit(float64(float64[:], float64, float64[:], float64[:], float64[:]), cache=True)
-def _helper_getPb_guess(x, T, Pcs, Tcs, omegas):
-    x = np.atleast_1d(x)
-    return np.sum(x * Pcs * np.exp(5.373 * (1.0 + omegas) * (1.0 - Tcs / T)))
+def _envelope_extremum(X, tangents, j, k):
+    """
+    The (T, P) at the largest maximum of X[:, j] along the envelope, from the
+    Hermite cubic of X[:, j] in X[:, k] between the points where the tangent of
+    X[:, j] changes sign, or None if it never does.
+    """
+    best = None
+    for i in range(len(X) - 1):
+        if not (tangents[i, j] > 0.0 >= tangents[i + 1, j]):
+            continue
+        u0, u1 = X[i, k], X[i + 1, k]
+        if u0 == u1 or tangents[i, k] == 0.0 or tangents[i + 1, k] == 0.0:
+            continue
+        d0 = tangents[i, j] / tangents[i, k]
+        d1 = tangents[i + 1, j] / tangents[i + 1, k]
+        cubic = _hermite_cubic(u0, u1, X[i, j], X[i + 1, j], d0, d1)
+        roots = np.roots(np.polyder(cubic))
+        lo, hi = min(u0, u1), max(u0, u1)
+        candidates = [u0, u1] + [
+            r.real for r in roots if abs(r.imag) < 1e-12 and lo <= r.real <= hi
+        ]
+        u = max(candidates, key=lambda r: np.polyval(cubic, r))
+        value = np.polyval(cubic, u)
+        if best is None or value > best[0]:
+            best = (value, u)
+    if best is None:
+        return None
+    value, u = best
+    lnT, lnP = (u, value) if k == len(X[0]) - 2 else (value, u)
+    return np.exp(lnT), np.exp(lnP)
+
+
+def _binary_interval_errors(xs, f):
+    """
+    Estimated error of the linear interpolation of the columns of f over each
+    interval of the grid xs, from the second divided differences at its ends.
+    """
+    h = np.diff(xs)
+    d1 = np.diff(f, axis=0) / h[:, None]
+    d2 = np.abs(np.diff(d1, axis=0) / (xs[2:] - xs[:-2])[:, None])
+    curvature = np.zeros_like(d1)
+    curvature[1:] = d2
+    curvature[:-1] = np.maximum(curvature[:-1], d2)
+    return np.max(curvature, axis=1) * h * h / 4.0
 
 
-@njit(float64(float64[:], float64, float64[:], float64[:], float64[:]), cache=True)
-def _helper_getPd_guess(y, T, Pcs, Tcs, omegas):
-    y = np.atleast_1d(y)
-    return 1.0 / np.sum(y / (Pcs * np.exp(5.373 * (1.0 + omegas) * (1.0 - Tcs / T))))
+def _binary_continuation_guess(history, x1):
+    """
+    Lagrange extrapolation of (ln var, y1) to x1 through the converged points in
+    history. Returns the (var, y) guess, or None when there is nothing to go on.
+    """
+    if not history:
+        return None
+    lnvar = 0.0
+    y1 = 0.0
+    for xi, lnvari, y1i in history:
+        if xi == x1:
+            lnvar, y1 = lnvari, y1i
+            break
+        w = 1.0
+        for xj, _, _ in history:
+            if xj != xi:
+                w *= (x1 - xj) / (xi - xj)
+        lnvar += w * lnvari
+        y1 += w * y1i
+    y1 = min(max(y1, 1e-10), 1.0 - 1e-10)
+    return np.exp(lnvar), np.array([y1, 1.0 - y1])
+
+
+_GDEM_PERIOD = 5
+# a tangent plane distance below -_TM_TOL makes a multiphase flash add a phase
+_TM_TOL = 1e-8
+# relative offset of the second secant point when the temperature is warm-started
+_WARM_T_STEP = 1e-3
+# entries kept per component in the caches of getPSat_i and getTSat_i
+_SAT_CACHE_SIZE = 64
+
+
+@njit(float64(float64[:], float64[:]), cache=True)
+def _gdem_factor_helper(step_old, step):
+    """
+    Returns lambda / (1 - lambda) for the dominant eigenvalue lambda of the
+    successive substitution, estimated from two consecutive steps, or 0 when the
+    iteration is not in its linear, monotonically convergent regime.
+    """
+    den = np.sum(step_old * step)
+    if den == 0.0:
+        return 0.0
+    lam = np.sum(step * step) / den
+    if lam <= 0.0 or lam >= 1.0:
+        return 0.0
+    return lam / (1.0 - lam)
 
 
-@njit(
-    float64(float64[:], float64, float64, float64[:], float64[:], float64[:]),
-    cache=True,
-)
-def _helper_f_for_temperature_bubble_point_guess(x, P, T, Pcs, Tcs, omegas):
-    return -P + np.sum(Pcs * x * np.exp(5.373 * (1.0 + omegas) * (1.0 - Tcs / T)))
+@njit(float64(float64, float64[:], float64[:], float64, int64, boolean), cache=True)
+def _RachfordRice(v, k, z, tol, kmax, negative=False):
+    """
+    Solves sum z_i (K_i - 1) / (1 + v (K_i - 1)) = 0 for the vapor fraction v.
+
+    Newton steps are kept inside a bracket that shrinks around the root, and any
+    step that leaves it is replaced by bisection. With negative=True the root is
+    searched between the asymptotes 1 / (1 - K_max) and 1 / (1 - K_min) (negative
+    flash), otherwise v is bounded to [0, 1].
+    """
+    k_min = np.min(k)
+    k_max = np.max(k)
+    if k_max <= 1.0:
+        return 0.0
+    if k_min >= 1.0:
+        return 1.0
+
+    if negative:
+        lo = 1.0 / (1.0 - k_max)
+        hi = 1.0 / (1.0 - k_min)
+    else:
+        if np.sum(z * (k - 1.0)) <= 0.0:
+            return 0.0
+        if np.sum(z * (k - 1.0) / k) >= 0.0:
+            return 1.0
+        lo = 0.0
+        hi = 1.0
+
+    if not lo < v < hi:
+        v = 0.5 * (lo + hi)
+
+    for _ in range(kmax):
+        f = np.sum(z * (k - 1.0) / (1.0 + v * (k - 1.0)))
+        dfdv = -np.sum(z * (k - 1.0) ** 2 / (1.0 + v * (k - 1.0)) ** 2)
+        # f decreases monotonically with v
+        if f > 0.0:
+            lo = v
+        else:
+            hi = v
+        vnew = v - f / dfdv
+        if not lo < vnew < hi:
+            vnew = 0.5 * (lo + hi)
+        if np.abs(vnew - v) < tol:
+            return vnew
+        v = vnew
+    return v
 
 
 @njit(
-    float64(float64[:], float64, float64, float64[:], float64[:], float64[:]),
+    (float64[:], float64[:, :], float64[:, :], float64, int64, boolean),
+    parallel=True,
     cache=True,
 )
-def _helper_diff_f_for_temperature_bubble_point_guess(x, P, T, Pcs, Tcs, omegas):
-    h = 1e-3
-    f1 = _helper_f_for_temperature_bubble_point_guess(x, P, T + h, Pcs, Tcs, omegas)
-    f2 = _helper_f_for_temperature_bubble_point_guess(x, P, T - h, Pcs, Tcs, omegas)
-    return (f1 - f2) / (2.0 * h)
+def _RachfordRice_batch_helper(v, K, Z, tol, kmax, negative):
+    n = K.shape[0]
+    ret = np.empty(n)
+    for i in prange(n):
+        ret[i] = _RachfordRice(v[i], K[i], Z[i], tol, kmax, negative)
+    return ret
 
 
-@njit(
-    float64(float64[:], float64, float64, float64[:], float64[:], float64[:]),
-    cache=True,
-)
-def _helper_bubble_T_guess_from_wilson(x, P, T, Pcs, Tcs, omegas):
+@njit((float64[:], float64[:, :], float64[:], float64, int64), cache=True)
+def _multiphase_RachfordRice(beta, lnphi, z, tol, kmax):
+    """
+    Phase fractions of the phases with fugacity coefficients phi_ki, from the
+    minimum over beta >= 0 of Michelsen's convex function
+    Q = sum_k beta_k - sum_i z_i ln(E_i), with E_i = sum_k beta_k / phi_ki.
+
+    Newton's method runs on the phases that are present or that lower Q by
+    appearing. A step that would make a fraction negative stops at zero, which
+    removes that phase, and steps that raise Q are halved.
+    """
+    p = beta.shape[0]
+    beta = beta.copy()
+    invphi = np.exp(-lnphi)
+    for _ in range(kmax):
+        E = np.dot(beta, invphi)
+        q = z / E
+        g = 1.0 - np.dot(invphi, q)
+        H = np.dot(invphi * (q / E), invphi.T)
+        free = (beta > 0.0) | (g < 0.0)
+        d = np.zeros(p)
+        while np.any(free):
+            idx = np.nonzero(free)[0]
+            Hf = H[idx][:, idx]
+            # identical phases make H singular
+            for k in range(idx.shape[0]):
+                Hf[k, k] += 1e-12 * Hf[k, k]
+            d[:] = 0.0
+            d[idx] = np.linalg.solve(Hf, -g[idx])
+            blocked = free & (beta == 0.0) & (d < 0.0)
+            if not np.any(blocked):
+                break
+            free &= ~blocked
+
+        alpha = 1.0
+        limit = -1
+        for k in range(p):
+            if d[k] < 0.0 and beta[k] + alpha * d[k] < 0.0:
+                alpha = -beta[k] / d[k]
+                limit = k
+        Q0 = np.sum(beta) - np.sum(z * np.log(E))
+        bnew = beta
+        while alpha > 1e-12:
+            bnew = np.maximum(beta + alpha * d, 0.0)
+            if limit >= 0:
+                bnew[limit] = 0.0
+            Enew = np.dot(bnew, invphi)
+            if np.all(Enew > 0.0):
+                Qnew = np.sum(bnew) - np.sum(z * np.log(Enew))
+                if Qnew <= Q0 + 1e-14 * (1.0 + abs(Q0)):
+                    break
+            alpha *= 0.5
+            limit = -1
+        step = np.max(np.abs(bnew - beta))
+        beta = bnew
+        if step < tol:
+            break
+    return beta
+
+
+@njit((float64[:], float64[:, :], float64[:]), cache=True)
+def _multiphase_compositions_helper(beta, lnphi, z):
+    """
+    Normalized phase compositions x_ki = z_i / (E_i phi_ki) for the phase
+    fractions of _multiphase_RachfordRice.
+    """
+    invphi = np.exp(-lnphi)
+    X = (z / np.dot(beta, invphi)) * invphi
+    for k in range(X.shape[0]):
+        X[k] /= np.sum(X[k])
+    return X
 
-    tol = 1e-8
-    kmax = 1000
-    k = 0
-    err = 999
 
-    while k < kmax and err < tol:
+@njit((float64[:], float64[:, :]), cache=True)
+def _multiphase_keep_helper(beta, X):
+    """
+    Returns a mask of the phases to keep: the ones with a positive fraction and
+    a composition distinct from the phases before them. A phase that is a copy of
+    another (the trivial solution) gives its fraction to that phase, in beta.
+    """
+    keep = beta > 0.0
+    for k in range(X.shape[0]):
+        for j in range(k):
+            if keep[k] and keep[j] and np.max(np.abs(X[k] - X[j])) < 1e-6:
+                beta[j] += beta[k]
+                beta[k] = 0.0
+                keep[k] = False
+    return keep
+
+
+@njit(boolean(float64[:], float64[:, :]), cache=True)
+def _multiphase_trivial_helper(w, X):
+    """
+    True if the trial composition w has converged to one of the phases in X.
+    """
+    lnw = np.log(w)
+    for k in range(X.shape[0]):
+        if np.sum((lnw - np.log(X[k])) ** 2) < 1e-8:
+            return True
+    return False
 
-        k += 1
-        told = T - _helper_f_for_temperature_bubble_point_guess(
-            x, P, T, Pcs, Tcs, omegas
-        ) / _helper_diff_f_for_temperature_bubble_point_guess(x, P, T, Pcs, Tcs, omegas)
-        err = np.abs(T - told)
-        T = told
 
-    return T
+@njit((float64[:], float64[:]), cache=True)
+def _stability_trials_helper(x, lnk):
+    """
+    Initial ln(W) of the trial phases of a stability test around x: the vapor
+    and the liquid from Wilson's K, then one near-pure phase per component, which
+    finds the liquid-liquid splits that Wilson's K does not.
+    """
+    n = x.shape[0]
+    lnx = np.log(x)
+    trials = np.empty((n + 2, n))
+    trials[0] = lnx + lnk
+    trials[1] = lnx - lnk
+    for i in range(n):
+        trials[2 + i] = lnx + np.log(1e-3)
+        trials[2 + i, i] = np.log(0.999)
+    return trials
 
 
-from numba import njit, float64, jit
+@njit(float64(float64[:], float64, float64[:], float64[:], float64[:]), cache=True)
+def _helper_getPb_guess(x, T, Pcs, Tcs, omegas):
+    x = np.atleast_1d(x)
+    return np.sum(x * Pcs * np.exp(5.373 * (1.0 + omegas) * (1.0 - Tcs / T)))
 
 
-@jit((float64, float64, float64, float64, float64, float64, float64), cache=True)
-def _getZfromPT_helper(
+@njit(float64(float64[:], float64, float64[:], float64[:], float64[:]), cache=True)
+def _helper_getPd_guess(y, T, Pcs, Tcs, omegas):
+    y = np.atleast_1d(y)
+    return 1.0 / np.sum(y / (Pcs * np.exp(5.373 * (1.0 + omegas) * (1.0 - Tcs / T))))
+
+
+@njit(
+    float64(float64[:], float64, float64, float64[:], float64[:], float64[:], boolean),
+    cache=True,
+)
+def _helper_T_guess_from_wilson(z, P, T, Pcs, Tcs, omegas, bubble):
+    """
+    Bubble (or dew) temperature of z at P with Wilson's K, from T.
+
+    With u = 1/T, ln K_i = a_i - b_i u, so ln(sum(z K)) and ln(sum(z / K)) are
+    convex in u, and Newton's method on u converges to their root.
+    """
+    a = np.log(Pcs / P) + 5.373 * (1.0 + omegas)
+    b = 5.373 * (1.0 + omegas) * Tcs
+    u = 1.0 / T
+    for _ in range(100):
+        if bubble:
+            zk = z * np.exp(a - b * u)
+            du = np.log(np.sum(zk)) / (np.sum(zk * b) / np.sum(zk))
+        else:
+            zk = z * np.exp(b * u - a)
+            du = -np.log(np.sum(zk)) / (np.sum(zk * b) / np.sum(zk))
+        # at most double T in one step
+        u = max(u + du, 0.5 * u)
+        if abs(du) < 1e-12 * u:
+            break
+    return 1.0 / u
+
+
+@njit(float64[:](float64[:], float64[:, :]), cache=True)
+def _helper_saturation_T_step(F, J):
+    """
+    Newton step of _kernel_saturation_T_helper, -J^-1 F. Where J is singular, as
+    on the trivial branch K = 1 near a critical point, successive substitution on
+    ln K with the ln T step of the linearized sum equation.
+    """
+    n = F.shape[0] - 1
+    try:
+        dX = np.linalg.solve(J, -F)
+        if np.all(np.isfinite(dX)):
+            return dX
+    except Exception:
+        pass
+    num = F[n]
+    den = 0.0
+    for i in range(n):
+        num -= J[n, i] * F[i]
+        den += J[n, i] * J[i, n]
+    dX = np.empty(n + 1)
+    dX[n] = num / den if den != 0.0 else 0.0
+    for i in range(n):
+        dX[i] = -F[i] - J[i, n] * dX[n]
+    return dX
+
+
+@njit((float64, float64, float64, float64, float64, float64, float64), cache=True)
+def _getZ_cubic_roots_helper(
     b: float,
     theta: float,
     delta: float,
@@ -1191,11 +2759,80 @@ def _getZfromPT_helper(
     _b = deltal - Bl - 1.0
     _c = thetal + epsilonl - deltal * (1.0 + Bl)
     _d = -(epsilonl * (Bl + 1.0) + Bl * thetal)
-    roots = np.array(solve_cubic(1.0, _b, _c, _d))
+    return solve_cubic_roots(1.0, _b, _c, _d)
+
+
+@njit((float64, float64, float64, float64, float64, float64, float64), cache=True)
+def _getZfromPT_helper(
+    b: float,
+    theta: float,
+    delta: float,
+    epsilon: float,
+    T: float,
+    P: float,
+    R_IG: float,
+):
+    nroots, r0, r1, r2 = _getZ_cubic_roots_helper(b, theta, delta, epsilon, T, P, R_IG)
+    roots = np.array([r0, r1, r2])[:nroots]
     real_values = roots[roots >= 0]
     return real_values
 
 
+@njit((float64, float64, float64, float64, float64, float64, float64), cache=True)
+def _getZliqZvap_helper(
+    b: float,
+    theta: float,
+    delta: float,
+    epsilon: float,
+    T: float,
+    P: float,
+    R_IG: float,
+):
+    nroots, r0, r1, r2 = _getZ_cubic_roots_helper(b, theta, delta, epsilon, T, P, R_IG)
+    zliq = np.nan
+    zvap = np.nan
+    # the roots are sorted, so the first non-negative one is the liquid root
+    if nroots > 0 and r0 >= 0:
+        zliq = r0
+    elif nroots > 1 and r1 >= 0:
+        zliq = r1
+    elif nroots > 2 and r2 >= 0:
+        zliq = r2
+    if nroots > 2 and r2 >= 0:
+        zvap = r2
+    elif nroots > 1 and r1 >= 0:
+        zvap = r1
+    elif nroots > 0 and r0 >= 0:
+        zvap = r0
+    return zliq, zvap
+
+
+@njit(
+    (
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64,
+    ),
+    parallel=True,
+    cache=True,
+)
+def _getZliqZvap_batch_helper(b, theta, delta, epsilon, T, P, R_IG):
+    n = b.shape[0]
+    zliq = np.empty(n)
+    zvap = np.empty(n)
+    for k in prange(n):
+        zl, zv = _getZliqZvap_helper(
+            b[k], theta[k], delta[k], epsilon[k], T[k], P[k], R_IG
+        )
+        zliq[k] = zl
+        zvap[k] = zv
+    return zliq, zvap
+
+
 @njit(
     (
         float64,
@@ -1253,12 +2890,807 @@ def _getPhi_i_helper(
     )
     secline_p2 = (thetam / RT) / sqrt_d2_minus_4eps
     thirdline = (
-        (diffdeltam - deltaN / (2.0 * sqrt_d2_minus_4eps))
-        / twoV_plus_deltam_minus_sqrtd24eps
-        - (diffdeltam + deltaN / (2.0 * sqrt_d2_minus_4eps))
-        / twoV_plus_deltam_plus_sqrtd24eps
-    )
+        diffdeltam - deltaN / (2.0 * sqrt_d2_minus_4eps)
+    ) / twoV_plus_deltam_minus_sqrtd24eps - (
+        diffdeltam + deltaN / (2.0 * sqrt_d2_minus_4eps)
+    ) / twoV_plus_deltam_plus_sqrtd24eps
     fourthline = diffbm / (V - bm) - np.log((V - bm) / V) - np.log(Z)
     lnphi_i = firstline * secline_p1 + secline_p2 * thirdline + fourthline
     phi_i = np.exp(lnphi_i)
     return phi_i
+
+
+@njit(
+    (
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+    ),
+    cache=True,
+)
+def _getdZdT_helper(
+    P: float,
+    T: float,
+    Z: float,
+    R_IG: float,
+    bm: float,
+    thetam: float,
+    deltam: float,
+    epsilonm: float,
+    dbmdT: float,
+    dthetamdT: float,
+    ddeltamdT: float,
+    depsilonmdT: float,
+) -> float:
+    RT = R_IG * T
+    V = Z * RT / P
+    q = V * (V + deltam) + epsilonm
+    dPdT = (
+        R_IG / (V - bm)
+        + RT * dbmdT / (V - bm) ** 2
+        - dthetamdT / q
+        + thetam * (ddeltamdT * V + depsilonmdT) / (q * q)
+    )
+    dPdV = -RT / (V - bm) ** 2 + thetam * (2.0 * V + deltam) / (q * q)
+    dVdT = -dPdT / dPdV
+    return P * (dVdT - V / T) / RT
+
+
+@njit(
+    (
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+    ),
+    cache=True,
+)
+def _getDepartureProps_helper(
+    T: float,
+    V: float,
+    Z: float,
+    R_IG: float,
+    bm: float,
+    thetam: float,
+    deltam: float,
+    epsilonm: float,
+    dbmdT: float,
+    dthetamdT: float,
+    ddeltamdT: float,
+    depsilonmdT: float,
+    DBL_EPSILON: float,
+):
+    """
+    Returns (UR/RT, AR/RT) from the closed-form integrals of the generalized cubic.
+
+    With q(v) = v^2 + delta*v + epsilon and I = int_V^inf dv/q, the integrals are
+    AR/RT = ln((V - b)/V) + theta*I/RT + ln(Z) and
+    UR/RT = T*b'/(V - b) - T*theta'*I/RT + theta*I/RT - T*theta*(dI/dT)/RT,
+    where dI/dT accounts for temperature dependent delta and epsilon.
+    """
+    RT = R_IG * T
+    u = 2.0 * V + deltam
+    q = V * (V + deltam) + epsilonm
+    d = deltam * deltam - 4.0 * epsilonm
+
+    if abs(d) < 100 * DBL_EPSILON:
+        # q = (v + delta/2)^2
+        I = 2.0 / u
+        int_v_over_q2 = 2.0 / (u * u) - 4.0 * deltam / (3.0 * u * u * u)
+        int_one_over_q2 = 8.0 / (3.0 * u * u * u)
+    else:
+        if d > 0.0:
+            sqrt_d = np.sqrt(d)
+            I = np.log((u + sqrt_d) / (u - sqrt_d)) / sqrt_d
+        else:
+            sqrt_minus_d = np.sqrt(-d)
+            I = 2.0 * np.arctan2(sqrt_minus_d, u) / sqrt_minus_d
+        int_one_over_q2 = (u / q - 2.0 * I) / d
+        int_v_over_q2 = 1.0 / (2.0 * q) - 0.5 * deltam * int_one_over_q2
+
+    dIdT = -(ddeltamdT * int_v_over_q2 + depsilonmdT * int_one_over_q2)
+
+    AR_RT = np.log((V - bm) / V) + thetam * I / RT + np.log(Z)
+    UR_RT = (
+        T * dbmdT / (V - bm)
+        - T * dthetamdT * I / RT
+        + thetam * I / RT
+        - T * thetam * dIdT / RT
+    )
+    return UR_RT, AR_RT
+
+
+@njit(
+    float64[:](
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64,
+    ),
+    cache=True,
+)
+def _getLnPhi_vector_helper(
+    P: float,
+    T: float,
+    Z: float,
+    R_IG: float,
+    bm: float,
+    thetam: float,
+    deltam: float,
+    epsilonm: float,
+    diffthetam: np.ndarray,
+    diffbm: np.ndarray,
+    diffdeltam: np.ndarray,
+    diffepsilonm: np.ndarray,
+    DBL_EPSILON: float,
+) -> np.ndarray:
+    n = diffbm.shape[0]
+    lnphi = np.empty(n, dtype=np.float64)
+    RT = R_IG * T
+    V = RT * Z / P
+    deltam2_minus_4epislonm = deltam * deltam - 4.0 * epsilonm
+    common_term = -np.log((V - bm) / V) - np.log(Z)
+
+    if abs(deltam2_minus_4epislonm) < 100 * DBL_EPSILON:
+        substitute_term = -1.0 / (V + deltam / 2.0)
+        for i in range(n):
+            lnphi[i] = (
+                substitute_term * diffthetam[i] / RT
+                + diffbm[i] / (V - bm)
+                + common_term
+            )
+        return lnphi
+
+    sqrt_d2_minus_4eps = np.sqrt(deltam2_minus_4epislonm)
+    twoV_plus_deltam_minus_sqrtd24eps = 2.0 * V + deltam - sqrt_d2_minus_4eps
+    twoV_plus_deltam_plus_sqrtd24eps = 2.0 * V + deltam + sqrt_d2_minus_4eps
+    secline_p1 = np.log(
+        twoV_plus_deltam_minus_sqrtd24eps / twoV_plus_deltam_plus_sqrtd24eps
+    )
+    secline_p2 = (thetam / RT) / sqrt_d2_minus_4eps
+
+    # Equation(Poling, 2001)
+    for i in range(n):
+        deltaN = deltam * diffdeltam[i] * 2.0 - 4.0 * diffepsilonm[i]
+        firstline = (1.0 / sqrt_d2_minus_4eps) * (diffthetam[i] / RT) - (
+            thetam / RT
+        ) * deltaN / (2.0 * np.power(deltam2_minus_4epislonm, 1.5))
+        thirdline = (
+            diffdeltam[i] - deltaN / (2.0 * sqrt_d2_minus_4eps)
+        ) / twoV_plus_deltam_minus_sqrtd24eps - (
+            diffdeltam[i] + deltaN / (2.0 * sqrt_d2_minus_4eps)
+        ) / twoV_plus_deltam_plus_sqrtd24eps
+        fourthline = diffbm[i] / (V - bm) + common_term
+        lnphi[i] = firstline * secline_p1 + secline_p2 * thirdline + fourthline
+    return lnphi
+
+
+_kernel_args = (
+    float64[:],
+    float64[:],
+    float64[:],
+    float64[:, :],
+    float64[:, :],
+    int64,
+    float64,
+    float64,
+)
+
+
+@njit(
+    (float64[:], float64, float64, boolean) + _kernel_args + (float64, float64),
+    cache=True,
+)
+def _kernel_lnphi_helper(
+    y, P, T, liquid, ac, bc, tc, m, kij, alpha, u, w, R_IG, DBL_EPSILON
+):
+    (
+        bm,
+        thetam,
+        deltam,
+        epsilonm,
+        diffbm,
+        diffthetam,
+        diffdeltam,
+        diffepsilonm,
+        _,
+    ) = kernel_mixture_parameters(y, T, ac, bc, tc, m, kij, alpha, u, w)
+    zliq, zvap = _getZliqZvap_helper(bm, thetam, deltam, epsilonm, T, P, R_IG)
+    Z = zliq if liquid else zvap
+    return _getLnPhi_vector_helper(
+        P,
+        T,
+        Z,
+        R_IG,
+        bm,
+        thetam,
+        deltam,
+        epsilonm,
+        diffthetam,
+        diffbm,
+        diffdeltam,
+        diffepsilonm,
+        DBL_EPSILON,
+    )
+
+
+@njit(
+    (float64[:, :], float64[:], float64[:]) + _kernel_args + (float64,),
+    parallel=True,
+    cache=True,
+)
+def _kernel_getZliqZvap_batch_helper(Y, T, P, ac, bc, tc, m, kij, alpha, u, w, R_IG):
+    n = Y.shape[0]
+    zliq = np.empty(n)
+    zvap = np.empty(n)
+    for k in prange(n):
+        bm, thetam, deltam, epsilonm = kernel_mixture_parameters(
+            Y[k], T[k], ac, bc, tc, m, kij, alpha, u, w
+        )[:4]
+        zl, zv = _getZliqZvap_helper(bm, thetam, deltam, epsilonm, T[k], P[k], R_IG)
+        zliq[k] = zl
+        zvap[k] = zv
+    return zliq, zvap
+
+
+@njit(
+    (float64[:], float64, float64, float64[:], float64, int64, boolean)
+    + (float64[:], float64[:], float64[:])
+    + _kernel_args
+    + (float64, float64),
+    cache=True,
+)
+def _kernel_bubble_P_helper(
+    x,
+    T,
+    pb,
+    k,
+    tol,
+    kmax,
+    accelerate,
+    Pcs,
+    Tcs,
+    omegas,
+    ac,
+    bc,
+    tc,
+    m,
+    kij,
+    alpha,
+    u,
+    w,
+    R_IG,
+    eps,
+):
+    y = x * k / np.sum(x * k)
+    phivap = np.ones(x.shape[0])
+    philiq = np.ones(x.shape[0])
+
+    # ln K and ln P are accelerated together, as P moves along with K
+    state_prev = np.append(np.log(k), np.log(pb))
+    step = np.zeros(x.shape[0] + 1)
+    has_saved = False
+    saved_y = y
+    saved_pb = pb
+    saved_err = 0.0
+
+    err = 100.0
+    ite = 0
+    while err > tol and ite < kmax:
+        ite += 1
+        phivap = np.exp(
+            _kernel_lnphi_helper(
+                y, pb, T, False, ac, bc, tc, m, kij, alpha, u, w, R_IG, eps
+            )
+        )
+        philiq = np.exp(
+            _kernel_lnphi_helper(
+                x, pb, T, True, ac, bc, tc, m, kij, alpha, u, w, R_IG, eps
+            )
+        )
+        k = philiq / phivap
+        yt = np.sum(x * k)
+        err = np.abs(1.0 - yt)
+        if has_saved:
+            has_saved = False
+            if err > saved_err:
+                # the extrapolated step did not help, take the plain one
+                y = saved_y
+                pb = saved_pb
+                err = saved_err
+                continue
+
+        state = np.append(np.log(k), np.log(pb * yt))
+        step_old = step
+        step = state - state_prev
+        state_prev = state
+        if accelerate and ite % _GDEM_PERIOD == 0:
+            factor = _gdem_factor_helper(step_old, step)
+            if factor > 0.0:
+                has_saved = True
+                saved_y = x * k
+                saved_pb = pb * yt
+                saved_err = err
+                state = state + factor * step
+                k = np.exp(state[:-1])
+                yt = np.exp(state[-1]) / pb
+
+        y = x * k
+        pb = pb * yt
+
+    return y, pb, phivap, philiq, k, ite
+
+
+@njit(
+    (float64[:], float64, float64, int64, boolean, float64[:], float64[:], float64[:])
+    + _kernel_args
+    + (float64, float64),
+    cache=True,
+)
+def _kernel_dew_P_helper(
+    y,
+    T,
+    tol,
+    kmax,
+    accelerate,
+    Pcs,
+    Tcs,
+    omegas,
+    ac,
+    bc,
+    tc,
+    m,
+    kij,
+    alpha,
+    u,
+    w,
+    R_IG,
+    eps,
+):
+    pd = _helper_getPd_guess(y, T, Pcs, Tcs, omegas)
+    k = np.exp(np.log(Pcs / pd) + 5.373 * (1 + omegas) * (1.0 - Tcs / T))
+    x = y / k
+    x = x / np.sum(x)
+    phivap = np.ones(y.shape[0])
+    philiq = np.ones(y.shape[0])
+
+    # ln K and ln P are accelerated together, as P moves along with K
+    state_prev = np.append(np.log(k), np.log(pd))
+    step = np.zeros(y.shape[0] + 1)
+    has_saved = False
+    saved_x = x
+    saved_pd = pd
+    saved_err = 0.0
+
+    err = 100.0
+    ite = 0
+    while err > tol and ite < kmax:
+        ite += 1
+        phivap = np.exp(
+            _kernel_lnphi_helper(
+                y, pd, T, False, ac, bc, tc, m, kij, alpha, u, w, R_IG, eps
+            )
+        )
+        philiq = np.exp(
+            _kernel_lnphi_helper(
+                x, pd, T, True, ac, bc, tc, m, kij, alpha, u, w, R_IG, eps
+            )
+        )
+        k = philiq / phivap
+        xt = np.sum(y / k)
+        err = np.abs(1.0 - xt)
+        if has_saved:
+            has_saved = False
+            if err > saved_err:
+                # the extrapolated step did not help, take the plain one
+                x = saved_x
+                pd = saved_pd
+                err = saved_err
+                continue
+
+        state = np.append(np.log(k), np.log(pd / xt))
+        step_old = step
+        step = state - state_prev
+        state_prev = state
+        if accelerate and ite % _GDEM_PERIOD == 0:
+            factor = _gdem_factor_helper(step_old, step)
+            if factor > 0.0:
+                has_saved = True
+                saved_x = y / k / xt
+                saved_pd = pd / xt
+                saved_err = err
+                state = state + factor * step
+                k = np.exp(state[:-1])
+                xt = pd / np.exp(state[-1])
+
+        x = y / k / np.sum(y / k)
+        pd = pd / xt
+
+    return x, pd, phivap, philiq, k, ite
+
+
+@njit(
+    (float64[:], float64, float64, boolean, float64[:, :], float64[:, :], float64[:])
+    + (float64, float64, float64),
+    cache=True,
+)
+def _kernel_lnphi_derivatives_helper(y, P, T, liquid, aij, daij, bc, u, w, R_IG):
+    """
+    kernel_lnphi_derivatives_aij of y on the liquid or the vapor root.
+    """
+    bm = np.sum(y * bc)
+    thetam = np.sum(aij * np.outer(y, y))
+    zliq, zvap = _getZliqZvap_helper(bm, thetam, u * bm, w * bm * bm, T, P, R_IG)
+    Z = zliq if liquid else zvap
+    return kernel_lnphi_derivatives_aij(y, P, T, Z, aij, daij, bc, u, w, R_IG)
+
+
+@njit(
+    (float64[:], float64, float64, float64[:], boolean, float64, int64, boolean)
+    + (float64[:], float64[:], float64[:])
+    + _kernel_args
+    + (float64,),
+    cache=True,
+)
+def _kernel_saturation_T_helper(
+    z,
+    P,
+    T,
+    k,
+    warm,
+    tol,
+    kmax,
+    bubble,
+    Pcs,
+    Tcs,
+    omegas,
+    ac,
+    bc,
+    tc,
+    m,
+    kij,
+    alpha,
+    u,
+    w,
+    R_IG,
+):
+    """
+    Bubble (or dew) temperature of the liquid (or vapor) z at P. Starts from T
+    and K if warm, else from Wilson's K at the Wilson temperature near T.
+
+    Newton's method on X = (ln K, ln T) for ln K_i + ln(phi_V,i) - ln(phi_L,i) = 0
+    and ln(sum(z K)) = 0 (or ln(sum(z / K)) = 0), with the analytic temperature
+    and composition derivatives of ln(phi). The step is scaled down to at most
+    0.2 in ln T.
+    """
+    n = z.shape[0]
+    if not warm:
+        T = _helper_T_guess_from_wilson(z, P, T, Pcs, Tcs, omegas, bubble)
+        k = np.exp(np.log(Pcs / P) + 5.373 * (1 + omegas) * (1.0 - Tcs / T))
+    X = np.empty(n + 1)
+    X[:n] = np.log(k)
+    X[n] = np.log(T)
+    sign = 1.0 if bubble else -1.0
+    inc = z.copy()
+    phivap = np.ones(n)
+    philiq = np.ones(n)
+
+    ite = 0
+    while ite < kmax:
+        ite += 1
+        T = np.exp(X[n])
+        inc = z * np.exp(sign * X[:n])
+        total = np.sum(inc)
+        inc = inc / total
+        if bubble:
+            x, y = z, inc
+        else:
+            x, y = inc, z
+        # theta_ij and its derivative are shared by both phases
+        aij, daij = kernel_thetaij_dT(T, ac, tc, m, kij, alpha)
+        lnphil, dlnphil, _, dnl = _kernel_lnphi_derivatives_helper(
+            x, P, T, True, aij, daij, bc, u, w, R_IG
+        )
+        lnphiv, dlnphiv, _, dnv = _kernel_lnphi_derivatives_helper(
+            y, P, T, False, aij, daij, bc, u, w, R_IG
+        )
+        philiq = np.exp(lnphil)
+        phivap = np.exp(lnphiv)
+        k = philiq / phivap
+        err = np.abs(1.0 - np.sum(z * k**sign))
+        if err <= tol:
+            break
+
+        F = np.empty(n + 1)
+        F[:n] = X[:n] + lnphiv - lnphil
+        F[n] = np.log(total)
+        J = np.zeros((n + 1, n + 1))
+        dn = dnv if bubble else dnl
+        for i in range(n):
+            for j in range(n):
+                J[i, j] = dn[i, j] * inc[j]
+            J[i, i] += 1.0
+            J[i, n] = T * (dlnphiv[i] - dlnphil[i])
+            J[n, i] = sign * inc[i]
+        dX = _helper_saturation_T_step(F, J)
+        dX *= min(1.0, 0.2 / max(abs(dX[n]), 1e-300))
+        X += dX
+
+    inc = z * k**sign
+    return inc / np.sum(inc), T, phivap, philiq, k, ite
+
+
+@njit(
+    (float64[:], float64, float64, float64[:, :], float64[:], float64, float64)
+    + (float64, float64),
+    cache=True,
+)
+def _kernel_thetaij_lnphi_helper(y, P, T, thetaij, bc, u, w, R_IG, DBL_EPSILON):
+    """
+    ln(phi_i) of y and its Z, on the root of the cubic with the lowest Gibbs
+    energy, from the theta_ij already evaluated at T.
+    """
+    diffthetam = 2.0 * np.dot(thetaij, y)
+    thetam = 0.5 * np.dot(y, diffthetam)
+    bm = np.dot(y, bc)
+    deltam = u * bm
+    epsilonm = w * bm * bm
+    diffdeltam = u * bc
+    diffepsilonm = 2.0 * w * bm * bc
+    zliq, zvap = _getZliqZvap_helper(bm, thetam, deltam, epsilonm, T, P, R_IG)
+    Z = zvap
+    lnphi = _getLnPhi_vector_helper(
+        P,
+        T,
+        zvap,
+        R_IG,
+        bm,
+        thetam,
+        deltam,
+        epsilonm,
+        diffthetam,
+        bc,
+        diffdeltam,
+        diffepsilonm,
+        DBL_EPSILON,
+    )
+    if zliq != zvap:
+        lnphi_liq = _getLnPhi_vector_helper(
+            P,
+            T,
+            zliq,
+            R_IG,
+            bm,
+            thetam,
+            deltam,
+            epsilonm,
+            diffthetam,
+            bc,
+            diffdeltam,
+            diffepsilonm,
+            DBL_EPSILON,
+        )
+        if np.sum(y * lnphi_liq) < np.sum(y * lnphi):
+            lnphi = lnphi_liq
+            Z = zliq
+    return lnphi, Z
+
+
+@njit(
+    (float64[:], float64[:, :], float64[:], float64, float64, float64[:, :])
+    + (float64[:], float64, float64, float64, float64, float64, int64),
+    cache=True,
+)
+def _kernel_stationary_point_helper(
+    d, X, lnk, P, T, thetaij, bc, u, w, R_IG, DBL_EPSILON, tol, kmax
+):
+    """
+    Tangent plane test of the phases X, which share d = ln(x_i) + ln(phi_i), with
+    the trial phases of _stability_trials_helper. Returns the lowest tangent
+    plane distance tm of the stationary points that are not one of the phases,
+    and the normalized composition there (X[0] if none has tm < 0).
+    """
+    trials = _stability_trials_helper(X[0], lnk)
+    best_tm = 0.0
+    best_w = X[0].copy()
+    for t in range(trials.shape[0]):
+        lnW = trials[t].copy()
+        for _ in range(kmax):
+            Wt = np.exp(lnW)
+            wt = Wt / np.sum(Wt)
+            lnphi = _kernel_thetaij_lnphi_helper(
+                wt, P, T, thetaij, bc, u, w, R_IG, DBL_EPSILON
+            )[0]
+            lnW_new = d - lnphi
+            step = np.max(np.abs(lnW_new - lnW))
+            lnW = lnW_new
+            if step < tol or _multiphase_trivial_helper(wt, X):
+                break
+        Wt = np.exp(lnW)
+        tm = 1.0 - np.sum(Wt)
+        wt = Wt / np.sum(Wt)
+        if tm < best_tm and not _multiphase_trivial_helper(wt, X):
+            best_tm = tm
+            best_w = wt
+    return best_tm, best_w
+
+
+@njit(
+    (float64[:], float64, float64, int64, float64, int64)
+    + (float64[:], float64[:], float64[:])
+    + _kernel_args
+    + (float64, float64),
+    cache=True,
+)
+def _kernel_multiphase_flash_helper(
+    z,
+    P,
+    T,
+    max_phases,
+    tol,
+    kmax,
+    Pcs,
+    Tcs,
+    omegas,
+    ac,
+    bc,
+    tc,
+    m,
+    kij,
+    alpha,
+    u,
+    w,
+    R_IG,
+    eps,
+):
+    n = z.shape[0]
+    thetaij = kernel_thetaij(T, ac, tc, m, kij, alpha)
+    lnk = np.log(Pcs / P) + 5.373 * (1 + omegas) * (1.0 - Tcs / T)
+    beta = np.zeros(max_phases)
+    X = np.full((max_phases, n), np.nan)
+    lnphi = np.zeros((max_phases, n))
+    Zs = np.full(max_phases, np.nan)
+    beta[0] = 1.0
+    X[0] = z
+    lnphi[0], Zs[0] = _kernel_thetaij_lnphi_helper(
+        z, P, T, thetaij, bc, u, w, R_IG, eps
+    )
+    nph = 1
+    ite = 0
+    while nph < max_phases and ite < kmax:
+        d = np.log(X[0]) + lnphi[0]
+        tm, wt = _kernel_stationary_point_helper(
+            d, X[:nph], lnk, P, T, thetaij, bc, u, w, R_IG, eps, tol, kmax
+        )
+        if tm > -_TM_TOL:
+            break
+        X[nph] = wt
+        lnphi[nph], Zs[nph] = _kernel_thetaij_lnphi_helper(
+            wt, P, T, thetaij, bc, u, w, R_IG, eps
+        )
+        beta[nph] = 0.0
+        nph += 1
+
+        err = np.inf
+        while err > tol and ite < kmax:
+            ite += 1
+            beta[:nph] = _multiphase_RachfordRice(
+                beta[:nph], lnphi[:nph], z, 1e-12, 100
+            )
+            X[:nph] = _multiphase_compositions_helper(beta[:nph], lnphi[:nph], z)
+            keep = _multiphase_keep_helper(beta[:nph], X[:nph])
+            j = 0
+            for k in range(nph):
+                if keep[k]:
+                    beta[j] = beta[k]
+                    X[j] = X[k]
+                    lnphi[j] = lnphi[k]
+                    j += 1
+            nph = j
+            err = 0.0
+            for k in range(nph):
+                lnphi_k, Zs[k] = _kernel_thetaij_lnphi_helper(
+                    X[k], P, T, thetaij, bc, u, w, R_IG, eps
+                )
+                err = max(err, np.max(np.abs(lnphi_k - lnphi[k])))
+                lnphi[k] = lnphi_k
+        beta[nph:] = 0.0
+        X[nph:] = np.nan
+        Zs[nph:] = np.nan
+
+    # the lightest phase first
+    order = np.argsort(-Zs[:nph])
+    beta[:nph] = beta[:nph][order]
+    X[:nph] = X[:nph][order]
+    Zs[:nph] = Zs[:nph][order]
+    return beta, X, Zs, nph, ite
+
+
+@njit(
+    (float64[:, :], float64[:], float64[:], int64, float64, int64)
+    + (float64[:], float64[:], float64[:])
+    + _kernel_args
+    + (float64, float64),
+    parallel=True,
+    cache=True,
+)
+def _kernel_multiphase_flash_batch_helper(
+    Z,
+    P,
+    T,
+    max_phases,
+    tol,
+    kmax,
+    Pcs,
+    Tcs,
+    omegas,
+    ac,
+    bc,
+    tc,
+    m,
+    kij,
+    alpha,
+    u,
+    w,
+    R_IG,
+    eps,
+):
+    N, n = Z.shape
+    beta = np.empty((N, max_phases))
+    X = np.empty((N, max_phases, n))
+    Zs = np.empty((N, max_phases))
+    nph = np.empty(N, dtype=np.int64)
+    ites = np.empty(N, dtype=np.int64)
+    for i in prange(N):
+        b, x, zs, nph[i], ites[i] = _kernel_multiphase_flash_helper(
+            Z[i].copy(),
+            P[i],
+            T[i],
+            max_phases,
+            tol,
+            kmax,
+            Pcs,
+            Tcs,
+            omegas,
+            ac,
+            bc,
+            tc,
+            m,
+            kij,
+            alpha,
+            u,
+            w,
+            R_IG,
+            eps,
+        )
+        beta[i] = b
+        X[i] = x
+        Zs[i] = zs
+    return beta, X, Zs, nph, ites
@@ -1,21 +1,90 @@
 import abc
 
+import numpy as np
 
-class BiBehavior:
+
+class PrecomputedBehavior(object):
+    """
+    Behavior holding per-component constants that do not depend on temperature.
+
+    precompute(substances) stores them in arrays. It runs once for each substances list
+    the behavior is used with, so the hot paths only read arrays.
+    """
+
+    def precompute(self, substances) -> None:
+        pass
+
+    def checkPrecomputed(self, substances) -> None:
+        if getattr(self, "_precomputed_for", None) is not substances:
+            self.precompute(substances)
+            self._precomputed_for = substances
+
+
+class BiBehavior(PrecomputedBehavior):
     __metaclass__ = abc.ABCMeta
 
     @abc.abstractmethod
     def getBi(self, i: int, T: float, substances) -> float:
         pass
 
+    def getBiVector(self, T: float, substances) -> np.ndarray:
+        return np.array(
+            [self.getBi(i, T, substances) for i in range(len(substances))],
+            dtype=np.float64,
+        )
+
+    def getdBidT(self, i: int, T: float, substances) -> float:
+        h = 1e-5
+        return (
+            self.getBi(i, T + h, substances) - self.getBi(i, T - h, substances)
+        ) / (2.0 * h)
 
-class ThetaiBehavior:
+    def getdBidTVector(self, T: float, substances) -> np.ndarray:
+        return np.array(
+            [self.getdBidT(i, T, substances) for i in range(len(substances))],
+            dtype=np.float64,
+        )
+
+
+class ThetaiBehavior(PrecomputedBehavior):
     __metaclass__ = abc.ABCMeta
 
     @abc.abstractmethod
     def getThetai(self, i: int, T: float, substances) -> float:
         pass
 
+    def getThetaiVector(self, T: float, substances) -> np.ndarray:
+        return np.array(
+            [self.getThetai(i, T, substances) for i in range(len(substances))],
+            dtype=np.float64,
+        )
+
+    def getdThetaidT(self, i: int, T: float, substances) -> float:
+        h = 1e-5
+        return (
+            self.getThetai(i, T + h, substances) - self.getThetai(i, T - h, substances)
+        ) / (2.0 * h)
+
+    def getdThetaidTVector(self, T: float, substances) -> np.ndarray:
+        return np.array(
+            [self.getdThetaidT(i, T, substances) for i in range(len(substances))],
+            dtype=np.float64,
+        )
+
+    def getd2ThetaidT2(self, i: int, T: float, substances) -> float:
+        h = 1e-3
+        return (
+            self.getThetai(i, T + h, substances)
+            - 2.0 * self.getThetai(i, T, substances)
+            + self.getThetai(i, T - h, substances)
+        ) / (h * h)
+
+    def getd2ThetaidT2Vector(self, T: float, substances) -> np.ndarray:
+        return np.array(
+            [self.getd2ThetaidT2(i, T, substances) for i in range(len(substances))],
+            dtype=np.float64,
+        )
+
 
 class DeltaiBehavior:
     __metaclass__ = abc.ABCMeta
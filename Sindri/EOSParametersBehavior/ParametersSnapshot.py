@@ -0,0 +1,26 @@
+import numpy as np
+
+
+class ParametersSnapshot(object):
+    """
+    Per-component parameters of a cubic equation of state, evaluated at a single temperature.
+
+    bi is the co-volume of each component as seen by the mixing rule (already volume
+    translated when the model uses a translation), thetai is the attractive parameter of
+    each component and thetaij is the matrix sqrt(theta_i * theta_j) * (1 - k_ij), for
+    the copy of k_ij kept in k.
+    """
+
+    def __init__(
+        self,
+        T: float,
+        bi: np.ndarray,
+        thetai: np.ndarray,
+        thetaij: np.ndarray,
+        k: np.ndarray,
+    ):
+        self.T = T
+        self.bi = bi
+        self.thetai = thetai
+        self.thetaij = thetaij
+        self.k = k
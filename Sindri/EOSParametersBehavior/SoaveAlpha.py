@@ -0,0 +1,30 @@
+import numpy as np
+
+
+def dalphaSoave(T: float, Tc: float, m: float, dm: float = 0.0) -> float:
+    """
+    Temperature derivative of alpha = (1 + m * (1 - sqrt(T / Tc)))^2.
+
+    dm is the temperature derivative of m, for the models where m depends on T.
+    """
+    sqrt_tr = np.sqrt(T / Tc)
+    g = 1.0 + m * (1.0 - sqrt_tr)
+    dg = dm * (1.0 - sqrt_tr) - m / (2.0 * sqrt_tr * Tc)
+    return 2.0 * g * dg
+
+
+def d2alphaSoave(
+    T: float, Tc: float, m: float, dm: float = 0.0, d2m: float = 0.0
+) -> float:
+    """
+    Second temperature derivative of alpha = (1 + m * (1 - sqrt(T / Tc)))^2.
+    """
+    sqrt_tr = np.sqrt(T / Tc)
+    g = 1.0 + m * (1.0 - sqrt_tr)
+    dg = dm * (1.0 - sqrt_tr) - m / (2.0 * sqrt_tr * Tc)
+    d2g = (
+        d2m * (1.0 - sqrt_tr)
+        - dm / (sqrt_tr * Tc)
+        + m / (4.0 * sqrt_tr ** 3 * Tc * Tc)
+    )
+    return 2.0 * (dg * dg + g * d2g)
@@ -40,6 +40,55 @@ class EOSPureSubstanceInterface:
                 return _P, i
         return _P, i
 
+    def getTsat(
+        self,
+        _P: float,
+        _T: float = None,
+        tol: float = 1e3 * DBL_EPSILON,
+        kmax: int = 100,
+    ):
+        """
+        Saturation temperature at _P, from _T or else from Lee-Kesler.
+
+        Newton's method on ln(f_L / f_V) against 1/T, whose slope is the heat of
+        vaporization over R (Clausius-Clapeyron). Where the cubic has a single
+        root, a Newton step is halved, and a start is moved by 2% towards the
+        other phase (halving the move each time its direction turns).
+        """
+        s = self.substances[0]
+        if _T is None:
+            _T = s.getTsatLK(_P)
+        u = 1.0 / _T
+        u_two_roots = None
+        move, direction = 0.02, 0.0
+        for i in range(1, kmax + 1):
+            T = 1.0 / u
+            Zl, Zv = self.eosmix.getZliqZvap(_P, T, self.y)
+            if Zl == Zv:
+                if u_two_roots is not None:
+                    u = 0.5 * (u + u_two_roots)
+                    continue
+                # the critical volume of the cubics is between 3 b and 4 b
+                b = self.eosmix.getMixtureParameters(self.y, T)[0]
+                new_direction = 1.0 if Zv * R_IG * T / _P > 3.5 * b else -1.0
+                if new_direction == -direction:
+                    move *= 0.5
+                direction = new_direction
+                u *= (1.0 + move) ** direction
+                continue
+            u_two_roots = u
+            f = (
+                self.eosmix.getLnPhiVector(self.y, _P, T, Zl)[0]
+                - self.eosmix.getLnPhiVector(self.y, _P, T, Zv)[0]
+            )
+            HRl = self.eosmix.getResidualProps(self.y, _P, T, Zl)[0]
+            HRv = self.eosmix.getResidualProps(self.y, _P, T, Zv)[0]
+            du = -f * R_IG / (HRl - HRv)
+            u += du
+            if np.abs(du) < tol * u:
+                return 1.0 / u, i
+        return 1.0 / u, i
+
     def getZfromPT(self, _P: float, _T: float):
         return self.eosmix.getZfromPT(_P, _T, self.y)
 
@@ -28,6 +28,29 @@ from compounds import SubstanceProp
 _subs = []
 _k = []
 
+_eos_models = {
+    "van der Waals (1890)": vanderWaals1890,
+    "Redlich and Kwong (1949)": RedlichAndKwong1949,
+    "Wilson (1964)": Wilson1964,
+    "Soave (1972)": Soave1972,
+    "Peng and Robinson (1976)": PR1976,
+    "Schmidt and Wenzel (1979)": SW1979,
+    "Patel and Teja (1982)": PT1982,
+    "Péneloux, et al. (1982)": PenelouxEtAl1982,
+    "Adachi, et al. (1983)": Adachi1983,
+    "Mathias and Copeman (1983)": MathiasCopeman1983,
+    "Soave (1984)": Soave1984,
+    "Adachi, et al. (1985)": Adachi1985,
+    "Stryjek and Vera (1986)": SV1986,
+    "Twu, et al. (1995)": Twu1995,
+    "Tsai and Chen (1998)": TsaiChen1998,
+    "Ahlers-Gmehling (2001)": AG2001,
+    "Gasem, et al. PR modification (2001)": GasemPRmod2001,
+    "Gasem, et al. Twu modification (2001)": GasemTwuMod2001,
+    "Gasem, et al. (2001)": Gasem2001,
+    "Coquelet, et al. (2004)": Coquelet2004,
+}
+
 
 def createEOSMix(substances: List[SubstanceProp], eostype: str, k=None) -> EOSMixture:
 
@@ -35,71 +58,11 @@ def createEOSMix(substances: List[SubstanceProp], eostype: str, k=None) -> EOSMi
         n = len(substances)
         k = np.zeros((n, n), dtype=np.float64)
 
-    if eostype == "van der Waals (1890)":
-        return vanderWaals1890(substances, k)
-    elif eostype == "Redlich and Kwong (1949)":
-        return RedlichAndKwong1949(substances, k)
-    elif eostype == "Wilson (1964)":
-        return Wilson1964(substances, k)
-    elif eostype == "Soave (1972)":
-        return Soave1972(substances, k)
-    elif eostype == "Peng and Robinson (1976)":
-        return PR1976(substances, k)
-    elif eostype == "Schmidt and Wenzel (1979)":
-        return SW1979(substances, k)
-    elif eostype == "Patel and Teja (1982)":
-        return PT1982(substances, k)
-    elif eostype == "Péneloux, et al. (1982)":
-        return PenelouxEtAl1982(substances, k)
-    elif eostype == "Adachi, et al. (1983)":
-        return Adachi1983(substances, k)
-    elif eostype == "Mathias and Copeman (1983)":
-        return MathiasCopeman1983(substances, k)
-    elif eostype == "Soave (1984)":
-        return Soave1984(substances, k)
-    elif eostype == "Adachi, et al. (1985)":
-        return Adachi1985(substances, k)
-    elif eostype == "Stryjek and Vera (1986)":
-        return SV1986(substances, k)
-    elif eostype == "Twu, et al. (1995)":
-        return Twu1995(substances, k)
-    elif eostype == "Tsai and Chen (1998)":
-        return TsaiChen1998(substances, k)
-    elif eostype == "Ahlers-Gmehling (2001)":
-        return AG2001(substances, k)
-    elif eostype == "Gasem, et al. PR modification (2001)":
-        return GasemPRmod2001(substances, k)
-    elif eostype == "Gasem, et al. Twu modification (2001)":
-        return GasemTwuMod2001(substances, k)
-    elif eostype == "Gasem, et al. (2001)":
-        return Gasem2001(substances, k)
-    elif eostype == "Coquelet, et al. (2004)":
-        return Coquelet2004(substances, k)
-    else:
+    eosclass = _eos_models.get(eostype)
+    if eosclass is None:
         return None
+    return eosclass(substances, k)
 
 
 def getEOSMixOptions():
-    options = [
-        "van der Waals (1890)",
-        "Redlich and Kwong (1949)",
-        "Wilson (1964)",
-        "Soave (1972)",
-        "Peng and Robinson (1976)",
-        "Schmidt and Wenzel (1979)",
-        "Patel and Teja (1982)",
-        "Péneloux, et al. (1982)",
-        "Adachi, et al. (1983)",
-        "Mathias and Copeman (1983)",
-        "Soave (1984)",
-        "Adachi, et al. (1985)",
-        "Stryjek and Vera (1986)",
-        "Twu, et al. (1995)",
-        "Tsai and Chen (1998)",
-        "Ahlers-Gmehling (2001)",
-        "Gasem, et al. PR modification (2001)",
-        "Gasem, et al. Twu modification (2001)",
-        "Gasem, et al. (2001)",
-        "Coquelet, et al. (2004)",
-    ]
-    return options
+    return list(_eos_models.keys())
@@ -10,46 +10,63 @@ from MixtureRules.MixtureRulesInterface import (
 
 class ClassicThetaMixture(ThetaMixtureRuleBehavior):
     def thetam(self, y, T: float, thetaib, substances, k) -> float:
-        s1 = 0.0
-        n = len(y)
-        for i in range(n):
-            s2 = 0.0
-            thetai = thetaib.getThetai(i, T, substances)
-            for j in range(n):
-                thetaj = thetaib.getThetai(j, T, substances)
-                s2 += y[i] * y[j] * np.sqrt(thetai * thetaj) * (1.0 - k[i][j])
-            s1 += s2
-        return s1
+        thetai = thetaib.getThetaiVector(T, substances)
+        return self.thetamFromArrays(y, self.getThetaij(thetai, k))
 
     def diffThetam(
         self, i: int, y, T: float, thetaib: ThetaiBehavior, substances, k
     ) -> float:
-        s = 0.0
-        n = len(y)
-        for j in range(n):
-            if j != i:
-                alphai = np.sqrt(
-                    thetaib.getThetai(i, T, substances)
-                    * thetaib.getThetai(j, T, substances)
-                ) * (1.0 - k[i][j])
-                alphaj = np.sqrt(
-                    thetaib.getThetai(i, T, substances)
-                    * thetaib.getThetai(j, T, substances)
-                ) * (1.0 - k[j][i])
-                s += y[j] * (alphai + alphaj)
-        return s + 2.0 * y[i] * thetaib.getThetai(i, T, substances)
+        thetai = thetaib.getThetaiVector(T, substances)
+        return self.diffThetamFromArrays(y, self.getThetaij(thetai, k))[i]
+
+    def getThetaij(self, thetai: np.ndarray, k) -> np.ndarray:
+        """
+        Returns the matrix sqrt(theta_i * theta_j) * (1 - k_ij).
+        """
+        return np.sqrt(np.outer(thetai, thetai)) * (
+            1.0 - np.asarray(k, dtype=np.float64)
+        )
+
+    def getdThetaijdT(self, thetai: np.ndarray, dthetai: np.ndarray, k) -> np.ndarray:
+        """
+        Returns the temperature derivative of sqrt(theta_i * theta_j) * (1 - k_ij).
+        """
+        sqrt_thetai_thetaj = np.sqrt(np.outer(thetai, thetai))
+        return (
+            (np.outer(dthetai, thetai) + np.outer(thetai, dthetai))
+            / (2.0 * sqrt_thetai_thetaj)
+            * (1.0 - np.asarray(k, dtype=np.float64))
+        )
+
+    def thetamFromArrays(self, y, thetaij: np.ndarray) -> float:
+        # works for a single composition (n,) or a stack of compositions (N, n)
+        y = np.asarray(y, dtype=np.float64)
+        return np.sum(np.dot(y, thetaij) * y, axis=-1)
+
+    def diffThetamFromArrays(self, y, thetaij: np.ndarray) -> np.ndarray:
+        y = np.asarray(y, dtype=np.float64)
+        return np.dot(y, thetaij + thetaij.T)
 
 
 class ClassicBMixture(BMixtureRuleBehavior):
     def bm(self, y, T: float, bib: BiBehavior, substances) -> float:
-        s1 = 0.0
-        for i in range(len(y)):
-            s1 += y[i] * bib.getBi(i, T, substances)
-        return s1
+        return self.bmFromArrays(y, self.getBiVector(T, bib, substances))
 
     def diffBm(self, i: int, y, T: float, bib: BiBehavior, substances) -> float:
         return bib.getBi(i, T, substances)
 
+    def getBiVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        return bib.getBiVector(T, substances)
+
+    def getdBidTVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        return bib.getdBidTVector(T, substances)
+
+    def bmFromArrays(self, y, bi: np.ndarray) -> float:
+        return np.dot(np.asarray(y, dtype=np.float64), bi)
+
+    def diffBmFromArrays(self, y, bi: np.ndarray) -> np.ndarray:
+        return bi
+
 
 class ClassicMixtureRule(MixtureRuleBehavior):
     def __init__(self):
@@ -69,3 +86,27 @@ class ClassicMixtureRule(MixtureRuleBehavior):
         self, i: int, y, T: float, thetaib: ThetaiBehavior, substances, k
     ) -> float:
         return self.thetamBehavior.diffThetam(i, y, T, thetaib, substances, k)
+
+    def getBiVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        return self.bmBehavior.getBiVector(T, bib, substances)
+
+    def getThetaij(self, thetai: np.ndarray, k) -> np.ndarray:
+        return self.thetamBehavior.getThetaij(thetai, k)
+
+    def getdBidTVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        return self.bmBehavior.getdBidTVector(T, bib, substances)
+
+    def getdThetaijdT(self, thetai: np.ndarray, dthetai: np.ndarray, k) -> np.ndarray:
+        return self.thetamBehavior.getdThetaijdT(thetai, dthetai, k)
+
+    def bmFromArrays(self, y, bi: np.ndarray) -> float:
+        return self.bmBehavior.bmFromArrays(y, bi)
+
+    def diffBmFromArrays(self, y, bi: np.ndarray) -> np.ndarray:
+        return self.bmBehavior.diffBmFromArrays(y, bi)
+
+    def thetamFromArrays(self, y, thetaij: np.ndarray) -> float:
+        return self.thetamBehavior.thetamFromArrays(y, thetaij)
+
+    def diffThetamFromArrays(self, y, thetaij: np.ndarray) -> np.ndarray:
+        return self.thetamBehavior.diffThetamFromArrays(y, thetaij)
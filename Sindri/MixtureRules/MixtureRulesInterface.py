@@ -1,5 +1,7 @@
 import abc
 
+import numpy as np
+
 from EOSParametersBehavior.ParametersBehaviorInterface import BiBehavior, ThetaiBehavior
 
 
@@ -25,6 +27,38 @@ class MixtureRuleBehavior:
     ) -> float:
         pass
 
+    @abc.abstractmethod
+    def getBiVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def getdBidTVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def getThetaij(self, thetai: np.ndarray, k) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def getdThetaijdT(self, thetai: np.ndarray, dthetai: np.ndarray, k) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def bmFromArrays(self, y, bi: np.ndarray) -> float:
+        pass
+
+    @abc.abstractmethod
+    def diffBmFromArrays(self, y, bi: np.ndarray) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def thetamFromArrays(self, y, thetaij: np.ndarray) -> float:
+        pass
+
+    @abc.abstractmethod
+    def diffThetamFromArrays(self, y, thetaij: np.ndarray) -> np.ndarray:
+        pass
+
 
 class BMixtureRuleBehavior:
 
@@ -38,6 +72,22 @@ class BMixtureRuleBehavior:
     def diffBm(self, i: int, y, T: float, bib: BiBehavior, substances) -> float:
         pass
 
+    @abc.abstractmethod
+    def getBiVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def getdBidTVector(self, T: float, bib: BiBehavior, substances) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def bmFromArrays(self, y, bi: np.ndarray) -> float:
+        pass
+
+    @abc.abstractmethod
+    def diffBmFromArrays(self, y, bi: np.ndarray) -> np.ndarray:
+        pass
+
 
 class ThetaMixtureRuleBehavior:
 
@@ -53,6 +103,22 @@ class ThetaMixtureRuleBehavior:
     ) -> float:
         pass
 
+    @abc.abstractmethod
+    def getThetaij(self, thetai: np.ndarray, k) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def getdThetaijdT(self, thetai: np.ndarray, dthetai: np.ndarray, k) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def thetamFromArrays(self, y, thetaij: np.ndarray) -> float:
+        pass
+
+    @abc.abstractmethod
+    def diffThetamFromArrays(self, y, thetaij: np.ndarray) -> np.ndarray:
+        pass
+
 
 class DeltaMixtureRuleBehavior:
 
@@ -70,6 +136,36 @@ class DeltaMixtureRuleBehavior:
     ) -> float:
         pass
 
+    def deltamVector(
+        self, Y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        """
+        Returns deltam for each row of the (N, n) composition array Y.
+        """
+        return np.array(
+            [self.deltam(y, T, bib, bmb, substances) for y in Y], dtype=np.float64
+        )
+
+    def diffDeltamVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.array(
+            [
+                self.diffDeltam(i, y, T, bib, bmb, substances)
+                for i in range(len(substances))
+            ],
+            dtype=np.float64,
+        )
+
+    def getdDeltamdT(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> float:
+        h = 1e-5
+        return (
+            self.deltam(y, T + h, bib, bmb, substances)
+            - self.deltam(y, T - h, bib, bmb, substances)
+        ) / (2.0 * h)
+
 
 class EpsilonMixtureRuleBehavior:
 
@@ -86,3 +182,33 @@ class EpsilonMixtureRuleBehavior:
         self, i: int, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
     ) -> float:
         pass
+
+    def epsilonmVector(
+        self, Y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        """
+        Returns epsilonm for each row of the (N, n) composition array Y.
+        """
+        return np.array(
+            [self.epsilonm(y, T, bib, bmb, substances) for y in Y], dtype=np.float64
+        )
+
+    def diffEpsilonmVector(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> np.ndarray:
+        return np.array(
+            [
+                self.diffEpsilonm(i, y, T, bib, bmb, substances)
+                for i in range(len(substances))
+            ],
+            dtype=np.float64,
+        )
+
+    def getdEpsilonmdT(
+        self, y, T: float, bib: BiBehavior, bmb: MixtureRuleBehavior, substances
+    ) -> float:
+        h = 1e-5
+        return (
+            self.epsilonm(y, T + h, bib, bmb, substances)
+            - self.epsilonm(y, T - h, bib, bmb, substances)
+        ) / (2.0 * h)
@@ -1,9 +1,16 @@
+import os
+import re
+from collections import OrderedDict
+
 import numpy as np
 
 # from fortran.UNIFAC import getgamma as _helper_getGamma2
 
 import db
 
+# temperatures whose tau and beta a UNIFAC model keeps
+_TAU_CACHE_SIZE = 8
+
 
 def get_all_id_and_subgroups_formulas():
     query = """select number, subgroup_name
@@ -21,111 +28,155 @@ def get_all_id_and_subgroups_formulas():
 
 
 def has_unifac_in_db(subs_ids):
+    subs_ids = [int(i) for i in np.atleast_1d(subs_ids)]
+    query = """select count(distinct sunifac.substance_id)
+         from substance_unifac_subgroups sunifac inner join unifac_subgroups us on us.number = sunifac.subgroup_id
+         where sunifac.substance_id in ({})""".format(",".join("?" * len(subs_ids)))
+    res = db.cursor.execute(query, subs_ids).fetchone()
+    return res[0] == len(set(subs_ids))
+
+
+_unifac_tables = None
+
+
+def get_unifac_tables():
+    """
+    Returns the subgroup R and Q and main group number, indexed by subgroup
+    number, and the main group interaction parameters a_mk, indexed by main
+    group numbers.
+
+    These tables are only read, so they are loaded once per database file. Every
+    SubstanceProp reopens the connection in db.init, hence the file as the key.
+    """
+    global _unifac_tables
+    database_file = os.path.abspath(db.database_file)
+    if _unifac_tables is not None and _unifac_tables[0] == database_file:
+        return _unifac_tables[1]
+
     cursor = db.cursor
-    n = len(subs_ids)
-    subs_ids = np.atleast_1d(subs_ids)
-    for i in range(n):
-        query = """select distinct us.subgroup_name
-             from substance_unifac_subgroups sunifac inner join unifac_subgroups us on us.number = sunifac.subgroup_id
-             where sunifac.substance_id ={} order by us.number""".format(
-            subs_ids[0]
-        )
-        res = cursor.execute(query).fetchall()
-        if len(res) < 1:
-            return False
-    return True
+    subgroups = cursor.execute("select number, R, Q from unifac_subgroups").fetchall()
+    nsub = max(row[0] for row in subgroups) + 1
+    Rk = np.zeros(nsub, dtype=np.float64)
+    Qk = np.zeros(nsub, dtype=np.float64)
+    for number, R, Q in subgroups:
+        Rk[number], Qk[number] = R, Q
+
+    maingroup = np.zeros(nsub, dtype=np.int64)
+    maingroups = cursor.execute(
+        "select number, subgroups from unifac_maingroups order by number"
+    ).fetchall()
+    for number, members in maingroups:
+        for sub in re.findall(r"\[(\d+)\]", members):
+            if int(sub) < nsub and maingroup[int(sub)] == 0:
+                maingroup[int(sub)] = number
+
+    parameters = cursor.execute(
+        "select i, j, Aij, Aji from unifac_interaction_parameters"
+    ).fetchall()
+    nmain = max(row[0] for row in maingroups) + 1
+    amk = np.zeros((nmain, nmain), dtype=np.float64)
+    for i, j, aij, aji in parameters:
+        amk[i, j] = aij
+        amk[j, i] = aji
+
+    _unifac_tables = (database_file, (Rk, Qk, maingroup, amk))
+    return _unifac_tables[1]
 
 
 class UNIFAC:
     def __init__(self, subs_ids):
 
-        cursor = db.cursor
-        query = """select distinct us.subgroup_name
+        Rk, Qk, maingroup, amk = get_unifac_tables()
+        subs_ids = [int(i) for i in subs_ids]
+        query = """select sunifac.substance_id, sunifac.subgroup_id, sunifac.frequency
          from substance_unifac_subgroups sunifac inner join unifac_subgroups us on us.number = sunifac.subgroup_id
-         where sunifac.substance_id in ({}) order by us.number""".format(
-            ",".join("?" * len(subs_ids))
-        )
-        res = cursor.execute(query, subs_ids).fetchall()
-        groups = []
-        for g in res:
-            groups.append(g[0])
+         where sunifac.substance_id in ({})""".format(",".join("?" * len(subs_ids)))
+        res = db.cursor.execute(query, subs_ids).fetchall()
+        groups = sorted({row[1] for row in res})
+        column = {g: j for j, g in enumerate(groups)}
 
         self.m = len(groups)
         self.n = len(subs_ids)
         self.vk = np.zeros((self.n, self.m), dtype=np.int64)
-        for _i in range(self.n):
-            for _j in range(self.m):
-                query = """select frequency from substance_unifac_subgroups
-                 where substance_id=? and subgroup_id=(select number from unifac_subgroups where subgroup_name=?)"""
-                res = cursor.execute(query, (subs_ids[_i], groups[_j])).fetchone()
-                if res is not None:
-                    self.vk[_i][_j] = res[0]
-
-        self.amk = np.zeros((self.m, self.m), dtype=np.float64)
-        self.k = np.zeros(self.m, dtype=np.int64)
-        self.Rk = np.zeros(self.m, dtype=np.float64)
-        self.Qk = np.zeros(self.m, dtype=np.float64)
-
-        list_groups = ""
-        for i in range(self.m - 1):
-            list_groups += "'" + groups[i] + "', "
-        list_groups += "'" + groups[-1] + "'"
-
-        for i in range(self.m):
-            cursor.execute(
-                "SELECT R,Q from unifac_subgroups where subgroup_name = '{}' order by number".format(
-                    groups[i]
-                )
-            )
-            res = cursor.fetchone()
-            self.Rk[i], self.Qk[i] = res
-            query = "select number from unifac_maingroups where subgroups like '%[' || (select number from unifac_subgroups where subgroup_name = '{}')|| ']%'".format(
-                groups[i]
-            )
-            cursor.execute(query)
-            self.k[i] = cursor.fetchone()[0]
-
-        for _i in range(self.m):
-            for _j in range(self.m):
-                query = "select Aij, Aji from unifac_interaction_parameters where i = {} and j = {} order by i, j"
-                cursor.execute(query.format(self.k[_i], self.k[_j]))
-                res = cursor.fetchone()
-                if res is not None:
-                    self.amk[_i][_j] = res[0]
-                    self.amk[_j][_i] = res[1]
-        # cursor.close()
+        for substance_id, subgroup_id, frequency in res:
+            for _i in range(self.n):
+                if subs_ids[_i] == substance_id:
+                    self.vk[_i][column[subgroup_id]] = frequency
+
+        groups = np.array(groups, dtype=np.int64)
+        self.Rk = Rk[groups]
+        self.Qk = Qk[groups]
+        self.k = maingroup[groups]
+        self.amk = amk[np.ix_(self.k, self.k)]
+
+        self.r, self.q, self.e = _helper_getStructure(
+            self.n, self.m, self.vk, self.Rk, self.Qk
+        )
+        self._tau_cache = OrderedDict()
+
+    def getTauBeta(self, T: float):
+        """
+        tau and beta at T, which do not depend on the composition. The last few
+        temperatures are kept, as the VLE loops call getGamma many times at each.
+        """
+        if T in self._tau_cache:
+            self._tau_cache.move_to_end(T)
+            return self._tau_cache[T]
+        ret = _helper_getTauBeta(T, self.n, self.m, self.amk, self.e)
+        self._tau_cache[T] = ret
+        if len(self._tau_cache) > _TAU_CACHE_SIZE:
+            self._tau_cache.popitem(last=False)
+        return ret
 
     def getGamma(self, x, T: float):
         # return _helper_getGamma2(
         #     x, T,self.amk, self.vk, self.Rk, self.Qk
         # )
         # x = np.atleast_1d(x)
-        return _helper_getGamma(
-            x, T, self.n, self.m, self.amk, self.vk, self.Rk, self.Qk
+        tau, beta = self.getTauBeta(T)
+        return _helper_getGammaFromArrays(
+            x, self.n, self.m, self.r, self.q, self.e, tau, beta
         )
 
+    def getGammaBatch(self, X, T):
+        """
+        Returns the (N, n) array of gamma of the (N, n) array of compositions X.
+
+        T is a scalar or one temperature per row. tau and beta are evaluated once
+        per distinct temperature, and the rows are solved in parallel.
+        """
+        X = np.ascontiguousarray(np.atleast_2d(X), dtype=np.float64)
+        N = X.shape[0]
+        T = np.broadcast_to(np.asarray(T, dtype=np.float64), (N,))
+        Tunique, inverse = np.unique(T, return_inverse=True)
+        taus = np.empty((Tunique.shape[0], self.m, self.m))
+        betas = np.empty((Tunique.shape[0], self.n, self.m))
+        for k, Tk in enumerate(Tunique):
+            taus[k], betas[k] = self.getTauBeta(float(Tk))
+        return _helper_getGamma_batch(
+            X,
+            inverse.astype(np.int64),
+            self.n,
+            self.m,
+            self.r,
+            self.q,
+            self.e,
+            taus,
+            betas,
+        )
 
-from numba import njit
+
+from numba import njit, float64, int64, prange
 
 
 @njit(
-    "float64[:](float64[:], float64, int64, int64, float64[:,:], int64[:,:], float64[:], float64[:])",
+    (int64, int64, int64[:, :], float64[:], float64[:]),
     cache=True,
 )
-def _helper_getGamma(x, T: float, n, m, amk, vk, Rk, Qk):
-
+def _helper_getStructure(n, m, vk, Rk, Qk):
     r = np.zeros(n, dtype=np.float64)
     q = np.zeros(n, dtype=np.float64)
     e = np.zeros((m, n), dtype=np.float64)
-    beta = np.zeros((n, m), dtype=np.float64)
-    theta = np.zeros(m, dtype=np.float64)
-    s = np.zeros(m, dtype=np.float64)
-    L = np.zeros(n, dtype=np.float64)
-    J = np.zeros(n, dtype=np.float64)
-    ln_gamma_C = np.zeros(n, dtype=np.float64)
-    ln_gamma_R = np.zeros(n, dtype=np.float64)
-
-    tau = np.exp(-amk / T)
 
     for i in range(n):
         r[i] = np.sum(vk[i] * Rk)
@@ -136,25 +187,56 @@ def _helper_getGamma(x, T: float, n, m, amk, vk, Rk, Qk):
         for _i in range(n):
             e[_k][_i] = vk[_i][_k] * Qk[_k] / q[_i]
 
+    return r, q, e
+
+
+@njit(
+    (float64, int64, int64, float64[:, :], float64[:, :]),
+    cache=True,
+)
+def _helper_getTauBeta(T, n, m, amk, e):
+    beta = np.zeros((n, m), dtype=np.float64)
+
+    tau = np.exp(-amk / T)
+
     # beta
     for _i in range(n):
         for _k in range(m):
             for _m in range(m):
                 beta[_i][_k] += e[_m][_i] * tau[_m][_k]
 
+    return tau, beta
+
+
+@njit(
+    "float64[:](float64[:], int64, int64, float64[:], float64[:], float64[:,:], float64[:,:], float64[:,:])",
+    cache=True,
+)
+def _helper_getGammaFromArrays(x, n, m, r, q, e, tau, beta):
+    theta = np.zeros(m, dtype=np.float64)
+    s = np.zeros(m, dtype=np.float64)
+    L = np.zeros(n, dtype=np.float64)
+    J = np.zeros(n, dtype=np.float64)
+    ln_gamma_C = np.zeros(n, dtype=np.float64)
+    ln_gamma_R = np.zeros(n, dtype=np.float64)
+
+    sum_xq = np.sum(x * q)
+    sum_rx = np.sum(r * x)
+    sum_qx = np.sum(q * x)
+
     for _k in range(m):
         sup_s = 0.0
         for _i in range(n):
             sup_s += x[_i] * q[_i] * e[_k][_i]
-        theta[_k] = sup_s / np.sum(x * q)
+        theta[_k] = sup_s / sum_xq
 
     for _k in range(m):
         for _m in range(m):
             s[_k] += theta[_m] * tau[_m][_k]
 
     for _i in range(n):
-        J[_i] = r[_i] / np.sum(r * x)
-        L[_i] = q[_i] / np.sum(q * x)
+        J[_i] = r[_i] / sum_rx
+        L[_i] = q[_i] / sum_qx
         ln_gamma_C[_i] = (
             1.0
             - J[_i]
@@ -171,3 +253,28 @@ def _helper_getGamma(x, T: float, n, m, amk, vk, Rk, Qk):
 
     gamma = np.exp(ln_gamma_C + ln_gamma_R)
     return gamma
+
+
+@njit(
+    "float64[:](float64[:], float64, int64, int64, float64[:,:], int64[:,:], float64[:], float64[:])",
+    cache=True,
+)
+def _helper_getGamma(x, T: float, n, m, amk, vk, Rk, Qk):
+    r, q, e = _helper_getStructure(n, m, vk, Rk, Qk)
+    tau, beta = _helper_getTauBeta(T, n, m, amk, e)
+    return _helper_getGammaFromArrays(x, n, m, r, q, e, tau, beta)
+
+
+@njit(
+    (float64[:, :], int64[:], int64, int64, float64[:], float64[:], float64[:, :])
+    + (float64[:, :, :], float64[:, :, :]),
+    parallel=True,
+    cache=True,
+)
+def _helper_getGamma_batch(X, inverse, n, m, r, q, e, taus, betas):
+    gamma = np.empty((X.shape[0], n))
+    for k in prange(X.shape[0]):
+        gamma[k] = _helper_getGammaFromArrays(
+            X[k], n, m, r, q, e, taus[inverse[k]], betas[inverse[k]]
+        )
+    return gamma
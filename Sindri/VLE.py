@@ -412,7 +412,11 @@ class VLE(object):
             xmix[0] = x[i]
             xmix[1] = 1.0 - x[i]
 
-            yres, T[i], pv, pl, k, ite = self.getBubblePointTemperature(xmix, P)
+            try:
+                yres, T[i], pv, pl, k, ite = self.getBubblePointTemperature(xmix, P)
+            except ValueError:
+                T[i], y[i] = np.nan, np.nan
+                continue
             T[i] = conv_unit(T[i], "K", Tunit)
             y[i] = yres[0]
 
@@ -1,7 +1,7 @@
 import numpy as np
 
 from constants import R_IG
-from polyEqSolver import solve_cubic
+from polyEqSolver import solve_cubic, cubic_real_roots
 
 
 class InterfaceEosVLE(object):
@@ -70,7 +70,7 @@ class VLE_PR1976(InterfaceEosVLE):
         _c = A - 3 * B * B - 2.0 * B
         _d = -(A * B - B * B - B ** 3)
 
-        roots = np.asarray(solve_cubic(_a, _b, _c, _d))
+        roots = cubic_real_roots(_a, _b, _c, _d)
         real_values = roots[roots > 0]
         return real_values
 
@@ -156,7 +156,7 @@ class VLE_Peneloux1982(InterfaceEosVLE):
         c = _thetal + _epsilonl - _deltal * (_Bl + 1)
         d = -(_epsilonl * (_Bl + 1) + _thetal * _Bl)
 
-        roots = np.asarray(solve_cubic(a, b, c, d))
+        roots = cubic_real_roots(a, b, c, d)
         real_values = roots[roots > 0]
         return real_values
 
@@ -217,7 +217,7 @@ class VLE_VanDerWalls(InterfaceEosVLE):
         _a1 = _thetal + _epsilonl - _deltal * (_Bl + 1)
         _a2 = -(_epsilonl * (_Bl + 1) + _thetal * _Bl)
 
-        roots = np.asarray(solve_cubic(1.0, _a0, _a1, _a2))
+        roots = cubic_real_roots(1.0, _a0, _a1, _a2)
         real_values = roots[roots > 0]
         return real_values
 
@@ -271,7 +271,7 @@ class VLE_RK1949(InterfaceEosVLE):
         c = _thetal + _epsilonl - _deltal * (_Bl + 1)
         d = -(_epsilonl * (_Bl + 1) + _thetal * _Bl)
 
-        roots = np.asarray(solve_cubic(a, b, c, d))
+        roots = cubic_real_roots(a, b, c, d)
         real_values = roots[roots > 0]
         return real_values
 
@@ -329,7 +329,7 @@ class VLE_Soave1972(InterfaceEosVLE):
         c = A - B * (1 + B)
         d = -A * B
 
-        roots = np.asarray(solve_cubic(a, b, c, d))
+        roots = cubic_real_roots(a, b, c, d)
         real_values = roots[roots > 0]
         return real_values
 
@@ -421,7 +421,7 @@ class VLE_PatelTeja1982(InterfaceEosVLE):
         c = _thetal + _epsilonl - _deltal * (_Bl + 1)
         d = -(_epsilonl * (_Bl + 1) + _thetal * _Bl)
 
-        roots = np.asarray(solve_cubic(a, b, c, d))
+        roots = cubic_real_roots(a, b, c, d)
         real_values = roots[roots > 0]
         return real_values
 
@@ -724,7 +724,7 @@ class VLE_Tsai1998(InterfaceEosVLE):
         _a1 = _thetal + _epsilonl - _deltal * (_Bl + 1)
         _a2 = -(_epsilonl * (_Bl + 1) + _thetal * _Bl)
 
-        roots = np.asarray(solve_cubic(1, _a0, _a1, _a2))
+        roots = cubic_real_roots(1.0, _a0, _a1, _a2)
         real_values = roots[roots > 0]
         return real_values
 
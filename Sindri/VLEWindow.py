@@ -157,7 +157,13 @@ class Window_VLE(QtWidgets.QWidget, Ui_FormVLE):
                 self.tableWidget_Results.setItem(i, 5, sk)
 
         elif self.calctype == "bubbleT":
-            y, t, pv, pl, k, ite = self.VLEeq.getBubblePointTemperature(z, p)
+            try:
+                y, t, pv, pl, k, ite = self.VLEeq.getBubblePointTemperature(z, p)
+            except ValueError as e:
+                title = "Error calculating bubble-point temperature"
+                msg = str(e)
+                QtWidgets.QMessageBox.about(self, title, msg)
+                return -1
             t = conv_unit(t, "K", self.comboBox_Tunit.currentText())
             self.le_scalarAnswer.setText("{:.5e}".format(t))
             # col_headers = ["Name", "Formula", "y", "Phivap", "Philiq", "K"]
@@ -172,7 +178,13 @@ class Window_VLE(QtWidgets.QWidget, Ui_FormVLE):
                 self.tableWidget_Results.setItem(i, 5, sk)
 
         elif self.calctype == "dewT":
-            x, t, pv, pl, k, ite = self.VLEeq.getDewPointTemperature(z, p)
+            try:
+                x, t, pv, pl, k, ite = self.VLEeq.getDewPointTemperature(z, p)
+            except ValueError as e:
+                title = "Error calculating dew-point temperature"
+                msg = str(e)
+                QtWidgets.QMessageBox.about(self, title, msg)
+                return -1
             t = conv_unit(t, "K", self.comboBox_Tunit.currentText())
             self.le_scalarAnswer.setText("{:.5e}".format(t))
             # col_headers = ["Name", "Formula", "y", "Phivap", "Philiq", "K"]
@@ -222,6 +222,17 @@ class SubstanceProp(object):
             return _leeKeslerVP_helper(self.Pc, T / self.Tc, self.omega)
         return 0.0
 
+    def getTsatLK(self, P: float) -> float:
+
+        if P >= self.Pc:
+            raise ValueError(
+                "Pressure is above critical pressure in Lee-Kesler Tsat equation"
+            )
+
+        if self.Pc != 0 and self.Tc != 0:
+            return _leeKeslerTsat_helper(self.Pc, P, self.omega) * self.Tc
+        return 0.0
+
     # will this function work for mixtures? (applying the necessaries
     def getFluidState(self, P: float, T: float, eq, delta=1e-2):
 
@@ -540,3 +551,37 @@ def _leeKeslerVP_helper(Pc, Tr, omega):
     Pvpr = np.exp(f0 + omega * f1)
     Pvp = Pvpr * Pc
     return Pvp
+
+
+@njit(float64(float64, float64, float64), cache=True)
+def _leeKeslerTsat_helper(Pc, P, omega):
+    """ Inverse of the Lee-Kesler correlation for the vapor pressure.
+
+    Parameters
+    ----------
+    Pc : float
+        Critical pressure, in Pascal.
+    P : float
+        Vapor pressure, in Pascal.
+    omega : float
+        Acentric factor, adimensinoal.
+
+    Returns
+    -------
+    Tr : float
+        The estimated reduced saturation temperature at P. Newton's method from
+        the Wilson (Edmister) estimate, ln(Pr) = 5.373 (1 + omega) (1 - 1 / Tr).
+
+    """
+    lnPr = np.log(P / Pc)
+    Tr = 1.0 / (1.0 - lnPr / (5.373 * (1.0 + omega)))
+    for _ in range(50):
+        f0 = 5.92714 - 6.09648 / Tr - 1.28862 * np.log(Tr) + 0.169347 * Tr ** 6
+        f1 = 15.2518 - 15.6878 / Tr - 13.4721 * np.log(Tr) + 0.43677 * Tr ** 6
+        df0 = 6.09648 / Tr ** 2 - 1.28862 / Tr + 6.0 * 0.169347 * Tr ** 5
+        df1 = 15.6878 / Tr ** 2 - 13.4721 / Tr + 6.0 * 0.43677 * Tr ** 5
+        dTr = (lnPr - f0 - omega * f1) / (df0 + omega * df1)
+        Tr += dTr
+        if abs(dTr) < 1e-12 * Tr:
+            break
+    return Tr
@@ -1,4 +1,5 @@
-from numba import jit, float64
+import numpy as np
+from numba import jit, njit, prange, float64
 
 from constants import DBL_EPSILON
 
@@ -93,6 +94,146 @@ def solve_cubic(a, b, c, d, x0=1.0):
     return ret
 
 
+@njit((float64, float64, float64, float64, float64), cache=True)
+def _polish_cubic_root(a, b, c, d, x):
+    # two Newton steps to remove the round-off of the closed-form expressions
+    for k in range(2):
+        f = ((a * x + b) * x + c) * x + d
+        df = (3.0 * a * x + 2.0 * b) * x + c
+        if df == 0.0:
+            break
+        x = x - f / df
+    return x
+
+
+@njit((float64, float64, float64, float64), cache=True)
+def solve_cubic_roots(a, b, c, d):
+    """
+    Solves the real roots of a cubic equation in closed form.
+
+    Solves the real roots of the equation
+        a*x^3 + b*x^2 + c*x + d = 0
+    with the trigonometric (three roots) or Cardano (one root) formulas, followed by
+    two Newton steps on each root. Nothing is allocated, so it can be called from
+    compiled hot paths.
+
+    Parameters
+    ----------
+    a : float
+    b : float
+    c : float
+    d : float
+
+    Returns
+    -------
+    nroots : int
+        number of real roots found (0 to 3).
+    r0, r1, r2 : float
+        the real roots in ascending order. Unused positions are nan.
+
+    """
+    nan = np.nan
+
+    if abs(a) < DBL_EPSILON:
+        if abs(b) < DBL_EPSILON:  # linear
+            if abs(c) < DBL_EPSILON:
+                return 0, nan, nan, nan
+            return 1, -d / c, nan, nan
+        delta = c * c - 4.0 * b * d  # quadratic
+        if abs(delta) < DBL_EPSILON:
+            x1 = -c / (2.0 * b)
+            return 2, x1, x1, nan
+        elif delta > 0.0:
+            # avoids the cancellation of -c +- sqrt(delta)
+            qq = -0.5 * (c + np.copysign(np.sqrt(delta), c))
+            x1 = qq / b
+            x2 = d / qq if qq != 0.0 else -c / b - x1
+            return 2, min(x1, x2), max(x1, x2), nan
+        return 0, nan, nan, nan
+
+    B = b / a
+    C = c / a
+    D = d / a
+    shift = B / 3.0
+    # depressed cubic t^3 + p*t + q = 0, with x = t - B/3
+    p = C - B * shift
+    q = (2.0 * shift * shift - C) * shift + D
+    disc = 0.25 * q * q + p * p * p / 27.0
+
+    if disc > 0.0:
+        # one real root
+        A = -np.copysign(np.cbrt(0.5 * abs(q) + np.sqrt(disc)), q)
+        t = A - p / (3.0 * A) if A != 0.0 else 0.0
+        x = _polish_cubic_root(a, b, c, d, t - shift)
+        return 1, x, nan, nan
+
+    if p == 0.0:
+        # triple root
+        return 3, -shift, -shift, -shift
+
+    # three real roots
+    r = np.sqrt(-p / 3.0)
+    arg = 1.5 * q / (p * r)
+    if arg > 1.0:
+        arg = 1.0
+    elif arg < -1.0:
+        arg = -1.0
+    phi = np.arccos(arg) / 3.0
+    t0 = 2.0 * r * np.cos(phi + 2.0 * np.pi / 3.0)
+    t1 = 2.0 * r * np.cos(phi - 2.0 * np.pi / 3.0)
+    t2 = 2.0 * r * np.cos(phi)
+    x0 = _polish_cubic_root(a, b, c, d, t0 - shift)
+    x1 = _polish_cubic_root(a, b, c, d, t1 - shift)
+    x2 = _polish_cubic_root(a, b, c, d, t2 - shift)
+    if x0 > x1:
+        x0, x1 = x1, x0
+    if x1 > x2:
+        x1, x2 = x2, x1
+    if x0 > x1:
+        x0, x1 = x1, x0
+    return 3, x0, x1, x2
+
+
+@njit((float64, float64, float64, float64), cache=True)
+def cubic_real_roots(a, b, c, d):
+    """
+    Returns an array with the real roots of a*x^3 + b*x^2 + c*x + d = 0, in ascending
+    order.
+    """
+    nroots, r0, r1, r2 = solve_cubic_roots(a, b, c, d)
+    return np.array([r0, r1, r2])[:nroots]
+
+
+@njit((float64[:], float64[:], float64[:], float64[:]), parallel=True, cache=True)
+def solve_cubic_batch(a, b, c, d):
+    """
+    Solves many cubic equations at once.
+
+    Parameters
+    ----------
+    a, b, c, d : array of floats
+        coefficients of each equation a[k]*x^3 + b[k]*x^2 + c[k]*x + d[k] = 0.
+
+    Returns
+    -------
+    nroots : array of ints
+        number of real roots of each equation.
+    roots : array of floats, shape (n, 3)
+        the real roots of each equation in ascending order, padded with nan.
+
+    """
+    n = a.shape[0]
+    nroots = np.empty(n, dtype=np.int64)
+    roots = np.empty((n, 3), dtype=np.float64)
+    for k in prange(n):
+        nr, r0, r1, r2 = solve_cubic_roots(a[k], b[k], c[k], d[k])
+        nroots[k] = nr
+        roots[k, 0] = r0
+        roots[k, 1] = r1
+        roots[k, 2] = r2
+    return nroots, roots
+
+
 # @jit((float64, float64, float64, float64), nopython=True, cache=True)
 # def solve_cubic(a, b, c, d):
 #     if
@@ -0,0 +1,18 @@
+import pytest
+
+from Sindri.Factories.EOSMixFactory import createEOSMix
+
+
+@pytest.fixture
+def without_kernel():
+    """
+    createEOSMix for a model that always takes the behavior path, as the
+    reference for its compiled kernel.
+    """
+
+    def _create(substances, eosname, k=None):
+        eos = createEOSMix(substances, eosname, k)
+        eos.getKernel = lambda: (None, None)
+        return eos
+
+    return _create
@@ -42,3 +42,14 @@ def test_EOSPuresubstancesInterface_PR1976():
     pvp_old = eos_old.getPvp(t, pvp_aw)[0]
     pvp_PSI = eos_PSI.getPvp(t, pvp_aw)[0]
     np.testing.assert_allclose(pvp_PSI, pvp_old, 1e-5)
+
+
+def test_tsat_inverts_pvp():
+    for eosname in ["Peng and Robinson (1976)", "van der Waals (1890)"]:
+        for subs in [methane, water, hexane]:
+            eos_PSI = EOSPureSubstanceInterface([subs], eosname)
+            for p in [1e5, 0.9 * subs.Pc]:
+                t, it = eos_PSI.getTsat(p)
+                assert it < 20
+                pvp = eos_PSI.getPvp(t, p)[0]
+                np.testing.assert_allclose(pvp, p, 1e-10)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from Sindri.Factories.EOSMixFactory import createEOSMix as VLE
 
 from Sindri.compounds import SubstanceProp
@@ -8,6 +10,7 @@ water = SubstanceProp("water", "H2O")
 heptane = SubstanceProp("heptane", "C7H16")
 pentane = SubstanceProp("pentane", "C5H12")
 hexane = SubstanceProp("hexane", "C6H14")
+propane = SubstanceProp("propane", "C3H8")
 
 
 def test_isobaricPlot():
@@ -28,3 +31,55 @@ def test_isothermalPlot():
     t = 298.7
 
     # eq.isothermalBinaryMixturePlot(t, Tunit="ºC", Punit="bar")
+
+
+def test_gendata_continuation_matches_cold_starts():
+    for eosname in ("Peng and Robinson (1976)", "Twu, et al. (1995)"):
+        eq = VLE([pentane, hexane], eosname)
+        t = 330.0
+        p = 1e5
+        x = np.linspace(0.0, 1.0, 11)
+        xs, y, P, phiv, phil, kvec, failed = eq.isothermalBinaryMixtureGenData(
+            t, x, return_failed=True
+        )
+        assert not np.any(failed)
+        xs, y, T, phiv, phil, kvec, failed = eq.isobaricBinaryMixtureGenData(
+            p, x, return_failed=True
+        )
+        assert not np.any(failed)
+        for i, xi in enumerate(x):
+            xmix = np.array([xi, 1.0 - xi])
+            ret = eq.getBubblePointPressure(xmix, t, tol=1e-5, kmax=100)
+            np.testing.assert_allclose(P[i], ret[1], 1e-5)
+            ret = eq.getBubblePointTemperature(xmix, p)
+            np.testing.assert_allclose(T[i], ret[1], 1e-6)
+
+
+def test_gendata_reports_points_above_the_critical():
+    # methane is supercritical at 250 K, so there is no bubble point near x1 = 1
+    eq = VLE([methane, propane], "Peng and Robinson (1976)")
+    x, y, P, phiv, phil, kvec, failed = eq.isothermalBinaryMixtureGenData(
+        250.0, return_failed=True
+    )
+    assert failed[-1] and not np.any(failed[: len(x) // 2])
+    assert np.all(np.isnan(P[failed]))
+    assert np.all(np.isfinite(P[~failed]))
+    assert np.all(np.diff(P[: len(x) // 2]) > 0.0)
+
+
+def test_adaptive_gendata_within_tolerance():
+    eq = VLE([propane, pentane], "Peng and Robinson (1976)")
+    t = 300.0
+    x, y, P, phiv, phil, kvec, failed = eq.isothermalBinaryMixtureGenData(
+        t, adaptive=True, rtol=1e-3, max_points=61, return_failed=True
+    )
+    assert not np.any(failed)
+    assert len(x) <= 61
+    assert x[0] == 0.0 and x[-1] == 1.0
+    # points gather where y(x) bends, next to pure pentane
+    assert np.sum(x < 0.25) > np.sum(x > 0.75)
+
+    xd = np.linspace(0.0, 1.0, 201)
+    xd, yd, Pd, phiv, phil, kvec = eq.isothermalBinaryMixtureGenData(t, xd)
+    np.testing.assert_allclose(np.interp(xd, x, P), Pd, 3e-3)
+    np.testing.assert_allclose(np.interp(xd, x, y), yd, atol=3e-3)
@@ -1,8 +1,10 @@
 import numpy as np
+import pytest
 
 # from Sindri.VLE import *
 from Sindri.Factories.EOSMixFactory import createEOSMix as VLE
 from Sindri.compounds import SubstanceProp
+from Sindri.constants import R_IG
 
 methane = SubstanceProp("methane", "CH4")
 ethane = SubstanceProp("ethane", "C2H4")
@@ -13,6 +15,8 @@ hexane = SubstanceProp("hexane", "C6H14")
 benzene = SubstanceProp("benzene", "C6H6")
 isobutanol = SubstanceProp("2-methyl-1-propanol (isobutanol)", "C4H10O")
 cyclopentane = SubstanceProp("cyclopentane", "C5H10")
+propane = SubstanceProp("propane", "C3H8")
+ethanol = SubstanceProp("ethanol", "C2H6O")
 
 eosname = "Peng and Robinson (1976)"
 k2 = [[0, 0], [0, 0]]
@@ -169,3 +173,329 @@ def test_flash_temperature_validate_from_youtube():
     t = 315
     p = 42803.8018747439
     ret = eq.getFlash(z, p, t)
+
+
+def test_accelerated_saturation_pressures_match_plain_iteration():
+    z = np.array([0.5, 0.5])
+    t = 270.0
+    for name in ("Peng and Robinson (1976)", "Soave (1984)"):
+        eq = VLE([methane, propane], name)
+        for method in (eq.getBubblePointPressure, eq.getDewPointPressure):
+            plain = method(z, t)
+            accelerated = method(z, t, accelerate=True)
+            np.testing.assert_allclose(accelerated[1], plain[1], 1e-9)
+            np.testing.assert_allclose(accelerated[0], plain[0], 1e-8)
+            assert accelerated[-1] < plain[-1]
+
+
+def test_stability_analysis_agrees_with_saturation_pressures():
+    eq = VLE([pentane, hexane, heptane], eosname)
+    z = np.array([0.5, 0.3, 0.2])
+    t = 315.0
+    pd = eq.getDewPointPressure(z, t)[1]
+    pb = eq.getBubblePointPressure(z, t)[1]
+    for p in (0.9 * pd, 0.999 * pd, 1.1 * pb, 1.001 * pb):
+        stable, k = eq.getStabilityAnalysis(z, p, t)
+        assert stable and k is None
+    for p in (1.001 * pd, 0.5 * (pd + pb), 0.999 * pb):
+        stable, k = eq.getStabilityAnalysis(z, p, t)
+        assert not stable
+        x, y, v, pv, pl, k, ite = eq.getFlash(z, p, t)
+        assert 0.0 < v < 1.0
+        np.testing.assert_allclose(np.sum(x), 1.0, 1e-8)
+        np.testing.assert_allclose(np.sum(y), 1.0, 1e-8)
+
+
+def test_negative_flash_and_batch_rachford_rice():
+    eq = VLE([pentane, hexane, heptane], eosname)
+    z = np.array([0.5, 0.3, 0.2])
+    t = 315.0
+    p = 42803.8018747439
+    x, y, v, pv, pl, k, ite = eq.getFlash(z, p, t)
+    xn, yn, vn, pvn, pln, kn, iten = eq.getFlash(z, p, t, negative_flash=True)
+    np.testing.assert_allclose(vn, v, 1e-6)
+    np.testing.assert_allclose(kn, k, 1e-6)
+
+    # subcooled and superheated feeds give a vapor fraction outside [0, 1]
+    pb = eq.getBubblePointPressure(z, t)[1]
+    pd = eq.getDewPointPressure(z, t)[1]
+    assert eq.getFlash(z, 1.5 * pb, t, negative_flash=True)[2] < 0.0
+    assert eq.getFlash(z, 0.7 * pd, t, negative_flash=True)[2] > 1.0
+
+    K = np.array([[2.0, 0.5, 0.1], [3.0, 0.8, 0.4], [1.5, 1.2, 0.3]])
+    Z = np.array([[0.3, 0.3, 0.4], [0.2, 0.5, 0.3], [0.4, 0.4, 0.2]])
+    for negative in (False, True):
+        vs = eq.getRachfordRiceBatch(K, Z, negative_flash=negative)
+        for Ki, Zi, vi in zip(K, Z, vs):
+            if negative or 0.0 < vi < 1.0:
+                rr = np.sum(Zi * (Ki - 1.0) / (1.0 + vi * (Ki - 1.0)))
+                np.testing.assert_allclose(rr, 0.0, atol=1e-10)
+    # the first row has no root in [0, 1] and is a liquid
+    np.testing.assert_allclose(eq.getRachfordRiceBatch(K, Z)[0], 0.0)
+
+
+def test_phase_envelope_agrees_with_saturation_pressures():
+    eq = VLE([methane, propane, pentane, hexane], eosname)
+    z = np.array([0.5, 0.25, 0.15, 0.1])
+    T, P, K, bubble, critical, cricondenbar, cricondentherm = eq.getPhaseEnvelope(z)
+    assert bubble[0] and not bubble[-1]
+    # one bubble branch, then one dew branch
+    assert np.sum(np.diff(bubble.astype(int)) != 0) == 1
+    for i in range(0, len(T), 10):
+        if abs(T[i] - critical[0]) < 30.0:
+            continue
+        if bubble[i]:
+            p = eq.getBubblePointPressure(z, T[i])[1]
+        else:
+            p = eq.getDewPointPressure(z, T[i])[1]
+        np.testing.assert_allclose(P[i], p, 1e-7)
+
+    i = np.argmax(~bubble)
+    assert T[i - 1] < critical[0] < T[i]
+    assert cricondenbar[1] >= np.max(P) and cricondentherm[0] >= np.max(T)
+    np.testing.assert_allclose(cricondenbar[1], np.max(P), 1e-3)
+    np.testing.assert_allclose(cricondentherm[0], np.max(T), 1e-3)
+
+
+def test_critical_point_agrees_with_phase_envelope():
+    eq = VLE([methane, propane, pentane, hexane], eosname)
+    z = np.array([0.5, 0.25, 0.15, 0.1])
+    critical = eq.getPhaseEnvelope(z)[4]
+    Tc, Pc, Vc, ite = eq.getCriticalPoint(z)
+    np.testing.assert_allclose([Tc, Pc], critical, 1e-5)
+    np.testing.assert_allclose(eq.getPfromTV(Tc, Vc, z), Pc, 1e-8)
+
+    eq = VLE([propane, pentane], eosname)
+    Tc, Pc, Vc, ite = eq.getCriticalPoint([1.0 - 1e-9, 1e-9])
+    np.testing.assert_allclose([Tc, Pc], [propane.Tc, propane.Pc], 1e-3)
+
+    Z = np.array([[x, 1.0 - x] for x in np.linspace(0.05, 0.95, 7)])
+    Tcs, Pcs, Vcs, ites = eq.getCriticalPointsBatch(Z)
+    for i in range(len(Z)):
+        np.testing.assert_allclose(
+            [Tcs[i], Pcs[i], Vcs[i]], eq.getCriticalPoint(Z[i])[:3], 1e-12
+        )
+    # the critical locus goes from pentane to propane
+    assert np.all(np.diff(Tcs) < 0)
+
+
+def test_critical_point_without_a_kernel(without_kernel):
+    z = np.array([0.5, 0.25, 0.15, 0.1])
+    expected = VLE([methane, propane, pentane, hexane], eosname).getCriticalPoint(z)[:3]
+    eq = without_kernel([methane, propane, pentane, hexane], eosname)
+    np.testing.assert_allclose(eq.getCriticalPoint(z)[:3], expected, 1e-7)
+    Tcs, Pcs, Vcs, ites = eq.getCriticalPointsBatch([z])
+    np.testing.assert_allclose([Tcs[0], Pcs[0], Vcs[0]], expected, 1e-7)
+
+    eq = VLE([methane, propane, pentane, hexane], "Schmidt and Wenzel (1979)")
+    assert eq.getKernel()[0] is None
+    Tc, Pc, Vc, ite = eq.getCriticalPoint(z)
+    np.testing.assert_allclose(eq.getPfromTV(Tc, Vc, z), Pc, 1e-8)
+
+
+def test_multiphase_flash_vapor_and_two_liquids():
+    P, T = 10e5, 300.0
+    z = np.array([0.3, 0.4, 0.3])
+    eq = VLE([methane, water, hexane], eosname)
+    beta, X, Zs, ite = eq.getMultiphaseFlash(z, P, T)
+    assert len(beta) == 3 and np.all(beta > 0)
+    # vapor, hexane-rich liquid, water-rich liquid
+    assert np.argmax(X[0]) == 0 and np.argmax(X[1]) == 2 and np.argmax(X[2]) == 1
+    np.testing.assert_allclose(np.dot(beta, X), z, atol=1e-12)
+    lnf = [np.log(X[k]) + eq.getLnPhiVector(X[k], P, T, Zs[k]) for k in range(3)]
+    np.testing.assert_allclose(lnf[1], lnf[0], atol=1e-8)
+    np.testing.assert_allclose(lnf[2], lnf[0], atol=1e-8)
+
+    Z = np.array([z, [0.1, 0.45, 0.45], [0.4, 0.0001, 0.5999]])
+    beta, X, Zs, nph, ites = eq.getMultiphaseFlashBatch(Z, P, T)
+    np.testing.assert_array_equal(nph, [3, 3, 2])
+    for i in range(len(Z)):
+        b, x, zs, _ = eq.getMultiphaseFlash(Z[i], P, T)
+        np.testing.assert_allclose(beta[i, : nph[i]], b, 1e-12)
+        np.testing.assert_allclose(X[i, : nph[i]], x, 1e-12)
+    assert beta[2, 2] == 0.0 and np.all(np.isnan(X[2, 2]))
+
+
+def test_multiphase_flash_agrees_with_two_phase_flash():
+    eq = VLE([propane, pentane], eosname)
+    z = np.array([0.5, 0.5])
+    beta, X, Zs, ite = eq.getMultiphaseFlash(z, 5e5, 320.0)
+    x, y, v = eq.getFlash(z, 5e5, 320.0)[:3]
+    np.testing.assert_allclose(beta[0], v, 1e-8)
+    np.testing.assert_allclose(X, [y, x], 1e-8)
+    # a compressed liquid is a single phase
+    beta, X, Zs, ite = eq.getMultiphaseFlash(z, 50e5, 320.0)
+    np.testing.assert_allclose(beta, [1.0])
+
+
+def test_ph_and_ps_flash_recover_the_temperature():
+    eq = VLE([methane, water, hexane], eosname)
+    z = np.array([0.3, 0.4, 0.3])
+    P = 10e5
+    for T in [300.0, 350.0, 500.0]:
+        H, S = eq.getPhaseSumProps(z, P, T)
+        T_ph, beta, X, Zs, ite = eq.getFlashPH(z, P, H)
+        np.testing.assert_allclose(T_ph, T, 1e-8)
+        np.testing.assert_allclose(beta, eq.getMultiphaseFlash(z, P, T)[0], 1e-6)
+        np.testing.assert_allclose(eq.getFlashPS(z, P, S)[0], T, 1e-8)
+
+    # dH/dT of the system at equilibrium, across the three-phase region
+    beta, X, Zs, ite = eq.getMultiphaseFlash(z, P, 350.0)
+    dHdT = eq._getPhaseSumProps(P, 350.0, beta, X, Zs, 298.15, 1e5)[2]
+    h = 1e-3
+    Hp = eq.getPhaseSumProps(z, P, 350.0 + h)[0]
+    Hm = eq.getPhaseSumProps(z, P, 350.0 - h)[0]
+    np.testing.assert_allclose(dHdT, (Hp - Hm) / (2.0 * h), 1e-6)
+
+
+def test_residual_props_agree_with_departure_functions():
+    for name in [eosname, "Stryjek and Vera (1986)"]:
+        eq = VLE([propane, pentane], name)
+        y = np.array([0.3, 0.7])
+        P, T = 5e5, 330.0
+        for Z in eq.getZliqZvap(P, T, y):
+            HR, SR, CpR = eq.getResidualProps(y, P, T, Z)
+            dep = eq.getDepartureProps(y, P, T, Z * R_IG * T / P, Z)
+            np.testing.assert_allclose([HR, SR], [-dep.H, -dep.S], 1e-9)
+        h = 1e-3
+        Zp = eq.getZliqZvap(P, T + h, y)[0]
+        Zm = eq.getZliqZvap(P, T - h, y)[0]
+        dHR = (
+            eq.getResidualProps(y, P, T + h, Zp)[0]
+            - eq.getResidualProps(y, P, T - h, Zm)[0]
+        ) / (2.0 * h)
+        Z = eq.getZliqZvap(P, T, y)[0]
+        np.testing.assert_allclose(eq.getResidualProps(y, P, T, Z)[2], dHR, 1e-6)
+
+
+def test_saturation_temperatures_agree_with_saturation_pressures():
+    # a wide boiling mixture, whose dew point the secant method used to miss
+    eq = VLE([methane, propane, hexane], eosname)
+    z = np.array([0.1, 0.3, 0.6])
+    for P in [2e5, 20e5]:
+        y, T, phivap, philiq, k, ite = eq.getBubblePointTemperature(z, P)
+        assert ite < 10
+        np.testing.assert_allclose(eq.getBubblePointPressure(z, T)[1], P, 1e-8)
+        x, T, phivap, philiq, k, ite = eq.getDewPointTemperature(z, P)
+        assert ite < 10
+        np.testing.assert_allclose(eq.getDewPointPressure(z, T)[1], P, 1e-8)
+
+
+def test_saturation_temperatures_raise_without_convergence():
+    z = np.array([0.1, 0.3, 0.6])
+    for name in [eosname, "Stryjek and Vera (1986)"]:
+        eq = VLE([methane, propane, hexane], name)
+        with pytest.raises(ValueError):
+            eq.getBubblePointTemperature(z, 2e5, kmax=1)
+        with pytest.raises(ValueError):
+            eq.getDewPointTemperature(z, 2e5, kmax=1)
+
+
+def test_saturation_temperature_step_with_singular_jacobian():
+    from Sindri.EOSMixture import _helper_saturation_T_step
+
+    # the composition block vanishes, as on the trivial branch
+    F = np.array([0.1, -0.2, 0.05])
+    J = np.array([[0.0, 0.0, 2.0], [0.0, 0.0, -1.0], [0.4, 0.6, 0.0]])
+    dX = _helper_saturation_T_step(F, J)
+    np.testing.assert_allclose(dX[:2] + J[:2, 2] * dX[2], -F[:2], 1e-12)
+    np.testing.assert_allclose(np.dot(J[2, :2], dX[:2]), -F[2], 1e-12)
+
+
+def test_cached_eos_vapor_pressures_match_pure_substance():
+    from Sindri.EOSPureSubstanceInterface import EOSPureSubstanceInterface
+
+    eq = VLE([ethanol, water], eosname)
+    pure = EOSPureSubstanceInterface([ethanol], eosname)
+    for T in [420.0, 421.0, 420.0, 430.0]:
+        P = pure.getPvp(T, ethanol.getPvpAW(T))[0]
+        np.testing.assert_allclose(eq._getPSatEOS_i(0, T), P, 1e-12)
+    assert list(eq._psat_cache[0]) == [421.0, 420.0, 430.0]
+    assert eq._getPureSystem(0) is eq._getPureSystem(0)
+
+
+def test_unifac_bubble_temperature_above_a_critical_pressure():
+    # heptane without Antoine data takes its Tsat from the equation of state,
+    # which has none above its critical pressure of 27.4 bar
+    eos_heptane = SubstanceProp("heptane", "C7H16")
+    eos_heptane.Ant_A = eos_heptane.Ant_B = eos_heptane.Ant_C = 0.0
+    eq = VLE([ethanol, eos_heptane], eosname)
+    eq.setVLEmethod("UNIFAC")
+    assert eq.vle_method == "UNIFAC"
+    assert eq.getTSat_i(1, 30e5) == eos_heptane.Tc
+    x = np.array([0.9, 0.1])
+    for P in [1e5, 20e5, 30e5]:
+        y, T, phivap, gamma, k, ite = eq.getBubblePointTemperature(x, P)
+        assert ite < 100
+        np.testing.assert_allclose(np.sum(x * k), 1.0, 1e-10)
+
+
+def test_eos_saturation_temperature_without_acentric_factor():
+    from Sindri.EOSPureSubstanceInterface import EOSPureSubstanceInterface
+
+    eos_methane = SubstanceProp("methane", "CH4")
+    eos_methane.Ant_A = eos_methane.Ant_B = eos_methane.Ant_C = 0.0
+    eos_methane.omega = 0.0
+    assert eos_methane.getTsatLK(10e5) > 0.0
+    eq = VLE([eos_methane, propane], eosname)
+    pure = EOSPureSubstanceInterface([eos_methane], eosname)
+    T = eq.getTSat_i(0, 10e5)
+    np.testing.assert_allclose(T, pure.getTsat(10e5, T)[0], 1e-8)
+
+    eos_methane.Tc = 0.0
+    with pytest.raises(ValueError):
+        eq.getTSat_i(0, 20e5)
+
+
+def test_unifac_cached_temperature_arrays_match_helper():
+    from Sindri.Models.LiquidModel import _helper_getGamma
+
+    u = VLE([ethanol, water], eosname).unifac_model
+    for T in [300.0, 350.0, 300.0]:
+        for x1 in [0.1, 0.5, 0.9]:
+            x = np.array([x1, 1.0 - x1])
+            expected = _helper_getGamma(x, T, u.n, u.m, u.amk, u.vk, u.Rk, u.Qk)
+            assert np.array_equal(u.getGamma(x, T), expected)
+    assert list(u._tau_cache) == [350.0, 300.0]
+
+
+def test_unifac_batch_matches_helper():
+    from Sindri.Models.LiquidModel import _helper_getGamma
+
+    u = VLE([ethanol, water], eosname).unifac_model
+    x1 = np.linspace(0.05, 0.95, 7)
+    X = np.column_stack([x1, 1.0 - x1])
+    T = np.array([300.0, 350.0, 300.0, 320.0, 350.0, 300.0, 310.0])
+    G = u.getGammaBatch(X, T)
+    for k in range(len(x1)):
+        expected = _helper_getGamma(X[k], T[k], u.n, u.m, u.amk, u.vk, u.Rk, u.Qk)
+        assert np.array_equal(G[k], expected)
+    assert np.array_equal(u.getGammaBatch(X, 330.0)[2], u.getGamma(X[2], 330.0))
+
+
+def test_unifac_tables_match_database_rows():
+    import db
+    from Sindri.Models.LiquidModel import has_unifac_in_db
+
+    ids = [ethanol.getSubstanceID(), water.getSubstanceID()]
+    assert has_unifac_in_db(ids)
+    assert not has_unifac_in_db([ids[0], hexane.getSubstanceID()])
+
+    u = VLE([ethanol, water], eosname).unifac_model
+    for a in range(u.m):
+        for b in range(u.m):
+            res = db.cursor.execute(
+                "select Aij from unifac_interaction_parameters where i = ? and j = ?",
+                (int(u.k[a]), int(u.k[b])),
+            ).fetchone()
+            if res is not None:
+                assert u.amk[a][b] == res[0]
+
+
+def test_unifac_tables_are_kept_across_connections():
+    from Sindri.Models.LiquidModel import get_unifac_tables
+
+    tables = get_unifac_tables()
+    # a new SubstanceProp opens a new connection to the same file
+    SubstanceProp("ethanol", "C2H6O")
+    assert get_unifac_tables() is tables
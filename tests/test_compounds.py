@@ -55,6 +55,12 @@ def test_each_Pvp():
     np.testing.assert_allclose(Pvp, ig.getPvpLK(T) * 1e-5, 1e-1)
 
 
+def test_TsatLK_inverts_PvpLK():
+    hexane = SubstanceProp("hexane", "C6H14")
+    for T in [250.0, 341.0, 500.0]:
+        np.testing.assert_allclose(hexane.getTsatLK(hexane.getPvpLK(T)), T, 1e-10)
+
+
 def test_getPvps():
     ig = SubstanceProp("methane", "CH4")
     Tref, T, Pref, P = 300, 150, 1e5, 1e5
@@ -0,0 +1,312 @@
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from Sindri.EOSKernels import _kernel_d2thetai_helper
+from Sindri.EOSParametersBehavior.ParametersBehaviorInterface import ThetaiBehavior
+from Sindri.Factories.EOSMixFactory import createEOSMix, getEOSMixOptions
+from Sindri.compounds import SubstanceProp
+from Sindri.constants import R_IG
+
+pentane = SubstanceProp("pentane", "C5H12")
+hexane = SubstanceProp("hexane", "C6H14")
+heptane = SubstanceProp("heptane", "C7H16")
+
+subs = [pentane, hexane, heptane]
+k3 = [[0.0, 0.01, 0.02], [0.01, 0.0, -0.015], [0.02, -0.015, 0.0]]
+y = [0.2, 0.3, 0.5]
+
+all_eos = pytest.mark.parametrize("eosname", getEOSMixOptions())
+
+
+@pytest.fixture
+def eos(eosname):
+    return createEOSMix(subs, eosname, k3)
+
+
+@pytest.fixture
+def compiled(eos):
+    kernel, data = eos.getKernel()
+    if kernel is None:
+        pytest.skip("no compiled kernel")
+    return kernel, data
+
+
+@pytest.fixture
+def reference(compiled, eosname, without_kernel):
+    return without_kernel(subs, eosname, k3)
+
+
+@all_eos
+def test_snapshot_mixing_rule_matches_double_loop(eos):
+    t = 315.0
+    snapshot = eos.getParametersSnapshot(t)
+
+    thetam = 0.0
+    diffthetam = np.zeros(3)
+    for i in range(3):
+        thetai = eos.thetaiBehavior.getThetai(i, t, subs)
+        for j in range(3):
+            thetaj = eos.thetaiBehavior.getThetai(j, t, subs)
+            thetam += y[i] * y[j] * np.sqrt(thetai * thetaj) * (1.0 - k3[i][j])
+            diffthetam[i] += (
+                y[j] * np.sqrt(thetai * thetaj) * (2.0 - k3[i][j] - k3[j][i])
+            )
+    bm = eos.mixRuleBehavior.bm(y, t, eos.biBehavior, subs)
+
+    b, theta, delta, epsilon = eos.getMixtureParameters(y, t)
+    np.testing.assert_allclose(theta, thetam, 1e-12)
+    np.testing.assert_allclose(b, bm, 1e-12)
+    np.testing.assert_allclose(
+        eos.mixRuleBehavior.diffThetamFromArrays(y, snapshot.thetaij),
+        diffthetam,
+        1e-12,
+    )
+    assert eos.getParametersSnapshot(t) is snapshot
+
+
+def test_snapshot_follows_in_place_edits_of_k():
+    k = [row[:] for row in k3]
+    eos = createEOSMix(subs, "Schmidt and Wenzel (1979)", k)
+    snapshot = eos.getParametersSnapshot(315.0)
+    k[0][1] = k[1][0] = 0.1
+    assert eos.getParametersSnapshot(315.0) is not snapshot
+    assert eos.getParametersSnapshot(315.0).thetaij[0, 1] != snapshot.thetaij[0, 1]
+
+
+@all_eos
+def test_lnphi_vector_matches_scalar_phi(eos):
+    t = 315.0
+    p = 1.0e5
+    for z in eos.getZfromPT(p, t, y):
+        lnphi = eos.getLnPhiVector(y, p, t, z)
+        phi = [eos.getPhi_i(i, y, p, t, z) for i in range(3)]
+        np.testing.assert_allclose(np.exp(lnphi), phi, 1e-10)
+
+        diffdeltam = [
+            eos.deltaMixBehavior.diffDeltam(
+                i, y, t, eos.biBehavior, eos.mixRuleBehavior, subs
+            )
+            for i in range(3)
+        ]
+        diffepsilonm = [
+            eos.epsilonMixBehavior.diffEpsilonm(
+                i, y, t, eos.biBehavior, eos.mixRuleBehavior, subs
+            )
+            for i in range(3)
+        ]
+        np.testing.assert_allclose(
+            eos.deltaMixBehavior.diffDeltamVector(
+                y, t, eos.biBehavior, eos.mixRuleBehavior, subs
+            ),
+            diffdeltam,
+            1e-12,
+            1e-20,
+        )
+        np.testing.assert_allclose(
+            eos.epsilonMixBehavior.diffEpsilonmVector(
+                y, t, eos.biBehavior, eos.mixRuleBehavior, subs
+            ),
+            diffepsilonm,
+            1e-12,
+            1e-20,
+        )
+
+
+def _quad_departure(eos, y, T, V, Z):
+    def _Zfunc(v, t):
+        bm, thetam, delta, epsilon = eos.getMixtureParameters(y, t)
+        return v / (v - bm) - (thetam / (R_IG * t)) * v / (v**2 + v * delta + epsilon)
+
+    def _URfunc(v, t):
+        h = 1e-3
+        return t * (_Zfunc(v, t + h) - _Zfunc(v, t - h)) / (2.0 * h) / v
+
+    def _ARfunc(v, t):
+        return (1.0 - _Zfunc(v, t)) / v
+
+    UR_RT = quad(_URfunc, V, np.inf, args=(T,))[0]
+    AR_RT = quad(_ARfunc, V, np.inf, args=(T,))[0] + np.log(Z)
+    return UR_RT, AR_RT
+
+
+@all_eos
+def test_closed_form_departure_matches_quadrature(eos):
+    t = 315.0
+    p = 1.0e5
+    for z in eos.getZfromPT(p, t, y):
+        v = z * R_IG * t / p
+        UR_RT, AR_RT = _quad_departure(eos, y, t, v, z)
+        dp = eos.getDepartureProps(y, p, t, v, z)
+        np.testing.assert_allclose(dp.U / (R_IG * t), UR_RT, 1e-5, 1e-8)
+        np.testing.assert_allclose(dp.A / (R_IG * t), AR_RT, 1e-5, 1e-8)
+        np.testing.assert_allclose(dp.H / (R_IG * t), UR_RT + 1.0 - z, 1e-5, 1e-8)
+
+
+def _central_difference(f, t, h=1e-3):
+    return (f(t + h) - f(t - h)) / (2.0 * h)
+
+
+@all_eos
+def test_analytic_temperature_derivatives_match_finite_differences(eos):
+    p = 1.0e5
+    thetaib = eos.thetaiBehavior
+    assert type(thetaib).getdThetaidT is not ThetaiBehavior.getdThetaidT
+    assert type(thetaib).getd2ThetaidT2 is not ThetaiBehavior.getd2ThetaidT2
+    for t in [315.0, 500.0]:
+        np.testing.assert_allclose(
+            thetaib.getdThetaidTVector(t, subs),
+            _central_difference(lambda x: thetaib.getThetaiVector(x, subs), t),
+            1e-6,
+        )
+        np.testing.assert_allclose(
+            thetaib.getd2ThetaidT2Vector(t, subs),
+            _central_difference(lambda x: thetaib.getdThetaidTVector(x, subs), t),
+            1e-6,
+        )
+
+        db, dtheta, ddelta, depsilon = eos.getdMixtureParametersdT(y, t)
+        expected = _central_difference(
+            lambda x: np.array(eos.getMixtureParameters(y, x)), t
+        )
+        np.testing.assert_allclose(
+            [db, dtheta, ddelta, depsilon], expected, 1e-6, 1e-14
+        )
+
+    dzliq, dzvap = eos.getdZdT(p, 315.0, y)
+    zliq = _central_difference(lambda x: np.min(eos.getZfromPT(p, x, y)), 315.0)
+    zvap = _central_difference(lambda x: np.max(eos.getZfromPT(p, x, y)), 315.0)
+    np.testing.assert_allclose([dzliq, dzvap], [zliq, zvap], 1e-5)
+
+
+def test_precomputed_constants_follow_the_substances_list():
+    from Sindri.CubicEquationsOfState.PatelAndTeja1982 import _calc_a_b_c
+
+    eos = createEOSMix(subs, "Patel and Teja (1982)", k3)
+    for i in range(3):
+        a, b, c = _calc_a_b_c(i, 300.0, subs)
+        np.testing.assert_allclose(eos.biBehavior.getBi(i, 300.0, subs), b, 1e-14)
+        np.testing.assert_allclose(eos.thetaiBehavior.a(i, 300.0, subs), a, 1e-14)
+
+    other = [heptane, pentane]
+    a, b, c = _calc_a_b_c(0, 300.0, other)
+    np.testing.assert_allclose(eos.biBehavior.getBi(0, 300.0, other), b, 1e-14)
+
+
+@all_eos
+def test_batch_z_matches_single_state_calls(eos):
+    rng = np.random.default_rng(7)
+    Y = rng.dirichlet(np.ones(3), 12)
+    T = np.repeat([300.0, 340.0, 380.0], 4)
+    P = np.tile([1.0e4, 1.0e5, 5.0e5, 2.0e6], 3)
+    zliq, zvap = eos.getZliqZvapBatch(P, T, Y)
+    for k in range(len(P)):
+        np.testing.assert_allclose(
+            [zliq[k], zvap[k]], eos.getZliqZvap(P[k], T[k], Y[k]), 1e-12
+        )
+
+
+@all_eos
+def test_compiled_batch_z_matches_the_behavior_path(eos, compiled, reference):
+    rng = np.random.default_rng(11)
+    Y = rng.dirichlet(np.ones(3), 16)
+    T = rng.uniform(280.0, 420.0, 16)
+    P = rng.uniform(1.0e4, 2.0e6, 16)
+    np.testing.assert_allclose(
+        eos.getZliqZvapBatch(P, T, Y), reference.getZliqZvapBatch(P, T, Y), 1e-10
+    )
+
+
+@all_eos
+def test_compiled_kernels_match_behavior_objects(eos, compiled):
+    t = 315.0
+    p = 1.0e5
+    kernel, data = compiled
+    snapshot = eos.getParametersSnapshot(t)
+    ret = kernel.getMixtureParameters(data, y, t)
+    bm = eos.mixRuleBehavior.bm(y, t, eos.biBehavior, subs)
+    thetam = eos.mixRuleBehavior.thetam(y, t, eos.thetaiBehavior, subs, k3)
+    deltam = eos.deltaMixBehavior.deltam(
+        y, t, eos.biBehavior, eos.mixRuleBehavior, subs
+    )
+    epsilonm = eos.epsilonMixBehavior.epsilonm(
+        y, t, eos.biBehavior, eos.mixRuleBehavior, subs
+    )
+    np.testing.assert_allclose(ret[:4], [bm, thetam, deltam, epsilonm], 1e-12)
+    np.testing.assert_allclose(
+        ret[5], eos.mixRuleBehavior.diffThetamFromArrays(y, snapshot.thetaij), 1e-12
+    )
+    np.testing.assert_allclose(
+        ret[7],
+        eos.epsilonMixBehavior.diffEpsilonmVector(
+            y, t, eos.biBehavior, eos.mixRuleBehavior, subs
+        ),
+        1e-12,
+    )
+    dthetai = eos.thetaiBehavior.getdThetaidTVector(t, subs)
+    dthetaij = eos.mixRuleBehavior.getdThetaijdT(snapshot.thetai, dthetai, k3)
+    np.testing.assert_allclose(
+        ret[8][1], eos.mixRuleBehavior.thetamFromArrays(y, dthetaij), 1e-12
+    )
+    ac, bc, tc, m, kij, alpha = kernel.getKernelArgs(data)[:6]
+    d2thetai = [eos.thetaiBehavior.getd2ThetaidT2(i, t, subs) for i in range(3)]
+    np.testing.assert_allclose(
+        _kernel_d2thetai_helper(t, ac, tc, m, alpha), d2thetai, 1e-10
+    )
+
+    zliq, zvap = eos.getZliqZvap(p, t, y)
+    lnphi = eos.getLnPhiVector(y, p, t, zvap)
+    phi = [eos.getPhi_i(i, y, p, t, zvap) for i in range(3)]
+    np.testing.assert_allclose(np.exp(lnphi), phi, 1e-10)
+
+
+def test_kernel_data_follows_in_place_edits_of_k():
+    k = [row[:] for row in k3]
+    eos = createEOSMix(subs, "Peng and Robinson (1976)", k)
+    theta = eos.getMixtureParameters(y, 315.0)[1]
+    # as EditBinaryInteractionParametersController does
+    k[0][1] = k[1][0] = 0.1
+    reference = createEOSMix(subs, "Peng and Robinson (1976)", k)
+    assert eos.getMixtureParameters(y, 315.0)[1] != theta
+    np.testing.assert_allclose(
+        eos.getMixtureParameters(y, 315.0), reference.getMixtureParameters(y, 315.0)
+    )
+
+
+# the Python temperature loops drop the composition derivatives, and so take
+# other steps than the compiled Newton loops
+@all_eos
+@pytest.mark.parametrize(
+    "name, arg, rtol, same_iterations",
+    [
+        ("getBubblePointPressure_phi_phi", 330.0, 1e-8, True),
+        ("getDewPointPressure_phi_phi", 330.0, 1e-8, True),
+        ("getBubblePointTemperature_phi_phi", 1.0e5, 1e-6, False),
+        ("getDewPointTemperature_phi_phi", 1.0e5, 1e-6, False),
+    ],
+)
+def test_compiled_saturation_loops_match_python_loops(
+    eos, reference, name, arg, rtol, same_iterations
+):
+    ret = getattr(eos, name)(np.array(y), arg)
+    expected = getattr(reference, name)(np.array(y), arg)
+    if same_iterations:
+        assert ret[-1] == expected[-1]
+    for r, e in zip(ret[:-1], expected[:-1]):
+        np.testing.assert_allclose(r, e, rtol)
+
+
+@all_eos
+def test_analytic_lnphi_derivatives_match_finite_differences(eos, reference):
+    x = np.array([0.2, 0.3, 0.5])
+    t = 330.0
+    for p in (1.0e5, 1.0e6):
+        for z in eos.getZliqZvap(p, t, x):
+            ret = eos.getLnPhiDerivatives(x, p, t, z)
+            expected = reference.getLnPhiDerivatives(x, p, t, z)
+            np.testing.assert_allclose(ret[0], expected[0], 1e-12)
+            for r, e in zip(ret[1:], expected[1:]):
+                np.testing.assert_allclose(r, e, 1e-5, 1e-8 * np.max(np.abs(e)))
+            # symmetry and Gibbs-Duhem
+            np.testing.assert_allclose(ret[3], ret[3].T, 1e-10, 1e-10)
+            np.testing.assert_allclose(np.dot(x, ret[3]), 0.0, 0.0, 1e-10)
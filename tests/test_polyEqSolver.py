@@ -23,3 +23,25 @@ class TestCubicSolver:
         expected = np.array([1, 4, -3])
         returned = solve_cubic(*parameters)
         np.testing.assert_almost_equal(expected, returned)
+
+    def test_closed_form_cubic_roots_are_sorted_and_padded(self):
+        nroots, r0, r1, r2 = solve_cubic_roots(2.0, -4.0, -22.0, 24.0)
+        assert nroots == 3
+        np.testing.assert_allclose([r0, r1, r2], [-3.0, 1.0, 4.0], atol=1e-12)
+
+        nroots, r0, r1, r2 = solve_cubic_roots(1.0, 0.0, 1.0, 1.0)
+        assert nroots == 1
+        np.testing.assert_allclose(r0, np.real(np.roots([1, 0, 1, 1])[-1]))
+        assert np.isnan(r1) and np.isnan(r2)
+
+        np.testing.assert_allclose(cubic_real_roots(0.0, 1.0, 0.0, -1.0), [-1.0, 1.0])
+
+    def test_batch_cubic_solver_matches_single_solver(self):
+        rng = np.random.default_rng(0)
+        a = np.ones(50)
+        b, c, d = rng.uniform(-5.0, 5.0, (3, 50))
+        nroots, roots = solve_cubic_batch(a, b, c, d)
+        for k in range(50):
+            expected = cubic_real_roots(a[k], b[k], c[k], d[k])
+            assert nroots[k] == len(expected)
+            np.testing.assert_allclose(roots[k, : nroots[k]], expected)